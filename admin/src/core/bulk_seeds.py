@@ -0,0 +1,544 @@
+"""
+Generación de datos sintéticos en volumen, para pruebas de rendimiento.
+
+A diferencia de `seeds.run`, que crea unas pocas filas de ejemplo con las funciones
+`create_*` (una consulta y un commit por fila), este módulo inserta directamente en
+las tablas, de a bloques (`INSERT ... VALUES` de varias filas, con `RETURNING` para
+obtener los IDs y enlazar las claves foráneas sin consultas adicionales), todo en
+una única transacción.
+
+La cantidad de filas es proporcional a `scale`, la cantidad de jinetes: con
+`scale=10000` se generan unas 200.000 filas. Los datos dependen sólo de `seed`, por
+lo que dos ejecuciones sobre bases vacías producen exactamente los mismos datos. Las
+fechas se calculan a partir de `REFERENCE_DATE`, no de la fecha actual.
+
+Se puede ejecutar sobre una base que ya tiene datos: los DNI se generan a partir de
+los máximos existentes.
+"""
+
+import datetime
+import random
+import time
+from typing import Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+from flask import current_app
+
+from src.core.charges.charge import Charge, PaymentMethod
+from src.core.contacts.contacts import Contact
+from src.core.database import db
+from src.core.ecuestre.horse import Horse, horse_employee
+from src.core.payments.payments import Payment
+from src.core.publications.publication import Publication
+from src.core.riders.benefits import Benefits, PensionType
+from src.core.riders.disability import Disability, DisabilityType
+from src.core.riders.institutional_work import InstitutionalWork
+from src.core.riders.insurance import Insurance
+from src.core.riders.rider import Rider
+from src.core.riders.rider_tutor import RiderTutor
+from src.core.riders.school import School
+from src.core.riders.tutor import Tutor
+from src.core.team.employee import Employee
+from src.core.users.user import User
+
+REFERENCE_DATE = datetime.date(2024, 12, 1)
+CHUNK_SIZE = 1000
+
+# Meses de cobros por jinete
+CHARGE_MONTHS = 12
+
+NAMES = (
+    "Juan", "Maria", "Carlos", "Lucia", "Jose", "Sofia", "Miguel", "Ana", "Pedro",
+    "Laura", "Andres", "Valeria", "Felipe", "Isabela", "Diego", "Carolina",
+    "Esteban", "Camila", "Victor", "Elena", "Mateo", "Martina", "Tomas", "Julieta",
+)  # fmt: skip
+LAST_NAMES = (
+    "Gonzalez", "Rodriguez", "Perez", "Gomez", "Martinez", "Lopez", "Sanchez",
+    "Diaz", "Fernandez", "Romero", "Castro", "Vasquez", "Morales", "Salazar",
+    "Hernandez", "Mendoza", "Paredes", "Torres", "Cruz", "Salas", "Acosta", "Benitez",
+)  # fmt: skip
+LOCALITIES = ("La Plata", "Berisso", "Ensenada", "City Bell", "Gonnet", "Tolosa")
+STREETS = ("7", "13", "44", "50", "60", "120", "Ferrari", "Brandsen", "Montevideo")
+JOB_POSITIONS = (
+    "Administrativo/a", "Terapeuta", "Conductor", "Auxiliar de pista", "Herrero",
+    "Veterinario", "Entrenador de Caballos", "Domador", "Profesor de Equitacion",
+    "Docente de Capacitación", "Auxiliar de mantenimiento", "Otro",
+)  # fmt: skip
+PROFESSIONS = (
+    "Psicologo/a", "Psicomotricista", "Medico/a", "Kinesiologo/a",
+    "Terapista Ocupacional", "Psicopedagogo/a", "Docente", "Profesor/a",
+    "Fonoaudiologo/a", "Veterinario/a", "Otra",
+)  # fmt: skip
+PROPOSALS = (
+    "Hipoterapia",
+    "Monta Terapeutica",
+    "Deporte Ecuestre Adaptado",
+    "Actividades Recreativas",
+    "Equitacion",
+)
+HEADQUARTERS = ("CASJ", "HLP", "OTRO")
+INSURANCES = ("IOMA", "OSDE", "PAMI", "Swiss Medical", "No tiene")
+HORSE_NAMES = ("Tupa", "Arasy", "Niamandu", "Yvy", "Kuarahy")
+BREEDS = ("Criollo", "Árabe", "Andaluz", "Cuarto de Milla", "Percherón")
+FURS = ("Castaño", "Blanco", "Negro", "Tordillo", "Alazán", "Overo")
+KINSHIPS = ("Madre", "Padre", "Abuelo/a", "Tío/a", "Hermano/a", "Otro")
+SCHOLARITY_LEVELS = ("primario", "secundario", "terciario", "universitario")
+OCCUPATIONS = ("Docente", "Comerciante", "Empleado/a", "Desocupad@", "Jubilado/a")
+CONTACT_STATES = ("pendiente", "en proceso", "terminado")
+PUBLICATION_STATES = ("Borrador", "Publicado", "Archivado")
+WORDS = (
+    "caballo", "jinete", "terapia", "pista", "actividad", "equipo", "sede",
+    "jornada", "inscripción", "encuentro", "taller", "familia", "salud", "deporte",
+)  # fmt: skip
+
+
+def _insert(table: sa.Table, rows: List[dict], chunk_size: int) -> List[int]:
+    """
+    Inserta filas en bloques y devuelve sus IDs, en el mismo orden.
+
+    Args:
+        table (sa.Table): La tabla.
+        rows (List[dict]): Las filas a insertar.
+        chunk_size (int): Cantidad de filas por sentencia.
+
+    Returns:
+        List[int]: Los IDs de las filas insertadas (vacía si la tabla no tiene `id`).
+    """
+    connection = db.session.connection()
+    ids: List[int] = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start : start + chunk_size]
+        if "id" in table.c:
+            statement = sa.insert(table).returning(
+                table.c.id, sort_by_parameter_order=True
+            )
+            ids.extend(connection.execute(statement, chunk).scalars())
+        else:
+            connection.execute(sa.insert(table), chunk)
+    return ids
+
+
+def _next_number(column, minimum: int) -> int:
+    """Devuelve el primer número libre a partir del máximo de una columna."""
+    maximum = db.session.scalar(sa.select(sa.func.max(column)))
+    return max(maximum or 0, minimum) + 1
+
+
+def _phone(rng: random.Random) -> str:
+    return f"221{rng.randint(1000000, 9999999)}"
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _date_between(
+    rng: random.Random, start: datetime.date, end: datetime.date
+) -> datetime.date:
+    return start + datetime.timedelta(days=rng.randint(0, (end - start).days))
+
+
+def _employees(rng: random.Random, count: int) -> List[dict]:
+    # Los DNI de los empleados son texto: se numeran a partir de la cantidad actual
+    first = 90000000 + db.session.scalar(sa.select(sa.func.count(Employee.id)))
+    rows = []
+    for i in range(count):
+        name, last_name = rng.choice(NAMES), rng.choice(LAST_NAMES)
+        start_date = _date_between(
+            rng, datetime.date(2015, 1, 1), REFERENCE_DATE - datetime.timedelta(30)
+        )
+        rows.append(
+            {
+                "dni": str(first + i),
+                "name": name,
+                "last_name": last_name,
+                "email": f"{name}.{last_name}.{first + i}@example.com".lower(),
+                "profession": rng.choice(PROFESSIONS),
+                "address": f"Calle {rng.choice(STREETS)} num {rng.randint(1, 3000)}",
+                "telephone": _phone(rng),
+                "locality": rng.choice(LOCALITIES),
+                "job_position": rng.choice(JOB_POSITIONS),
+                "start_date": start_date,
+                "end_date": None if rng.random() < 0.9 else REFERENCE_DATE,
+                "emergency_contact_name": (
+                    f"{rng.choice(NAMES)} {rng.choice(LAST_NAMES)}"
+                ),
+                "emergency_contact_num": _phone(rng),
+                "social_insurance": rng.choice(INSURANCES[:-1]),
+                "affiliate_num": str(rng.randint(10**9, 10**10 - 1)),
+                "condition": rng.choice(("Voluntario", "Personal Rentado")),
+                "active": rng.random() < 0.95,
+                "user_id": None,
+            }
+        )
+    return rows
+
+
+def _horses(rng: random.Random, count: int, employee_ids: List[int]) -> List[dict]:
+    rows = []
+    for i in range(count):
+        rows.append(
+            {
+                "name": f"{rng.choice(HORSE_NAMES)} {i + 1}",
+                "birth_date": _date_between(
+                    rng, datetime.date(2005, 1, 1), datetime.date(2020, 12, 31)
+                ),
+                "gender": rng.choice(("Masculino", "Femenino")),
+                "breed": rng.choice(BREEDS),
+                "fur": rng.choice(FURS),
+                "acquisition_type": rng.choice(("Compra", "Donación")),
+                "entry_date": _date_between(
+                    rng, datetime.date(2015, 1, 1), REFERENCE_DATE
+                ),
+                "sede": rng.choice(HEADQUARTERS),
+                "rider_type": rng.choice(PROPOSALS),
+                "active": rng.random() < 0.9,
+                "trainer_id": rng.choice(employee_ids),
+                "conductor_id": rng.choice(employee_ids),
+            }
+        )
+    return rows
+
+
+def _one_to_one_rows(rng: random.Random, count: int) -> Dict[str, List[dict]]:
+    """Genera las filas de los datos asociados a cada jinete (una por jinete)."""
+    diagnoses = current_app.config["DISABILITIES_IN_SYSTEM"]
+    rows: Dict[str, List[dict]] = {
+        "disability_types": [],
+        "disabilities": [],
+        "benefits": [],
+        "insurances": [],
+        "schools": [],
+    }
+    for _ in range(count):
+        rows["disability_types"].append(
+            {
+                "mental": rng.random() < 0.4,
+                "motora": rng.random() < 0.4,
+                "sensorial": rng.random() < 0.2,
+                "visceral": rng.random() < 0.1,
+            }
+        )
+        diagnosis = rng.choice(diagnoses)
+        rows["disabilities"].append(
+            {
+                "disability_certificate": rng.random() < 0.7,
+                "diagnosis": diagnosis,
+                "other_diagnosis": _text(rng, 2) if diagnosis == "OTRO" else None,
+            }
+        )
+        pension = rng.random() < 0.3
+        rows["benefits"].append(
+            {
+                "asignacion_familiar": rng.random() < 0.3,
+                "asignacion_por_hijo": rng.random() < 0.3,
+                "asignacion_por_hijo_con_discapacidad": rng.random() < 0.2,
+                "asignacion_por_ayuda_escolar": rng.random() < 0.2,
+                "beneficiario_de_pension": pension,
+                "naturaleza_pension": (
+                    rng.choice(list(PensionType)) if pension else None
+                ),
+            }
+        )
+        insurance = rng.choice(INSURANCES)
+        rows["insurances"].append(
+            {
+                "insurance_name": insurance,
+                "affiliate_number": (
+                    None if insurance == "No tiene" else str(rng.randint(10**7, 10**8))
+                ),
+                "has_guardianship": rng.random() < 0.1,
+                "guardianship_observations": "",
+            }
+        )
+        rows["schools"].append(
+            {
+                "name": f"Escuela N° {rng.randint(1, 120)}",
+                "address": f"Calle {rng.choice(STREETS)} num {rng.randint(1, 3000)}",
+                "phone_number": _phone(rng),
+                "grade": rng.randint(1, 12),
+                "school_observations": "",
+                "professionals": "",
+            }
+        )
+    return rows
+
+
+def _institutional_works(
+    rng: random.Random, count: int, employee_ids: List[int], horse_ids: List[int]
+) -> List[dict]:
+    days = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+    rows = []
+    for _ in range(count):
+        row = {day: False for day in (*days, "sunday")}
+        for day in rng.sample(days, rng.randint(1, 3)):
+            row[day] = True
+        row.update(
+            {
+                "proposal": rng.choice(PROPOSALS),
+                "headquarters": rng.choice(HEADQUARTERS),
+                "teacher_therapist_id": rng.choice(employee_ids),
+                "horse_conductor_id": rng.choice(employee_ids),
+                "track_assistant_id": rng.choice(employee_ids),
+                "horse_id": rng.choice(horse_ids),
+            }
+        )
+        rows.append(row)
+    return rows
+
+
+def _maybe(rng: random.Random, ids: List[int], index: int, probability: float):
+    """Devuelve el ID de un dato asociado, o None para dejar al jinete incompleto."""
+    return ids[index] if rng.random() < probability else None
+
+
+def run(scale: int, seed: int = 0, chunk_size: int = CHUNK_SIZE):
+    """
+    Genera un conjunto de datos sintéticos proporcional a `scale`.
+
+    Crea `scale` jinetes (con sus datos de discapacidad, beneficios, obra social,
+    escuela, trabajo institucional y tutores; un 15% queda con información
+    incompleta) y, en proporción, empleados, caballos, cobros mensuales, pagos,
+    publicaciones y consultas de contacto.
+
+    Args:
+        scale (int): La cantidad de jinetes.
+        seed (int): La semilla del generador de números aleatorios.
+        chunk_size (int): Cantidad de filas por sentencia INSERT.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    counts: Dict[str, int] = {}
+
+    def insert(name: str, table: sa.Table, rows: Iterable[dict]) -> List[int]:
+        rows = list(rows)
+        counts[name] = counts.get(name, 0) + len(rows)
+        return _insert(table, rows, chunk_size)
+
+    print(f"Generando datos para {scale} jinetes (semilla {seed})...")
+
+    # Equipo y caballos
+    employee_ids = insert(
+        "empleados", Employee.__table__, _employees(rng, max(30, scale // 25))
+    )
+    horse_ids = insert(
+        "caballos",
+        Horse.__table__,
+        _horses(rng, max(10, scale // 40), employee_ids),
+    )
+    insert(
+        "caballos_empleados",
+        horse_employee,
+        (
+            {"horse_id": horse_id, "employee_id": employee_id}
+            for horse_id in horse_ids
+            for employee_id in rng.sample(employee_ids, 2)
+        ),
+    )
+
+    # Datos asociados a cada jinete
+    related = _one_to_one_rows(rng, scale)
+    disability_type_ids = insert(
+        "tipos_de_discapacidad", DisabilityType.__table__, related["disability_types"]
+    )
+    for row, type_id in zip(related["disabilities"], disability_type_ids):
+        row["disability_type_fk"] = type_id
+    disability_ids = insert(
+        "discapacidades", Disability.__table__, related["disabilities"]
+    )
+    benefit_ids = insert("beneficios", Benefits.__table__, related["benefits"])
+    insurance_ids = insert("obras_sociales", Insurance.__table__, related["insurances"])
+    school_ids = insert("escuelas", School.__table__, related["schools"])
+    work_ids = insert(
+        "trabajos_institucionales",
+        InstitutionalWork.__table__,
+        _institutional_works(rng, scale, employee_ids, horse_ids),
+    )
+
+    # Jinetes
+    first_dni = _next_number(Rider.dni, 30000000)
+    rider_rows = []
+    for i in range(scale):
+        complete = rng.random() < 0.85
+        probability = 1 if complete else 0.5
+        rider_rows.append(
+            {
+                "dni": first_dni + i,
+                "name": rng.choice(NAMES),
+                "last_name": rng.choice(LAST_NAMES),
+                "birthday": _date_between(
+                    rng, datetime.date(1960, 1, 1), datetime.date(2020, 12, 31)
+                ),
+                "locality": rng.choice(LOCALITIES),
+                "province": "Buenos Aires",
+                "province_address": "Buenos Aires",
+                "locality_address": rng.choice(LOCALITIES),
+                "street": rng.choice(STREETS),
+                "house_num": rng.randint(1, 3000),
+                "dpto": None,
+                "actual_tel": _phone(rng),
+                "emergency_contact_name": rng.choice(NAMES),
+                "emergency_contact_tel": _phone(rng),
+                "scholarship_holder": rng.random() < 0.3,
+                "rider_observations": None,
+                "inserted_at": _date_between(
+                    rng, datetime.date(2018, 1, 1), REFERENCE_DATE
+                ),
+                "has_debt": rng.random() < 0.2,
+                "condition": rng.random() < 0.9,
+                "disability_id": _maybe(rng, disability_ids, i, probability),
+                "benefit_id": _maybe(rng, benefit_ids, i, probability),
+                "insurance_id": _maybe(rng, insurance_ids, i, probability),
+                "school_id": _maybe(rng, school_ids, i, probability * 0.7),
+                "institutional_work_id": _maybe(rng, work_ids, i, probability),
+            }
+        )
+    rider_ids = insert("jinetes", Rider.__table__, rider_rows)
+
+    # Tutores: uno principal por jinete y, para algunos, uno secundario
+    first_dni = _next_number(Tutor.dni, 20000000)
+    tutor_rows = []
+    links = []
+    for rider_id in rider_ids:
+        for is_primary in (True, False) if rng.random() < 0.3 else (True,):
+            name, last_name = rng.choice(NAMES), rng.choice(LAST_NAMES)
+            tutor_rows.append(
+                {
+                    "dni": first_dni + len(tutor_rows),
+                    "name": name,
+                    "last_name": last_name,
+                    "province": "Buenos Aires",
+                    "locality": rng.choice(LOCALITIES),
+                    "street": rng.choice(STREETS),
+                    "street_number": rng.randint(1, 3000),
+                    "floor": None,
+                    "department_number": None,
+                    "phone_number": _phone(rng),
+                    "email": (
+                        f"{name}.{last_name}.{len(tutor_rows)}@example.com".lower()
+                    ),
+                    "scholarity_level": rng.choice(SCHOLARITY_LEVELS),
+                    "occupation": rng.choice(OCCUPATIONS),
+                }
+            )
+            links.append(
+                {
+                    "rider_id": rider_id,
+                    "kinship": rng.choice(KINSHIPS),
+                    "is_primary": is_primary,
+                }
+            )
+    tutor_ids = insert("tutores", Tutor.__table__, tutor_rows)
+    for link, tutor_id in zip(links, tutor_ids):
+        link["tutor_id"] = tutor_id
+    insert("jinetes_tutores", RiderTutor.__table__, links)
+
+    # Cobros mensuales de cada jinete
+    methods = list(PaymentMethod)
+    charges = []
+    for rider_id in rider_ids:
+        amount = rng.choice((8000, 10000, 12000, 15000))
+        for month in range(CHARGE_MONTHS):
+            if rng.random() < 0.1:
+                continue
+            charges.append(
+                {
+                    "rider_id": rider_id,
+                    "charge_date": REFERENCE_DATE
+                    - datetime.timedelta(days=30 * month + rng.randint(0, 10)),
+                    "payment_method": rng.choice(methods),
+                    "amount": float(amount),
+                    "receiver_id": rng.choice(employee_ids),
+                    "observations": None,
+                }
+            )
+            if len(charges) >= chunk_size * 10:
+                insert("cobros", Charge.__table__, charges)
+                charges = []
+    insert("cobros", Charge.__table__, charges)
+
+    # Pagos: honorarios mensuales y gastos sin beneficiario
+    payments = []
+    for employee_id in employee_ids:
+        amount = float(rng.choice((150000, 200000, 250000, 300000)))
+        for month in range(CHARGE_MONTHS):
+            payments.append(
+                {
+                    "beneficiary_id": employee_id,
+                    "amount": amount,
+                    "payment_date": (
+                        REFERENCE_DATE - datetime.timedelta(days=30 * month)
+                    ),
+                    "payment_type": "Honorarios",
+                    "description": "Pago del sueldo",
+                }
+            )
+    for _ in range(scale // 10):
+        payments.append(
+            {
+                "beneficiary_id": None,
+                "amount": float(rng.randint(1000, 100000)),
+                "payment_date": _date_between(
+                    rng, REFERENCE_DATE - datetime.timedelta(days=365), REFERENCE_DATE
+                ),
+                "payment_type": rng.choice(("Gastos varios", "Proveedor")),
+                "description": _text(rng, 4),
+            }
+        )
+    insert("pagos", Payment.__table__, payments)
+
+    # Publicaciones, de los usuarios existentes
+    author_ids: Optional[List[int]] = list(db.session.scalars(sa.select(User.id)))
+    if author_ids:
+        publications = []
+        for i in range(max(30, scale // 20)):
+            state = rng.choice(PUBLICATION_STATES)
+            created = _date_between(rng, datetime.date(2020, 1, 1), REFERENCE_DATE)
+            publications.append(
+                {
+                    "publication_date": created if state == "Publicado" else None,
+                    "creation_date": created,
+                    "update_date": None,
+                    "title": f"{_text(rng, 3)[:-1]} {i + 1}",
+                    "summary": _text(rng, 20),
+                    "content": " ".join(
+                        _text(rng, 12) for _ in range(rng.randint(3, 15))
+                    ),
+                    "author_id": rng.choice(author_ids),
+                    "state": state,
+                }
+            )
+        insert("publicaciones", Publication.__table__, publications)
+    else:
+        print("No hay usuarios: no se generan publicaciones (ejecute antes seeds-db)")
+
+    # Consultas de contacto
+    contacts = []
+    for i in range(max(30, scale // 10)):
+        state = rng.choice(CONTACT_STATES)
+        created = _date_between(rng, datetime.date(2022, 1, 1), REFERENCE_DATE)
+        name, last_name = rng.choice(NAMES), rng.choice(LAST_NAMES)
+        contacts.append(
+            {
+                "state": state,
+                "comment": _text(rng, 5) if state != "pendiente" else None,
+                "creation_date": created,
+                "closed_date": (
+                    created + datetime.timedelta(days=rng.randint(1, 30))
+                    if state == "terminado"
+                    else None
+                ),
+                "title": _text(rng, 3),
+                "full_name": f"{name} {last_name}",
+                "email": f"{name}.{last_name}.{i}@example.com".lower(),
+                "message": _text(rng, 30),
+            }
+        )
+    insert("consultas", Contact.__table__, contacts)
+
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    for name, count in counts.items():
+        print(f"  {name}: {count}")
+    print(f"🆗 {sum(counts.values())} filas en {elapsed:.1f} s")
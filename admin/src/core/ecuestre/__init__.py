@@ -1,5 +1,4 @@
 import os
-import ulid
 from typing import List
 
 from flask import current_app
@@ -7,6 +6,8 @@ from sqlalchemy import asc, desc
 from sqlalchemy.sql import expression as expr
 
 from src.core.database import db
+from src.core.files import file_columns, object_info, release_files, store_file
+from src.core.files.derivatives import schedule_processing
 from src.core.ecuestre.horse import Horse
 from src.core.ecuestre.horse_document import HorseDocument
 from src.core.functions import is_valid_url
@@ -138,24 +139,17 @@ def create_document(title, doc_type, format, source, horse_id):
             {', '.join(current_app.config['ACCEPTED_EXTENSIONS'])}"""
         raise ValueError(msg)
 
+    columns = {"source": source}
     if format == "file":
-        client = current_app.storage.client
-        bucket_name = "grupo13"
-        source.seek(0, 2)  # Mueve el puntero al final del archivo
-        length = source.tell()  # Calcula el tamaño del archivo
-        source.seek(0)  # Regresa el puntero al inicio del archivo
-        file_id = str(ulid.ulid())
-        file_name = f"{file_id}-{source.filename}"
-        client.put_object(
-            bucket_name, file_name, source, length, content_type=source.content_type
-        )
-        source = file_name
+        columns = file_columns(store_file(source))
 
     new_document = HorseDocument(
-        title=title, type=doc_type, format=format, source=source, horse_id=horse_id
+        title=title, type=doc_type, format=format, horse_id=horse_id, **columns
     )
     db.session.add(new_document)
     db.session.commit()
+    if format == "file":
+        schedule_processing(new_document.source, new_document.content_type)
 
     return new_document
 
@@ -282,6 +276,22 @@ def get_documents_by_horse_id(
     return pagination, pagination.items
 
 
+def get_all_documents(horse_id):
+    """Obtiene todos los documentos de un caballo, del más antiguo al más reciente.
+
+    Args:
+        horse_id (int): ID del caballo.
+
+    Returns:
+        list[HorseDocument]: Los documentos del caballo.
+    """
+    return (
+        HorseDocument.query.filter_by(horse_id=horse_id)
+        .order_by(asc(HorseDocument.created_at))
+        .all()
+    )
+
+
 def download_document(document_id):
     """Descarga un documento específico.
 
@@ -289,7 +299,7 @@ def download_document(document_id):
         document_id (int): ID del documento a descargar.
 
     Returns:
-        tuple: El contenido del archivo descargado y el objeto del documento.
+        tuple: Los metadatos del archivo en el almacenamiento y el objeto del documento.
 
     Raises:
         ValueError: Si el documento no existe.
@@ -297,11 +307,9 @@ def download_document(document_id):
     document = HorseDocument.query.filter_by(id=document_id).first()
     if not document:
         raise ValueError("Documento no encontrado")
-    client = current_app.storage.client
-    bucket_name = "grupo13"
-    response = client.get_object(bucket_name, document.source)
+    stat = object_info(document)
 
-    return response, document
+    return stat, document
 
 
 def get_document_by_id(document_id):
@@ -571,6 +579,9 @@ def get_horses_by_headquarters_and_proposal(
 def delete_document_by_id(document_id):
     """Elimina un documento según su ID.
 
+    Si es un archivo, también lo elimina del almacenamiento, salvo que otro documento
+    lo comparta.
+
     Args:
         document_id (int): ID del documento a eliminar.
 
@@ -583,7 +594,10 @@ def delete_document_by_id(document_id):
     document = HorseDocument.query.filter_by(id=document_id).first()
     if not document:
         raise ValueError("Documento no encontrado")
+    removable = release_files([document.source]) if document.format == "file" else []
     db.session.delete(document)
     db.session.commit()
 
+    current_app.storage.remove_in_background(removable)
+
     return document
@@ -15,6 +15,10 @@ class HorseDocument(db.Model):
         source (str): URL o ubicación del documento.
         created_at (datetime): Fecha y hora de creación del documento.
         updated_at (datetime): Fecha y hora de la última actualización del documento.
+        size (int): Tamaño del archivo, en bytes.
+        content_type (str): Tipo MIME del archivo.
+        checksum (str): SHA-256 del contenido del archivo.
+        uploaded_at (datetime): Fecha y hora (UTC) en que se subió el archivo.
         horse_id (int): ID del caballo asociado al documento.
     """
 
@@ -30,6 +34,12 @@ class HorseDocument(db.Model):
         db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
     )
 
+    # Metadatos del archivo, registrados al subirlo (vacíos en los enlaces)
+    size = db.Column(db.BigInteger, nullable=True)
+    content_type = db.Column(db.String(255), nullable=True)
+    checksum = db.Column(db.String(64), nullable=True)
+    uploaded_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
     horse_id = db.Column(db.Integer, db.ForeignKey("horses.id"), nullable=False)
 
     def __repr__(self):
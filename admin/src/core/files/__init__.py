@@ -0,0 +1,178 @@
+"""
+Archivos de los documentos, deduplicados por contenido.
+
+Los documentos de jinetes, empleados y caballos guardan en `source` el nombre de un
+objeto del almacenamiento. Varios documentos con el mismo contenido (por ejemplo, el
+mismo certificado subido para distintos jinetes) comparten un único objeto: el archivo
+se identifica por el SHA-256 de su contenido, calculado mientras se recibe, y
+`StoredFile` cuenta cuántos documentos lo referencian.
+
+Además, cada documento registra los metadatos de su archivo (tamaño, tipo MIME,
+SHA-256 y fecha de subida), de modo que los listados y las descargas no necesitan
+consultar el almacenamiento.
+
+Ninguna de estas funciones confirma la transacción: la cuenta de referencias se
+actualiza junto con el documento que se crea o elimina.
+"""
+
+import mimetypes
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from werkzeug.datastructures import FileStorage
+
+from src.core.database import db
+from src.core.files.stored_file import StoredFile
+from src.web.storage.backends import ObjectInfo
+
+
+def _acquire(digest: str) -> Optional[str]:
+    """Suma una referencia al archivo con ese contenido, si ya está guardado.
+
+    Returns:
+        El nombre del objeto guardado, o None si no existe.
+    """
+    return db.session.execute(
+        sa.update(StoredFile)
+        .where(StoredFile.digest == digest)
+        .values(ref_count=StoredFile.ref_count + 1)
+        .returning(StoredFile.object_name)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+
+def store_file(file: FileStorage) -> ObjectInfo:
+    """
+    Guarda un archivo subido, salvo que ya exista uno con el mismo contenido.
+
+    Si el contenido ya está guardado, se descarta el archivo recibido (o su carga en
+    streaming) y se devuelve el objeto existente con una referencia más.
+
+    Args:
+        file (FileStorage): El archivo recibido en el formulario.
+
+    Returns:
+        ObjectInfo: Los metadatos del archivo: el nombre del objeto que se debe
+            guardar en `source`, y como `etag`, el SHA-256 de su contenido.
+    """
+    storage = current_app.storage
+    digest, size = storage.fingerprint(file)
+    content_type = file.mimetype or mimetypes.guess_type(file.filename or "")[0]
+    uploaded_at = datetime.now(timezone.utc)
+
+    object_name = _acquire(digest)
+    if object_name is not None:
+        storage.discard(file)
+        return ObjectInfo(object_name, size, digest, uploaded_at, content_type)
+
+    object_name = storage.upload(file)
+    try:
+        with db.session.begin_nested():
+            db.session.add(
+                StoredFile(digest=digest, object_name=object_name, size=size)
+            )
+    except IntegrityError:
+        # Otro request guardó el mismo contenido al mismo tiempo: se usa su objeto
+        existing = _acquire(digest)
+        if existing is None:
+            raise
+        storage.remove(object_name)
+        object_name = existing
+
+    return ObjectInfo(object_name, size, digest, uploaded_at, content_type)
+
+
+def file_columns(info: ObjectInfo) -> dict:
+    """
+    Devuelve las columnas de un documento que describen su archivo.
+
+    Args:
+        info (ObjectInfo): Los metadatos devueltos por `store_file`.
+
+    Returns:
+        dict: Los valores de `source`, `size`, `content_type`, `checksum` y
+            `uploaded_at`.
+    """
+    return {
+        "source": info.name,
+        "size": info.size,
+        "content_type": info.content_type,
+        "checksum": info.etag,
+        "uploaded_at": info.last_modified,
+    }
+
+
+def object_info(document) -> ObjectInfo:
+    """
+    Obtiene los metadatos del archivo de un documento.
+
+    Se usan los metadatos registrados en el documento; sólo los documentos subidos
+    antes de registrarlos (ver el comando `backfill-documents`) consultan el
+    almacenamiento.
+
+    Args:
+        document: Un documento de jinete, empleado o caballo con formato "file".
+
+    Returns:
+        ObjectInfo: Los metadatos del archivo.
+    """
+    if document.size is None or document.checksum is None:
+        return current_app.storage.stat(document.source)
+
+    uploaded_at = document.uploaded_at
+    if uploaded_at is not None and uploaded_at.tzinfo is None:
+        uploaded_at = uploaded_at.replace(tzinfo=timezone.utc)
+    return ObjectInfo(
+        document.source,
+        document.size,
+        document.checksum,
+        uploaded_at,
+        document.content_type,
+    )
+
+
+def release_files(object_names: Iterable[str]) -> List[str]:
+    """
+    Quita una referencia por cada aparición de los objetos indicados.
+
+    Los objetos que dejan de estar referenciados se quitan del índice; el llamador
+    debe eliminarlos del almacenamiento (junto con sus derivados, que también se
+    devuelven) después de confirmar la transacción. Los objetos guardados antes de la
+    deduplicación no figuran en el índice y tienen un único documento, por lo que
+    también se devuelven.
+
+    Args:
+        object_names (Iterable[str]): Los `source` de los documentos eliminados.
+
+    Returns:
+        List[str]: Los objetos que se pueden eliminar del almacenamiento.
+    """
+    counts = Counter(object_names)
+    if not counts:
+        return []
+
+    stored = {
+        stored_file.object_name: stored_file
+        for stored_file in db.session.scalars(
+            sa.select(StoredFile)
+            .where(StoredFile.object_name.in_(counts))
+            .with_for_update()
+        )
+    }
+
+    removable = []
+    for object_name, count in counts.items():
+        stored_file = stored.get(object_name)
+        if stored_file is not None:
+            stored_file.ref_count -= count
+            if stored_file.ref_count > 0:
+                continue
+            db.session.delete(stored_file)
+            removable.extend(stored_file.derivative_names())
+        removable.append(object_name)
+
+    return removable
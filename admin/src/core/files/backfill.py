@@ -0,0 +1,138 @@
+"""
+Registro de los metadatos de los archivos subidos antes de que los documentos los
+guardaran.
+
+Los documentos con formato "file" sin `checksum` se completan leyendo sus objetos del
+almacenamiento en un pool de hilos: la operación está dominada por la latencia de
+red, por lo que varias lecturas en paralelo acortan mucho el tiempo total. Las
+escrituras en la base de datos se hacen desde el hilo principal.
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+
+import sqlalchemy as sa
+from flask import current_app
+
+from src.core.database import db
+from src.core.files.documents import DOCUMENT_MODELS
+from src.core.files.stored_file import StoredFile
+from src.web.handlers.exceptions import StorageObjectNotFoundException
+from src.web.storage.backends import ObjectInfo
+
+METADATA_COLUMNS = ("size", "content_type", "checksum", "uploaded_at")
+DERIVATIVE_COLUMNS = ("thumbnail_name", "optimized_name", "processed_at")
+
+
+def add_metadata_columns():
+    """
+    Agrega las columnas de metadatos a las tablas de documentos, y las de los
+    derivados al índice de archivos, de una base ya existente. Es idempotente.
+    """
+    tables = [(model, METADATA_COLUMNS) for model in DOCUMENT_MODELS]
+    tables.append((StoredFile, DERIVATIVE_COLUMNS))
+
+    inspector = sa.inspect(db.engine)
+    with db.engine.begin() as connection:
+        for model, columns in tables:
+            table = model.__table__
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for name in columns:
+                if name in existing:
+                    continue
+                column_type = table.c[name].type.compile(dialect=db.engine.dialect)
+                connection.execute(
+                    sa.text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}")
+                )
+
+
+def read_metadata(storage, object_name: str) -> ObjectInfo:
+    """
+    Obtiene los metadatos de un objeto y calcula el SHA-256 de su contenido.
+
+    Args:
+        storage: El servicio de almacenamiento.
+        object_name (str): El nombre del objeto.
+
+    Returns:
+        ObjectInfo: Los metadatos del objeto, con el SHA-256 como `etag`.
+    """
+    stat = storage.stat(object_name)
+    sha256 = hashlib.sha256()
+    for chunk in storage.iter_object(object_name):
+        sha256.update(chunk)
+    return ObjectInfo(
+        object_name, stat.size, sha256.hexdigest(), stat.last_modified, stat.content_type
+    )
+
+
+def backfill_documents(workers: int = 8, batch_size: int = 200):
+    """
+    Completa los metadatos de los documentos subidos antes de registrarlos.
+
+    Args:
+        workers (int): Cantidad de objetos que se leen en paralelo.
+        batch_size (int): Cantidad de objetos que se confirman por transacción.
+    """
+    add_metadata_columns()
+
+    # Un mismo objeto puede estar referenciado por documentos de distintas tablas
+    pending: Dict[str, List[type]] = {}
+    for model in DOCUMENT_MODELS:
+        sources = db.session.scalars(
+            sa.select(model.source)
+            .where(model.format == "file", model.checksum.is_(None))
+            .distinct()
+        )
+        for source in sources:
+            pending.setdefault(source, []).append(model)
+
+    if not pending:
+        print("🆗 No hay documentos sin metadatos")
+        return
+
+    print(f"Leyendo {len(pending)} archivos con {workers} hilos...")
+    storage = current_app.storage
+    updated = missing = failed = 0
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="backfill"
+    ) as executor:
+        futures = {
+            executor.submit(read_metadata, storage, source): source
+            for source in pending
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                info = future.result()
+            except StorageObjectNotFoundException:
+                missing += 1
+                continue
+            except Exception as e:
+                failed += 1
+                print(f"Error al leer {source}: {e}")
+                continue
+
+            for model in pending[source]:
+                db.session.execute(
+                    sa.update(model)
+                    .where(model.source == source, model.checksum.is_(None))
+                    .values(
+                        size=info.size,
+                        content_type=info.content_type,
+                        checksum=info.etag,
+                        uploaded_at=info.last_modified,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            updated += 1
+            if updated % batch_size == 0:
+                db.session.commit()
+                print(f"{updated} de {len(pending)} archivos actualizados")
+
+    db.session.commit()
+    print(
+        f"🆗 {updated} archivos actualizados, {missing} no encontrados "
+        f"y {failed} con errores"
+    )
@@ -0,0 +1,153 @@
+"""
+Derivados de los archivos subidos: miniaturas y JPEG recomprimidos.
+
+Después de registrar un documento se programa el procesamiento de su archivo en el
+pool de `upload_processor`, por lo que no demora la carga. El procesamiento lee el
+archivo y guarda junto al original (mismo nombre con otro sufijo):
+
+- una miniatura JPEG (`<original>.thumb.jpg`) de las imágenes y, si `pypdfium2` está
+  instalado, de la primera página de los PDF;
+- para los JPEG de más de `UPLOAD_RECOMPRESS_THRESHOLD` bytes, una versión
+  recomprimida y reducida (`<original>.web.jpg`), que se usa para verlos en el
+  navegador. El original no se modifica.
+
+Los derivados se registran en `StoredFile`, por lo que un archivo compartido por
+varios documentos se procesa una sola vez, y se eliminan junto con el original.
+"""
+
+import io
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy as sa
+from flask import current_app
+from PIL import Image
+
+from src.core.database import db
+from src.core.files import images
+from src.core.files.stored_file import StoredFile
+
+THUMBNAIL_SUFFIX = ".thumb.jpg"
+OPTIMIZED_SUFFIX = ".web.jpg"
+
+
+def schedule_processing(object_name: str, content_type: Optional[str]):
+    """
+    Programa la generación de los derivados de un archivo en segundo plano.
+
+    Debe llamarse después de confirmar la transacción que registra el documento.
+
+    Args:
+        object_name (str): El nombre del objeto original.
+        content_type (Optional[str]): El tipo MIME del archivo.
+    """
+    if not may_have_preview(content_type):
+        return
+    current_app.upload_processor.submit(process_file, object_name, content_type)
+
+
+def may_have_preview(content_type: Optional[str]) -> bool:
+    """Indica si un archivo de ese tipo MIME puede tener miniatura (los PDF, sólo si
+    `pypdfium2` está instalado)."""
+    if not content_type:
+        return False
+    if content_type in images.PDF_TYPES:
+        return images.pypdfium2 is not None
+    return content_type.startswith("image/")
+
+
+def process_file(object_name: str, content_type: Optional[str]):
+    """
+    Genera y guarda los derivados de un archivo. Es idempotente: un archivo ya
+    procesado (o que otro hilo está procesando) se omite.
+
+    Args:
+        object_name (str): El nombre del objeto original.
+        content_type (Optional[str]): El tipo MIME del archivo.
+    """
+    stored = db.session.scalars(
+        sa.select(StoredFile)
+        .where(StoredFile.object_name == object_name)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if stored is None or stored.processed_at is not None:
+        db.session.rollback()
+        return
+
+    config = current_app.config
+    storage = current_app.storage
+    data = b"".join(storage.iter_object(object_name))
+
+    try:
+        if (
+            content_type in images.JPEG_TYPES
+            and config.get("UPLOAD_RECOMPRESS_JPEG", False)
+            and len(data) > config.get("UPLOAD_RECOMPRESS_THRESHOLD", 0)
+        ):
+            optimized = images.recompress_jpeg(
+                data,
+                max_dimension=config.get("UPLOAD_RECOMPRESS_MAX_DIMENSION", 2560),
+                quality=config.get("UPLOAD_RECOMPRESS_QUALITY", 85),
+            )
+            if optimized is not None:
+                name = object_name + OPTIMIZED_SUFFIX
+                storage.put(name, io.BytesIO(optimized), len(optimized), "image/jpeg")
+                stored.optimized_name = name
+
+        thumbnail = images.make_thumbnail(
+            data, content_type, size=config.get("UPLOAD_THUMBNAIL_SIZE", 320)
+        )
+        if thumbnail is not None:
+            name = object_name + THUMBNAIL_SUFFIX
+            storage.put(name, io.BytesIO(thumbnail), len(thumbnail), "image/jpeg")
+            stored.thumbnail_name = name
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # Archivo dañado o que no es lo que dice ser: queda sin derivados
+        current_app.logger.warning("No se pudo procesar %s: %s", object_name, e)
+
+    stored.processed_at = datetime.now()
+    db.session.commit()
+
+
+def derivative_of(document, kind: str = "thumbnail") -> Optional[str]:
+    """
+    Devuelve el nombre de un derivado del archivo de un documento.
+
+    Args:
+        document: Un documento de jinete, empleado o caballo.
+        kind (str): "thumbnail" (miniatura) u "optimized" (versión recomprimida).
+
+    Returns:
+        Optional[str]: El nombre del objeto, o None si no existe. Nunca devuelve el
+        original.
+    """
+    if document.format != "file" or not may_have_preview(document.content_type):
+        return None
+
+    stored = db.session.execute(
+        sa.select(StoredFile.thumbnail_name, StoredFile.optimized_name).where(
+            StoredFile.object_name == document.source
+        )
+    ).first()
+    if stored is None:
+        return None
+    return stored.thumbnail_name if kind == "thumbnail" else stored.optimized_name
+
+
+def web_version_of(document) -> Optional[str]:
+    """
+    Devuelve el nombre del objeto para ver una imagen en el navegador: la versión
+    recomprimida o, si no existe, el original. Como puede ser el original, sólo debe
+    usarse donde el usuario puede descargar el documento.
+
+    Args:
+        document: Un documento de jinete, empleado o caballo.
+
+    Returns:
+        Optional[str]: El nombre del objeto, o None si el documento no es una imagen.
+    """
+    if document.format != "file" or not (document.content_type or "").startswith(
+        "image/"
+    ):
+        return None
+    return derivative_of(document, "optimized") or document.source
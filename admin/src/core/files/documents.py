@@ -0,0 +1,12 @@
+"""
+Modelos de documentos cuyos archivos se guardan en el almacenamiento.
+
+Se definen aparte del paquete para no importar los modelos al cargar `src.core.files`,
+que a su vez importan los módulos de jinetes, empleados y caballos.
+"""
+
+from src.core.ecuestre.horse_document import HorseDocument
+from src.core.riders.rider_document import RiderDocument
+from src.core.team.employee_document import EmployeeDocument
+
+DOCUMENT_MODELS = (RiderDocument, EmployeeDocument, HorseDocument)
@@ -0,0 +1,98 @@
+"""
+Procesamiento de imágenes de los documentos subidos.
+
+Se usa Pillow (instalado como dependencia de matplotlib). Las vistas previas de los
+PDF requieren además `pypdfium2`; si no está instalado, los PDF no tienen vista
+previa.
+"""
+
+import io
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+try:
+    import pypdfium2
+except ImportError:  # pragma: no cover - dependencia opcional
+    pypdfium2 = None
+
+JPEG_TYPES = ("image/jpeg", "image/pjpeg")
+PDF_TYPES = ("application/pdf",)
+
+# Las imágenes de más píxeles que esto se rechazan (protección contra "bombas" de
+# descompresión)
+Image.MAX_IMAGE_PIXELS = 80_000_000
+
+
+def _save_jpeg(image: Image.Image, quality: int) -> bytes:
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _open_image(data: bytes, draft_size: Optional[int] = None) -> Image.Image:
+    image = Image.open(io.BytesIO(data))
+    if draft_size is not None:
+        # Decodifica los JPEG directamente a una escala reducida, mucho más rápido
+        image.draft("RGB", (draft_size, draft_size))
+    # Las fotos de los teléfonos suelen indicar la rotación en los metadatos EXIF
+    return ImageOps.exif_transpose(image)
+
+
+def recompress_jpeg(
+    data: bytes, max_dimension: int = 2560, quality: int = 85
+) -> Optional[bytes]:
+    """
+    Recomprime un JPEG, reduciendo su tamaño si supera `max_dimension` píxeles.
+
+    Args:
+        data (bytes): El contenido del JPEG original.
+        max_dimension (int): Ancho o alto máximo de la imagen resultante.
+        quality (int): Calidad JPEG (1 a 95).
+
+    Returns:
+        Optional[bytes]: El JPEG recomprimido, o None si no resulta más chico que el
+            original.
+    """
+    image = _open_image(data)
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    result = _save_jpeg(image, quality)
+    return result if len(result) < len(data) else None
+
+
+def make_thumbnail(
+    data: bytes, content_type: Optional[str], size: int = 320
+) -> Optional[bytes]:
+    """
+    Genera una miniatura JPEG de una imagen o de la primera página de un PDF.
+
+    Args:
+        data (bytes): El contenido del archivo.
+        content_type (Optional[str]): El tipo MIME del archivo.
+        size (int): Ancho o alto máximo de la miniatura.
+
+    Returns:
+        Optional[bytes]: La miniatura, o None si el archivo no tiene vista previa.
+    """
+    if content_type in PDF_TYPES:
+        if pypdfium2 is None:
+            return None
+        pdf = pypdfium2.PdfDocument(data)
+        try:
+            if len(pdf) == 0:
+                return None
+            page = pdf[0]
+            # Escala para que el lado mayor de la página mida `size` píxeles
+            scale = size / max(page.get_size())
+            image = page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+    elif content_type and content_type.startswith("image/"):
+        image = _open_image(data, draft_size=size)
+    else:
+        return None
+
+    image.thumbnail((size, size), Image.LANCZOS)
+    return _save_jpeg(image, quality=80)
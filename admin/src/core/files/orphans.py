@@ -0,0 +1,97 @@
+"""
+Recolección de los objetos del almacenamiento que ningún documento referencia.
+
+Quedan objetos huérfanos cuando falla la transacción que registraba un documento
+después de subir su archivo, o cuando se elimina un documento sin su archivo. Para
+encontrarlos se recorre el listado del bucket (de a páginas, sin cargarlo completo)
+y se lo compara con el conjunto de los `source` de las tres tablas de documentos.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Set
+
+import sqlalchemy as sa
+from flask import current_app
+
+from src.core.database import db
+from src.core.files.documents import DOCUMENT_MODELS
+from src.core.files.stored_file import StoredFile
+
+
+def referenced_objects() -> Set[str]:
+    """
+    Obtiene los nombres de todos los objetos referenciados por algún documento o por
+    el índice de archivos deduplicados (incluidos sus derivados).
+
+    Returns:
+        Set[str]: Los nombres de los objetos en uso.
+    """
+    queries = [
+        sa.select(model.source).where(model.format == "file")
+        for model in DOCUMENT_MODELS
+    ]
+    queries.append(sa.select(StoredFile.object_name))
+    for column in (StoredFile.thumbnail_name, StoredFile.optimized_name):
+        queries.append(sa.select(column).where(column.is_not(None)))
+    return set(db.session.scalars(sa.union(*queries)))
+
+
+def collect_orphans(
+    dry_run: bool = False, min_age: timedelta = timedelta(hours=1), batch_size: int = 1000
+):
+    """
+    Elimina del almacenamiento los objetos que ningún documento referencia.
+
+    Los objetos más recientes que `min_age` no se eliminan: pueden pertenecer a una
+    carga cuyo documento todavía no se confirmó.
+
+    Args:
+        dry_run (bool): Si es True, sólo informa los huérfanos sin eliminarlos.
+        min_age (timedelta): Antigüedad mínima de un objeto para considerarlo huérfano.
+        batch_size (int): Cantidad de objetos que se eliminan por operación.
+    """
+    storage = current_app.storage
+    referenced = referenced_objects()
+    # La sesión no se necesita mientras se recorre el bucket
+    db.session.close()
+
+    cutoff = datetime.now(timezone.utc) - min_age
+    listed = orphans = orphan_bytes = removed = 0
+    failed: List[str] = []
+    batch: List[str] = []
+
+    def flush():
+        nonlocal removed
+        errors = storage.remove_many(batch)
+        failed.extend(errors)
+        removed += len(batch) - len(errors)
+        batch.clear()
+
+    for info in storage.list_objects():
+        listed += 1
+        if info.name in referenced:
+            continue
+        if info.last_modified is not None and info.last_modified > cutoff:
+            continue
+
+        orphans += 1
+        orphan_bytes += info.size
+        if dry_run:
+            print(f"{info.name}\t{info.size}\t{info.last_modified or ''}")
+            continue
+
+        batch.append(info.name)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    print(
+        f"{listed} objetos, {len(referenced)} referenciados, "
+        f"{orphans} huérfanos ({orphan_bytes / (1024 * 1024):.1f} MiB)"
+    )
+    if dry_run:
+        print("🆗 Simulación: no se eliminó ningún objeto")
+    else:
+        print(f"🆗 {removed} objetos eliminados, {len(failed)} con errores")
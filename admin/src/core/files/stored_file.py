@@ -0,0 +1,38 @@
+"""
+Este módulo define el modelo `StoredFile`, el índice de los archivos guardados en el
+almacenamiento según su contenido.
+
+Cada fila representa un objeto del almacenamiento, identificado por el SHA-256 de su
+contenido, y cuenta cuántos documentos (de jinetes, empleados y caballos) lo
+referencian en su columna `source`. También registra los objetos derivados que se
+generan después de subirlo (una miniatura y, para los JPEG grandes, una versión
+recomprimida), que se guardan junto al original.
+"""
+
+from datetime import datetime
+
+from src.core.database import db
+
+
+class StoredFile(db.Model):
+    """Modelo de un archivo guardado en el almacenamiento."""
+
+    __tablename__ = "stored_files"
+
+    digest = db.Column(db.String(64), primary_key=True)
+    object_name = db.Column(db.String(256), unique=True, nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    # Derivados, generados en segundo plano (ver `src.core.files.derivatives`)
+    thumbnail_name = db.Column(db.String(300), nullable=True)
+    optimized_name = db.Column(db.String(300), nullable=True)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    def derivative_names(self):
+        """Devuelve los nombres de los objetos derivados que existen."""
+        return [name for name in (self.thumbnail_name, self.optimized_name) if name]
+
+    def __repr__(self):
+        return f"<StoredFile {self.digest} -> {self.object_name} ({self.ref_count})>"
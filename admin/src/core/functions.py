@@ -154,23 +154,6 @@ def format_name(name):
     return formatted_name
 
 
-def delete_document(source):
-    """
-    Elimina el documento de MinIO con la fuente especificada.
-
-    Args:
-        source (str): Fuente del documento.
-
-    Returns:
-        str: La fuente del documento eliminado.
-    """
-    client = current_app.storage.client
-    bucket_name = "grupo13"
-    client.remove_object(bucket_name, source)
-
-    return source
-
-
 def check_valid_format(file: FileStorage):
     """
     Verifica si el formato del archivo es válido.
@@ -490,6 +473,9 @@ def check_file_size(file: FileStorage, limite_mb: int = 15):
     """
     Verifica si el tamaño del archivo es válido.
 
+    El tamaño se mide sobre el contenido recibido: el encabezado `Content-Length` de
+    cada archivo de un formulario es opcional y los navegadores no suelen enviarlo.
+
     Args:
         file (FileStorage): El archivo a verificar.
         limite_mb (int): El límite de tamaño en megabytes.
@@ -498,7 +484,12 @@ def check_file_size(file: FileStorage, limite_mb: int = 15):
         bool: True si el tamaño del archivo es válido, False en caso contrario.
     """
     limite_bytes = limite_mb * 1024 * 1024
-    return file.content_length < limite_bytes
+    size = getattr(file.stream, "size", None)  # Archivos cargados en streaming
+    if size is None:
+        file.seek(0, 2)
+        size = file.tell()
+        file.seek(0)
+    return size < limite_bytes
 
 
 def check_description(description):
@@ -0,0 +1,210 @@
+"""
+Módulo de paginación por clave (keyset / seek pagination).
+
+A diferencia de `db.paginate`, que utiliza OFFSET y ejecuta un `COUNT(*)` en cada
+request, la paginación por clave se posiciona a partir de los valores de la última
+fila mostrada (`WHERE (a, b, id) > (:a, :b, :id)`), por lo que el costo de cada
+página es el mismo sin importar qué tan profunda sea.
+
+Las posiciones se transportan entre requests mediante cursores opacos
+(JSON codificado en base64 url-safe).
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence
+
+import sqlalchemy as sa
+
+from src.core.database import db
+
+
+class InvalidCursorException(ValueError):
+    """Excepción lanzada cuando el cursor de paginación no es válido."""
+
+    def __init__(self, message="El cursor de paginación no es válido"):
+        self.message = message
+        super().__init__(self.message)
+
+
+def encode_cursor(values: Sequence[Any], direction: str) -> str:
+    """
+    Codifica una posición de paginación en un cursor opaco.
+
+    Args:
+        values (Sequence): Valores de las columnas clave de la fila de referencia.
+        direction (str): "n" para avanzar, "p" para retroceder.
+
+    Returns:
+        str: El cursor codificado.
+    """
+    payload = json.dumps({"k": list(values), "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _coerce(value: Any, key) -> Any:
+    """
+    Convierte un valor de un cursor al tipo de Python de su columna clave.
+
+    Raises:
+        InvalidCursorException: Si el valor no corresponde al tipo de la columna.
+    """
+    if value is None:
+        return None
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    # bool es subclase de int, pero no es un valor válido para una columna numérica
+    if isinstance(value, bool) and python_type is not bool:
+        raise InvalidCursorException()
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if python_type is None and isinstance(value, (str, int, float)):
+        return value
+    if python_type is not None and isinstance(value, python_type):
+        return value
+    raise InvalidCursorException()
+
+
+def decode_cursor(cursor: str, keys: Sequence):
+    """
+    Decodifica un cursor generado por `encode_cursor`.
+
+    Cada valor se valida contra el tipo de su columna clave, de modo que un cursor
+    alterado (por ejemplo, un texto en la posición del id) se rechaza en lugar de
+    producir un error en la base de datos.
+
+    Args:
+        cursor (str): El cursor a decodificar.
+        keys (Sequence): Columnas clave esperadas.
+
+    Raises:
+        InvalidCursorException: Si el cursor está mal formado.
+
+    Returns:
+        tuple: Los valores de las columnas clave y la dirección.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        values, direction = payload["k"], payload["d"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursorException()
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(keys)
+        or direction not in ("n", "p")
+    ):
+        raise InvalidCursorException()
+
+    return [_coerce(value, key) for value, key in zip(values, keys)], direction
+
+
+class KeysetPagination:
+    """Página de resultados obtenida mediante paginación por clave."""
+
+    def __init__(
+        self,
+        items: List[Any],
+        per_page: int,
+        next_cursor: Optional[str],
+        prev_cursor: Optional[str],
+        total: Optional[int] = None,
+    ):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self) -> bool:
+        """Indica si existe una página siguiente."""
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        """Indica si existe una página anterior."""
+        return self.prev_cursor is not None
+
+
+def keyset_paginate(
+    query,
+    keys: Sequence,
+    per_page: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    with_count: bool = False,
+) -> KeysetPagination:
+    """
+    Pagina una consulta `select` utilizando las columnas `keys` como clave de orden.
+
+    La última columna de `keys` debe ser única (por ejemplo, el id) para que el orden
+    sea total y ninguna fila se repita o se pierda entre páginas. Cualquier orden que
+    tenga la consulta se reemplaza por el de las columnas clave.
+
+    Args:
+        query: Consulta `select` de SQLAlchemy, con los filtros ya aplicados.
+        keys (Sequence): Columnas que definen el orden.
+        per_page (int): Cantidad de elementos por página.
+        cursor (str): Cursor devuelto por una página anterior. Si es None se
+            obtiene la primera página.
+        descending (bool): Si es True, se ordena de forma descendente.
+        with_count (bool): Si es True, se calcula además la cantidad total de filas.
+
+    Raises:
+        InvalidCursorException: Si el cursor está mal formado.
+
+    Returns:
+        KeysetPagination: La página de resultados con los cursores siguiente y anterior.
+    """
+    values, direction = (
+        decode_cursor(cursor, keys) if cursor else (None, "n")
+    )
+    backwards = direction == "p"
+
+    # Al retroceder se recorre el orden inverso y luego se invierte el resultado
+    reverse = descending != backwards
+    order = [key.desc() if reverse else key.asc() for key in keys]
+
+    page_query = query.order_by(None).order_by(*order)
+    if values is not None:
+        row = sa.tuple_(*keys)
+        bound = sa.tuple_(
+            *[sa.literal(value, key.type) for value, key in zip(values, keys)]
+        )
+        page_query = page_query.where(row < bound if reverse else row > bound)
+
+    rows = db.session.execute(page_query.limit(per_page + 1)).scalars().all()
+    has_more = len(rows) > per_page
+    items = list(rows[:per_page])
+    if backwards:
+        items.reverse()
+
+    def position(item):
+        return [getattr(item, key.key) for key in keys]
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or backwards:
+            next_cursor = encode_cursor(position(items[-1]), "n")
+        if (has_more and backwards) or (values is not None and not backwards):
+            prev_cursor = encode_cursor(position(items[0]), "p")
+
+    total = None
+    if with_count:
+        total = db.session.execute(
+            sa.select(sa.func.count()).select_from(query.order_by(None).subquery())
+        ).scalar()
+
+    return KeysetPagination(
+        items=items,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total=total,
+    )
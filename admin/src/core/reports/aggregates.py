@@ -0,0 +1,59 @@
+"""
+Módulo de consultas de agregación para reportes y gráficos.
+
+Las distribuciones que muestran los gráficos se calculan por completo en la base de
+datos (`GROUP BY` y `COUNT(*) FILTER (WHERE ...)`), de modo que sólo viajan unas pocas
+tuplas y el costo de los endpoints no crece con la cantidad de filas de las tablas.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import sqlalchemy as sa
+
+from src.core.database import db
+
+
+def count_by(column, *conditions) -> List[Tuple[Any, int]]:
+    """
+    Cuenta las filas agrupadas por los valores de una columna.
+
+    Args:
+        column: Columna por la cual agrupar.
+        *conditions: Condiciones adicionales que deben cumplir las filas contadas.
+
+    Returns:
+        List[Tuple[Any, int]]: Tuplas (valor, cantidad), de mayor a menor cantidad.
+    """
+    count = sa.func.count().label("count")
+    query = (
+        sa.select(column, count)
+        .where(*conditions)
+        .group_by(column)
+        .order_by(count.desc(), column)
+    )
+
+    return [tuple(row) for row in db.session.execute(query)]
+
+
+def count_filtered(model, **conditions) -> Dict[str, int]:
+    """
+    Cuenta, en una sola pasada sobre la tabla, las filas que cumplen cada condición.
+
+    Ejemplo:
+        count_filtered(Rider, becados=Rider.scholarship_holder.is_(True))
+
+    Args:
+        model: Modelo (tabla) sobre el cual contar.
+        **conditions: Condiciones con nombre; cada una genera un
+            `COUNT(*) FILTER (WHERE condición)`.
+
+    Returns:
+        Dict[str, int]: La cantidad de filas que cumple cada condición.
+    """
+    columns = [
+        sa.func.count().filter(condition).label(name)
+        for name, condition in conditions.items()
+    ]
+    row = db.session.execute(sa.select(*columns).select_from(model)).one()
+
+    return dict(row._mapping)
@@ -0,0 +1,208 @@
+"""
+Módulo de renderizado de gráficos.
+
+Los gráficos se dibujan con la API orientada a objetos de matplotlib (`Figure`), sin
+usar el estado global de `pyplot`, por lo que pueden generarse en paralelo de forma
+segura. El módulo no depende de Flask ni de la base de datos: recibe los datos ya
+calculados y devuelve la imagen, lo que permite ejecutarlo en procesos separados.
+"""
+
+import io
+from datetime import datetime
+from typing import Dict, List
+
+import matplotlib
+from matplotlib.figure import Figure
+
+
+def _empty_chart(message: str, timestamp: str, **text_kwargs) -> Figure:
+    """Crea una figura que sólo muestra un mensaje y la fecha de generación."""
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    ax.text(0.5, 0.5, message, fontsize=16, ha="center", va="center", **text_kwargs)
+    ax.text(0.5, 0.1, f"Generado: {timestamp}", fontsize=10, ha="center", va="center")
+    ax.axis("off")
+    return fig
+
+
+def _to_bytes(fig: Figure, image_format: str) -> bytes:
+    """Exporta la figura al formato indicado."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format=image_format, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render_pie_chart_disabilities(
+    frequencies: Dict[str, int], image_format: str = "png"
+) -> bytes:
+    """
+    Renderiza un gráfico de pastel que muestra la distribución de discapacidades.
+
+    Args:
+        frequencies (Dict[str, int]): Un diccionario con las frecuencias de cada discapacidad.
+        image_format (str): Formato de la imagen ("png" o "svg").
+
+    Returns:
+        bytes: El gráfico de pastel en el formato indicado.
+    """
+    timestamp = datetime.now().strftime("%d/%m/%Y")
+
+    if not frequencies:
+        return _to_bytes(_empty_chart("No hay datos disponibles", timestamp), image_format)
+
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    labels: List[str] = list(frequencies.keys())
+    sizes: List[int] = list(frequencies.values())
+    explode = [0.1 if i == max(sizes) else 0 for i in sizes]
+
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        autopct="%1.1f%%",
+        startangle=140,
+        textprops={"fontsize": 8},
+        explode=explode,
+        colors=matplotlib.colormaps["Set2"].colors,
+    )
+    ax.set_title(f"Distribución de Diagnósticos (Generado: {timestamp})", fontsize=16)
+
+    for text in autotexts:
+        text.set_color("white")
+        text.set_fontsize(10)
+
+    ax.legend(
+        wedges,
+        labels,
+        title="Diagnósticos",
+        loc="center left",
+        bbox_to_anchor=(1, 0, 0.5, 1),
+    )
+
+    return _to_bytes(fig, image_format)
+
+
+def render_scholarship_pie_chart(
+    scholarship_counts: Dict[str, int], image_format: str = "png"
+) -> bytes:
+    """
+    Renderiza un gráfico de pastel que muestra la proporción de becados vs. no becados.
+
+    Args:
+        scholarship_counts (Dict[str, int]): Un diccionario con las cantidades de becados
+            y no becados.
+        image_format (str): Formato de la imagen ("png" o "svg").
+
+    Returns:
+        bytes: El gráfico de pastel en el formato indicado.
+    """
+    timestamp = datetime.now().strftime("%d/%m/%Y")
+
+    if scholarship_counts["becados"] == 0 and scholarship_counts["no becados"] == 0:
+        return _to_bytes(_empty_chart("No hay datos disponibles", timestamp), image_format)
+
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    sizes = [scholarship_counts["becados"], scholarship_counts["no becados"]]
+    labels = ["Becados", "No Becados"]
+    explode = [0.1, 0]
+    colors = ["#6A0DAD", "#A9A9A9"]
+
+    wedges, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        autopct="%1.1f%%",
+        startangle=140,
+        explode=explode,
+        colors=colors,
+    )
+    ax.set_title(f"Proporción de Becados (Generado: {timestamp})", fontsize=16)
+
+    for text in autotexts:
+        text.set_color("white")
+        text.set_fontsize(10)
+
+    ax.legend(
+        wedges,
+        labels,
+        title="Becados",
+        loc="center left",
+        bbox_to_anchor=(1, 0, 0.5, 1),
+    )
+
+    return _to_bytes(fig, image_format)
+
+
+def render_bar_chart_job_positions(
+    position_counts: Dict[str, int], image_format: str = "png"
+) -> bytes:
+    """
+    Renderiza un gráfico de barras que muestra la distribución de puestos laborales con un
+    timestamp.
+
+    Args:
+        position_counts (Dict[str, int]): Cantidad de empleados activos por puesto.
+        image_format (str): Formato de la imagen ("png" o "svg").
+
+    Returns:
+        bytes: El gráfico de barras en el formato indicado.
+    """
+    timestamp = datetime.now().strftime("%d/%m/%Y")
+
+    labels = list(position_counts.keys())
+    counts = list(position_counts.values())
+    if all(count == 0 for count in counts):
+        return _to_bytes(
+            _empty_chart("No hay datos", timestamp, color="red"), image_format
+        )
+
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    bars = ax.bar(labels, counts, color="skyblue")
+    ax.set_xlabel("Puesto Laboral")
+    ax.set_ylabel("Cantidad de Empleados")
+    ax.set_title(f"Distribución de Puestos Laborales (Generado: {timestamp})")
+    ax.set_xticks(range(len(labels)), labels, rotation=45, ha="right")
+
+    for bar in bars:
+        yval = bar.get_height() / 2
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            yval + 0.1,
+            str(int(yval)),
+            ha="center",
+            va="bottom",
+            fontsize=10,
+            fontweight="bold",
+        )
+
+    return _to_bytes(fig, image_format)
+
+
+CHARTS = {
+    "disabilities": render_pie_chart_disabilities,
+    "scholarships": render_scholarship_pie_chart,
+    "job_positions": render_bar_chart_job_positions,
+}
+
+
+def render_chart(chart: str, data, image_format: str = "png") -> bytes:
+    """
+    Renderiza el gráfico indicado por nombre. Es el punto de entrada de los procesos
+    que renderizan gráficos.
+
+    Args:
+        chart (str): Nombre del gráfico (una clave de `CHARTS`).
+        data: Datos de entrada del gráfico.
+        image_format (str): Formato de la imagen ("png" o "svg").
+
+    Returns:
+        bytes: El gráfico renderizado.
+    """
+    return CHARTS[chart](data, image_format=image_format)
+
+
+def warm_up():
+    """Inicializa un proceso de renderizado cargando matplotlib y sus fuentes."""
+    matplotlib.use("Agg")
+    render_chart("scholarships", {"becados": 1, "no becados": 1})
@@ -1,10 +1,6 @@
-from typing import List
-
 from flask import current_app
-from sqlalchemy import func
 
-from src.core import riders
-from src.core.database import db
+from src.core.reports.aggregates import count_by, count_filtered
 from src.core.riders.disability import Disability
 from src.core.riders.rider import Rider
 from src.core.team.employee import Employee
@@ -12,48 +8,40 @@ from src.core.team.employee import Employee
 
 def calculate_diagnosis_frequencies() -> dict:
     """
-    Consulta la base de datos para contar las ocurrencias de cada diagnóstico.
+    Consulta la base de datos para contar las ocurrencias de cada diagnóstico
+    registrado en el sistema; el filtrado y el conteo se resuelven en la consulta.
     Retorna un diccionario con los nombres de los diagnósticos como claves y sus
     frecuencias como valores.
 
     Returns:
         dict: Diccionario con los nombres de los diagnósticos y sus frecuencias.
     """
-    results = (
-        db.session.query(Disability.diagnosis, func.count(Disability.diagnosis))
-        .filter(
-            Disability.diagnosis.isnot(None),  # Excluir valores nulos
-            Disability.diagnosis != "",  # Excluir cadenas vacías
-        )
-        .group_by(Disability.diagnosis)
-        .all()
+    results = count_by(
+        Disability.diagnosis,
+        Disability.diagnosis.in_(current_app.config["DISABILITIES_IN_SYSTEM"]),
     )
-    filtered_results = []
-    for result in results:
-        if result[0] in current_app.config["DISABILITIES_IN_SYSTEM"]:
-            filtered_results.append(result)
-    frequencies = {diagnosis: count for diagnosis, count in filtered_results}
+    frequencies = {diagnosis: count for diagnosis, count in results}
 
     return frequencies
 
 
 def calculate_scholarship_proportion() -> dict:
     """
-    Calcula la proporción de riders becados y no becados.
+    Calcula la proporción de riders becados y no becados con una única consulta
+    de agregación, sin cargar los jinetes.
     Retorna un diccionario con las claves "becados" y "no becados" y sus respectivos
     conteos.
 
     Returns:
         dict: Diccionario con la proporción de riders becados y no becados.
     """
-    contador = {"becados": 0, "no becados": 0}
-    lista_de_riders: List[Rider] = riders.get_riders_in_list()
-
-    for rider in lista_de_riders:
-        if rider.scholarship_holder:
-            contador["becados"] += 1
-        else:
-            contador["no becados"] += 1
+    contador = count_filtered(
+        Rider,
+        **{
+            "becados": Rider.scholarship_holder.is_(True),
+            "no becados": Rider.scholarship_holder.is_(False),
+        },
+    )
 
     return contador
 
@@ -86,12 +74,7 @@ def calculate_active_job_position_frequencies() -> dict:
         "Auxiliar de mantenimiento",
         "Otro",
     ]
-    active_employees = (
-        db.session.query(Employee.job_position, db.func.count(Employee.job_position))
-        .filter(Employee.active.is_(True))
-        .group_by(Employee.job_position)
-        .all()
-    )
+    active_employees = count_by(Employee.job_position, Employee.active.is_(True))
     position_counts = {pos: 0 for pos in job_positions}
     for job_position, count in active_employees:
         position_counts[job_position] = count
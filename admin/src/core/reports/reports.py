@@ -1,10 +1,12 @@
 from typing import Dict, List
 
-from sqlalchemy import func
+import sqlalchemy as sa
+from sqlalchemy import Row, func
 
 from src.core.database import db
 from src.core.riders.institutional_work import InstitutionalWork
 from src.core.riders.rider import Rider
+from src.core.riders.rider_tutor import RiderTutor
 
 
 def get_ranking_proposals() -> List[Dict[str, int]]:
@@ -28,30 +30,56 @@ def get_ranking_proposals() -> List[Dict[str, int]]:
     return ranking
 
 
-def get_riders_without_full_information() -> List[Rider]:
+def get_riders_without_full_information() -> List[Row]:
     """
-    Obtiene la lista de jinetes que no tienen toda la información completa,
-    ya sea porque algún campo es nulo o por falta de un tutor principal.
+    Obtiene los jinetes que no tienen toda la información completa, ya sea porque
+    falta alguna sección o porque no tienen un tutor principal.
+
+    Todo se resuelve en una única consulta: la existencia del tutor principal se
+    verifica con un `EXISTS` correlacionado sobre `rider_tutor.is_primary`, y cada
+    fila trae directamente el indicador de completitud de cada sección, por lo que
+    no se instancian objetos Rider.
 
     Returns:
-        list: Lista de objetos Rider que tienen información incompleta.
+        list: Filas con `last_name`, `name`, `dni` y los indicadores booleanos
+              `has_disability`, `has_insurance`, `has_institutional_work` y
+              `has_primary_tutor`, ordenadas por apellido.
     """
-    riders_with_null_fields: List[Rider] = Rider.query.filter(
-        db.or_(
-            Rider.disability_id.is_(None),
-            Rider.benefit_id.is_(None),
-            Rider.insurance_id.is_(None),
-            Rider.school_id.is_(None),
-            Rider.institutional_work_id.is_(None),
-        )
-    ).all()
+    primary_tutor = (
+        sa.exists()
+        .where(RiderTutor.rider_id == Rider.id, RiderTutor.is_primary.is_(True))
+        .correlate(Rider)
+    )
+    has_disability = sa.and_(
+        Rider.disability_id.is_not(None), Rider.benefit_id.is_not(None)
+    )
+    has_insurance = sa.and_(
+        Rider.insurance_id.is_not(None), Rider.school_id.is_not(None)
+    )
+    has_institutional_work = Rider.institutional_work_id.is_not(None)
 
-    all_riders: List[Rider] = Rider.query.all()
-    for rider in all_riders:
-        if rider.primary_tutor is None and rider not in riders_with_null_fields:
-            riders_with_null_fields.append(rider)
+    query = (
+        sa.select(
+            Rider.last_name,
+            Rider.name,
+            Rider.dni,
+            has_disability.label("has_disability"),
+            has_insurance.label("has_insurance"),
+            has_institutional_work.label("has_institutional_work"),
+            primary_tutor.label("has_primary_tutor"),
+        )
+        .where(
+            sa.or_(
+                sa.not_(has_disability),
+                sa.not_(has_insurance),
+                sa.not_(has_institutional_work),
+                sa.not_(primary_tutor),
+            )
+        )
+        .order_by(Rider.last_name.asc(), Rider.id.asc())
+    )
 
-    return riders_with_null_fields
+    return db.session.execute(query).all()
 
 
 def get_riders_in_debt() -> List[Rider]:
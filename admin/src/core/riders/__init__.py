@@ -2,13 +2,17 @@ from datetime import datetime
 from typing import List, Optional
 
 import sqlalchemy as sa
-import ulid
 from sqlalchemy import or_, select
+from sqlalchemy.orm import joinedload, selectinload
 
 from flask import abort, current_app, flash
 
+from src.core.charges.charge import Charge
 from src.core.database import db
+from src.core.files import file_columns, object_info, release_files, store_file
+from src.core.files.derivatives import schedule_processing
 from src.core.functions import format_name
+from src.core.pagination import KeysetPagination, keyset_paginate
 from src.core.riders.benefits import Benefits, PensionType
 from src.core.riders.disability import Disability, DisabilityType
 from src.core.riders.insurance import Insurance
@@ -20,6 +24,12 @@ from src.core.riders.school import School
 from src.core.riders.tutor import Tutor
 from src.web.handlers.exceptions import RiderNotFoundException
 
+# Columnas que definen el orden total de cada listado. La última columna es
+# siempre el id para desempatar, lo que permite paginar por clave (keyset).
+RIDERS_KEYS_BY_NAME = (Rider.name, Rider.last_name, Rider.id)
+RIDERS_KEYS_BY_LAST_NAME = (Rider.last_name, Rider.name, Rider.id)
+RIDERS_KEYS_BY_ID = (Rider.id,)
+
 
 def create_rider(params):
     """
@@ -84,12 +94,15 @@ def unique_dni(dni: str) -> bool:
 
 def delete_rider(user_id: int) -> None:
     """
-    Elimina un jinete de la base de datos.
+    Elimina un jinete de la base de datos junto con sus cobros, sus documentos y sus
+    vínculos con tutores (los tutores no se eliminan).
 
-    Esta función recibe el ID de un usuario (jinete) y elimina el registro correspondiente
-    de la base de datos. Si el jinete no existe, se invoca la función `get_rider_or_abort`
-    para abortar la operación. Después de eliminar el jinete, se confirma la transacción
-    en la base de datos.
+    La eliminación se hace con sentencias DELETE sobre conjuntos (vínculos con
+    tutores, cobros, documentos y el jinete) en una única transacción. Los archivos de
+    los documentos que ningún otro documento comparte se eliminan del almacenamiento
+    después de confirmarla, en lote y en segundo plano, por lo que no demoran la
+    respuesta. Si el jinete no existe, se muestra un mensaje de error y se aborta con
+    un error 403.
 
     Parámetros:
     user_id (int): El ID del jinete que se desea eliminar.
@@ -97,16 +110,29 @@ def delete_rider(user_id: int) -> None:
     Retorna:
     None: La función no retorna ningún valor.
     """
-    rider: Rider = get_rider_or_abort(user_id=str(user_id))
-    for tutor in rider.tutors:
-        connection: RiderTutor = find_connection_rider_tutor(
-            rider_id=rider.id, tutor_id=tutor.tutor_id
+    sources: List[str] = db.session.scalars(
+        select(RiderDocument.source).where(
+            RiderDocument.rider_id == user_id, RiderDocument.format == "file"
         )
-        delete_kinship(connection)
+    ).all()
+    removable = release_files(sources)
 
-    db.session.delete(rider)
+    db.session.execute(sa.delete(RiderTutor).where(RiderTutor.rider_id == user_id))
+    # Los DELETE sobre conjuntos no aplican la cascada del ORM de `Rider.charges`
+    db.session.execute(sa.delete(Charge).where(Charge.rider_id == user_id))
+    db.session.execute(
+        sa.delete(RiderDocument).where(RiderDocument.rider_id == user_id)
+    )
+    result = db.session.execute(sa.delete(Rider).where(Rider.id == user_id))
+    if result.rowcount == 0:
+        db.session.rollback()
+        flash("No se puede acceder al jinete solicitado, reintente", "error")
+        abort(403)
     db.session.commit()
 
+    # Los archivos se eliminan sólo si la transacción se confirmó
+    current_app.storage.remove_in_background(removable)
+
 
 def get_rider_or_abort(user_id: str) -> Rider:
     """Obtiene el jinete por ID o lanza un error 403 si no se encuentra."""
@@ -118,6 +144,49 @@ def get_rider_or_abort(user_id: str) -> Rider:
         abort(403)
 
 
+def get_rider_profile(user_id) -> Optional[Rider]:
+    """
+    Obtiene un jinete junto con todo su perfil en una cantidad fija de consultas.
+
+    Las relaciones uno a uno (discapacidad y su tipo, beneficios, obra social, escuela
+    y trabajo institucional) se cargan con un JOIN en la misma consulta del jinete.
+    Los tutores (con los datos de cada tutor) se cargan con una consulta adicional
+    (`selectin`). De esta forma acceder a cualquier sección del perfil no dispara
+    consultas perezosas. Los documentos no se cargan: su página los pagina con
+    `get_documents_by_rider_id`.
+
+    Parámetros:
+    - user_id (int): El ID del jinete.
+
+    Retorna:
+    - Rider o None: El jinete con su perfil cargado, o `None` si no existe.
+    """
+    query = (
+        select(Rider)
+        .where(Rider.id == int(user_id))
+        .options(
+            joinedload(Rider.disability).joinedload(Disability.disability_type),
+            joinedload(Rider.benefits),
+            joinedload(Rider.insurance),
+            joinedload(Rider.school),
+            joinedload(Rider.institutional_work),
+            selectinload(Rider.tutors).joinedload(RiderTutor.tutor),
+        )
+    )
+
+    return db.session.execute(query).unique().scalar_one_or_none()
+
+
+def get_rider_profile_or_abort(user_id) -> Rider:
+    """Obtiene el perfil completo del jinete por ID o lanza un error 403 si no se encuentra."""
+    rider = get_rider_profile(user_id)
+    if rider is None:
+        flash("No se puede acceder al jinete solicitado, reintente", "error")
+        abort(403)
+
+    return rider
+
+
 def create_disability(params, rider):
     """
     Crea una entrada en la tabla de discapacidad para el jinete/amazona pasado como parámetro
@@ -557,9 +626,9 @@ def get_riders_ordered_by_name(ascendent: bool = True):
     - get_riders_ordered_by_name(ascendent=True)
     """
     if ascendent:
-        return sa.select(Rider).order_by(Rider.name.asc())
+        return sa.select(Rider).order_by(*[key.asc() for key in RIDERS_KEYS_BY_NAME])
     else:
-        return sa.select(Rider).order_by(Rider.name.desc())
+        return sa.select(Rider).order_by(*[key.desc() for key in RIDERS_KEYS_BY_NAME])
 
 
 def get_riders_ordered_by_last_name(ascendent: bool = True):
@@ -583,9 +652,13 @@ def get_riders_ordered_by_last_name(ascendent: bool = True):
     - get_riders_ordered_by_last_name(ascendent=False)
     """
     if ascendent:
-        return sa.select(Rider).order_by(Rider.last_name.asc())
+        return sa.select(Rider).order_by(
+            *[key.asc() for key in RIDERS_KEYS_BY_LAST_NAME]
+        )
     else:
-        return sa.select(Rider).order_by(Rider.last_name.desc())
+        return sa.select(Rider).order_by(
+            *[key.desc() for key in RIDERS_KEYS_BY_LAST_NAME]
+        )
 
 
 def filter_by_professionals(riders_query, professionals):
@@ -856,33 +929,20 @@ def create_document(title, doc_type, format, source, rider_id):
         raise RiderNotFoundException()
 
     if format == "file":
-        client = current_app.storage.client
-        bucket_name = "grupo13"
-        source.seek(
-            0, 2
-        )  # Indico dos punteros, uno en el comienzo del archivo, otro en el final
-        length = source.tell()  # Calculo el largo del archivo
-        source.seek(0)
-        file_id = str(ulid.ulid())  # Creo un identificador unico para el archivo
-        file_name = (
-            f"{file_id}-{source.filename}"  # Guardo el nombre del archivo junto a su id
-        )
-        client.put_object(
-            bucket_name, file_name, source, length, content_type=source.content_type
-        )
-
-        source = file_name
+        # Guardo el archivo, o reutilizo uno ya guardado con el mismo contenido
+        stored = store_file(source)
 
         new_document = RiderDocument(
             title=title,
             document_type=doc_type,
             format=format,
-            source=source,
             rider_id=rider_id,
+            **file_columns(stored),
         )
 
         db.session.add(new_document)
         db.session.commit()
+        schedule_processing(new_document.source, new_document.content_type)
 
         return new_document
 
@@ -997,7 +1057,7 @@ def delete_document(document):
 
     Esta función elimina un documento de jinete de la base de datos y, si el documento
     tiene un formato de archivo, también elimina el archivo asociado en el sistema
-    de almacenamiento.
+    de almacenamiento, salvo que otro documento lo comparta.
 
     Parámetros:
     - document (RiderDocument): El documento de jinete que se desea eliminar.
@@ -1006,37 +1066,12 @@ def delete_document(document):
     - delete_document(document)
     """
 
-    if document.format == "file":
-
-        client = current_app.storage.client
-        bucket_name = "grupo13"
-        client.remove_object(bucket_name, document.source)
+    removable = release_files([document.source]) if document.format == "file" else []
 
     db.session.delete(document)
     db.session.commit()
 
-
-def drop_documents_from_remote(user_id: int) -> None:
-    """
-    Elimina todos los documentos relacionados con un jinete (usuario) desde el
-    almacenamiento remoto.
-
-    Esta función obtiene todos los documentos asociados a un jinete específico y los elimina tanto
-    de la base de datos como del almacenamiento remoto.
-
-    Parámetros:
-    - user_id (int): El ID del jinete cuyo documentos se eliminarán.
-
-    Ejemplo de uso:
-    - drop_documents_from_remote(user_id)
-    """
-
-    documents: List[RiderDocument] = RiderDocument.query.filter_by(
-        rider_id=user_id, format="file"
-    ).all()
-
-    for document in documents:
-        delete_document(document)
+    current_app.storage.remove_in_background(removable)
 
 
 def add_link(title, link, document_type, rider_id):
@@ -1103,14 +1138,15 @@ def download_document(document_id):
     """
     Descarga el documento con el ID especificado.
 
-    Esta función recupera el documento de la base de datos y lo descarga desde el
-    almacenamiento remoto.
+    Esta función recupera el documento de la base de datos y los metadatos de su
+    archivo, registrados al subirlo. El contenido no se lee: se envía en streaming
+    con `storage.send_object`.
 
     Parámetros:
     - document_id (int): El ID del documento a descargar.
 
     Retorna:
-    - response: Objeto de respuesta de Flask con el contenido del documento.
+    - stat: Metadatos del archivo en el almacenamiento (tamaño, etag, etc.).
     - document: El documento descargado desde la base de datos.
 
     Lanza:
@@ -1120,11 +1156,9 @@ def download_document(document_id):
     if not document:
         raise ValueError("Documento no encontrado")
 
-    client = current_app.storage.client
-    bucket_name = "grupo13"
-    response = client.get_object(bucket_name, document.source)
+    stat = object_info(document)
 
-    return response, document
+    return stat, document
 
 
 def get_riders():
@@ -1141,3 +1175,47 @@ def get_riders():
     - get_riders()
     """
     return sa.select(Rider).order_by(Rider.id.asc())
+
+
+def paginate_riders_by_keyset(
+    query,
+    order: str,
+    per_page: int,
+    cursor: Optional[str] = None,
+    with_count: bool = False,
+) -> KeysetPagination:
+    """
+    Pagina el listado de jinetes por clave (keyset) según el orden elegido.
+
+    El orden por apellido usa (apellido, nombre, id), el orden por nombre usa
+    (nombre, apellido, id) y el orden por defecto usa el id.
+
+    Parámetros:
+    - query: Consulta de jinetes con los filtros ya aplicados.
+    - order (str): Uno de los órdenes válidos del listado ("nombreA-Z", "nombreZ-A",
+      "apellidoA-Z", "apellidoZ-A" o "").
+    - per_page (int): Cantidad de jinetes por página.
+    - cursor (str, opcional): Cursor recibido de una página anterior.
+    - with_count (bool): Si es `True`, calcula también la cantidad total de jinetes.
+
+    Retorna:
+    - KeysetPagination: La página de jinetes con sus cursores.
+
+    Lanza:
+    - InvalidCursorException: Si el cursor no es válido.
+    """
+    if order in ("nombreA-Z", "nombreZ-A"):
+        keys = RIDERS_KEYS_BY_NAME
+    elif order in ("apellidoA-Z", "apellidoZ-A"):
+        keys = RIDERS_KEYS_BY_LAST_NAME
+    else:
+        keys = RIDERS_KEYS_BY_ID
+
+    return keyset_paginate(
+        query,
+        keys=keys,
+        per_page=per_page,
+        cursor=cursor,
+        descending=order in ("nombreZ-A", "apellidoZ-A"),
+        with_count=with_count,
+    )
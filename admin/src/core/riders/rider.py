@@ -77,17 +77,27 @@ class Rider(db.Model):
         RiderDocument, back_populates="rider", cascade="all, delete-orphan"
     )
 
+    @property
+    def primary_tutor_link(self) -> Optional[RiderTutor]:
+        """Obtiene la relación (con el parentesco) con el tutor primario."""
+        return next((link for link in self.tutors if link.is_primary), None)
+
+    @property
+    def secondary_tutor_link(self) -> Optional[RiderTutor]:
+        """Obtiene la relación (con el parentesco) con el tutor secundario."""
+        return next((link for link in self.tutors if not link.is_primary), None)
+
     @property
     def primary_tutor(self) -> Optional[Tutor]:
         """Obtiene el tutor primario."""
-        return next((tutor.tutor for tutor in self.tutors if tutor.is_primary), None)
+        link = self.primary_tutor_link
+        return link.tutor if link else None
 
     @property
     def secondary_tutor(self) -> Optional[Tutor]:
         """Obtiene el tutor secundario."""
-        return next(
-            (tutor.tutor for tutor in self.tutors if not tutor.is_primary), None
-        )
+        link = self.secondary_tutor_link
+        return link.tutor if link else None
 
     def __repr__(self):
         return f"Amazona/Jinete => Nombre: {self.name} ; Apellido: {self.last_name}"
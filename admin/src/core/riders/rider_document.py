@@ -36,6 +36,12 @@ class RiderDocument(db.Model):
         db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
     )
 
+    # Metadatos del archivo, registrados al subirlo (vacíos en los enlaces)
+    size = db.Column(db.BigInteger, nullable=True)
+    content_type = db.Column(db.String(255), nullable=True)
+    checksum = db.Column(db.String(64), nullable=True)
+    uploaded_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
     rider_id = db.Column(
         db.Integer, db.ForeignKey("riders.id", ondelete="CASCADE"), nullable=False
     )
@@ -0,0 +1,207 @@
+"""
+Módulo de búsqueda de jinetes.
+
+Las búsquedas por nombre y apellido se resuelven contra la expresión
+`lower(f_unaccent(columna))`, que en PostgreSQL está indexada con índices GIN de
+trigramas (`pg_trgm`). De esta forma un filtro `LIKE '%texto%'` usa el índice en lugar
+de recorrer toda la tabla, y las búsquedas no distinguen acentos ("Pérez" == "Perez").
+Los resultados pueden ordenarse por relevancia usando `similarity`.
+
+En SQLite (usado en los tests) no existen esas extensiones, por lo que `f_unaccent` y
+`similarity` se registran como funciones Python con el mismo comportamiento.
+"""
+
+import sqlite3
+import unicodedata
+
+import sqlalchemy as sa
+from sqlalchemy import DDL, event
+
+from src.core.database import db
+from src.core.riders.rider import Rider
+
+
+SEARCH_FUNCTIONS_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent no es IMMUTABLE, por lo que no puede usarse directamente en un índice
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+    $$ SELECT public.unaccent('public.unaccent', $1) $$
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+)
+
+SEARCH_INDEXES_DDL = (
+    """
+    CREATE INDEX IF NOT EXISTS ix_riders_name_trgm
+    ON riders USING gin (lower(f_unaccent(name)) gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_riders_last_name_trgm
+    ON riders USING gin (lower(f_unaccent(last_name)) gin_trgm_ops)
+    """,
+)
+
+for statement in SEARCH_FUNCTIONS_DDL:
+    event.listen(
+        Rider.__table__,
+        "before_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in SEARCH_INDEXES_DDL:
+    event.listen(
+        Rider.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+
+
+def init_app(app):
+    """
+    Registra las funciones de búsqueda en las conexiones SQLite de la aplicación.
+
+    Args:
+        app: La instancia de la aplicación Flask.
+
+    Returns:
+        La instancia de la aplicación Flask.
+    """
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", register_sqlite_functions)
+
+    return app
+
+
+def create_search_indexes():
+    """
+    Crea las extensiones, la función `f_unaccent` y los índices de trigramas sobre
+    una base PostgreSQL ya existente. Es idempotente.
+    """
+    if db.engine.dialect.name != "postgresql":
+        print("Los índices de búsqueda sólo aplican a PostgreSQL")
+        return
+
+    with db.engine.begin() as connection:
+        for statement in SEARCH_FUNCTIONS_DDL + SEARCH_INDEXES_DDL:
+            connection.execute(sa.text(statement))
+    print("🆗 Índices de búsqueda creados")
+
+
+def normalize(text: str) -> str:
+    """
+    Normaliza un texto para la búsqueda: minúsculas y sin acentos.
+
+    Args:
+        text (str): El texto a normalizar.
+
+    Returns:
+        str: El texto normalizado.
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _trigrams(text: str) -> set:
+    """Obtiene los trigramas de un texto del mismo modo que `pg_trgm`."""
+    trigrams = set()
+    for word in "".join(c if c.isalnum() else " " for c in text.lower()).split():
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """
+    Calcula la similitud entre dos textos como la proporción de trigramas
+    compartidos, equivalente a `similarity` de `pg_trgm`.
+
+    Args:
+        a (str): Primer texto.
+        b (str): Segundo texto.
+
+    Returns:
+        float: Un valor entre 0 y 1.
+    """
+    trigrams_a, trigrams_b = _trigrams(a or ""), _trigrams(b or "")
+    union = trigrams_a | trigrams_b
+    if not union:
+        return 0.0
+    return len(trigrams_a & trigrams_b) / len(union)
+
+
+def register_sqlite_functions(dbapi_connection, connection_record=None):
+    """Registra `f_unaccent` y `similarity` en una conexión SQLite."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    dbapi_connection.create_function(
+        "f_unaccent",
+        1,
+        lambda text: None if text is None else normalize(text),
+        deterministic=True,
+    )
+    dbapi_connection.create_function(
+        "similarity", 2, trigram_similarity, deterministic=True
+    )
+
+
+def searchable(column):
+    """Devuelve la expresión indexada (sin acentos y en minúsculas) de una columna."""
+    return sa.func.lower(sa.func.f_unaccent(column))
+
+
+def filter_riders(query, name: str = "", last_name: str = "", dni: str = ""):
+    """
+    Aplica los filtros de búsqueda del listado de jinetes.
+
+    Args:
+        query: Consulta de jinetes.
+        name (str): Texto a buscar en el nombre.
+        last_name (str): Texto a buscar en el apellido.
+        dni (str): DNI exacto del jinete.
+
+    Returns:
+        La consulta con los filtros aplicados.
+    """
+    if dni:
+        query = query.filter(Rider.dni == dni)
+    if name:
+        query = query.filter(
+            searchable(Rider.name).contains(normalize(name), autoescape=True)
+        )
+    if last_name:
+        query = query.filter(
+            searchable(Rider.last_name).contains(normalize(last_name), autoescape=True)
+        )
+
+    return query
+
+
+def order_by_relevance(query, name: str = "", last_name: str = ""):
+    """
+    Ordena la consulta por similitud con los textos buscados, de mayor a menor.
+    Sin textos de búsqueda, se ordena por id.
+
+    Args:
+        query: Consulta de jinetes.
+        name (str): Texto buscado en el nombre.
+        last_name (str): Texto buscado en el apellido.
+
+    Returns:
+        La consulta ordenada por relevancia.
+    """
+    scores = []
+    if name:
+        scores.append(sa.func.similarity(searchable(Rider.name), normalize(name)))
+    if last_name:
+        scores.append(
+            sa.func.similarity(searchable(Rider.last_name), normalize(last_name))
+        )
+
+    query = query.order_by(None)
+    if not scores:
+        return query.order_by(Rider.id.asc())
+
+    relevance = scores[0] if len(scores) == 1 else scores[0] + scores[1]
+    return query.order_by(relevance.desc(), Rider.id.asc())
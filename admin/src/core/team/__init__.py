@@ -1,6 +1,5 @@
 from typing import List
 from datetime import datetime
-import ulid
 
 from flask import current_app
 
@@ -14,6 +13,8 @@ from src.web.validators.general_validations import (
 )
 from src.core import functions
 from src.core.database import db
+from src.core.files import file_columns, object_info, release_files, store_file
+from src.core.files.derivatives import schedule_processing
 from src.core.team.employee_document import EmployeeDocument
 from src.core.team.employee import Employee
 
@@ -309,36 +310,26 @@ def create_document(title, format, source, employee_id):
     Args:
         title (str): Título del documento.
         format (str): Formato del documento (por ejemplo, "file" o "link").
-        source (minio.storage.StorageClass): Fuente del documento (archivo o enlace).
+        source (FileStorage o str): Fuente del documento (archivo o enlace).
         employee_id (int): ID del empleado.
 
     Retorna:
         EmployeeDocument: El documento creado.
     """
     if format == "file":
-        client = current_app.storage.client
-        bucket_name = "grupo13"
-        source.seek(0, 2)
-        length = source.tell()
-        source.seek(0)
-        file_id = str(ulid.ulid())
-        file_name = f"{file_id}-{source.filename}"
-        client.put_object(
-            bucket_name, file_name, source, length, content_type=source.content_type
-        )
-
-        source = file_name
+        stored = store_file(source)
 
         new_document = EmployeeDocument(
             title=title,
             type="Archivo",
             format=format,
-            source=source,
             employee_id=employee_id,
+            **file_columns(stored),
         )
 
         db.session.add(new_document)
         db.session.commit()
+        schedule_processing(new_document.source, new_document.content_type)
 
         return new_document
 
@@ -410,6 +401,24 @@ def get_documents_by_employee_id(page, employee_id):
     return documents, pagination
 
 
+def get_all_documents(employee_id):
+    """
+    Devuelve todos los documentos del empleado con el ID especificado, del más
+    antiguo al más reciente.
+
+    Args:
+        employee_id (int): ID del empleado.
+
+    Retorna:
+        list[EmployeeDocument]: Los documentos del empleado.
+    """
+    return (
+        EmployeeDocument.query.filter_by(employee_id=employee_id)
+        .order_by(EmployeeDocument.created_at.asc())
+        .all()
+    )
+
+
 def download_document(document_id):
     """
     Descarga el documento con el ID especificado.
@@ -418,17 +427,15 @@ def download_document(document_id):
         document_id (int): ID del documento.
 
     Retorna:
-        Response: Objeto de respuesta Flask.
+        Object: Metadatos del archivo en el almacenamiento (tamaño, etag, etc.).
         EmployeeDocument: Documento descargado.
     """
     document = EmployeeDocument.query.filter_by(id=document_id).first()
     if not document:
         raise ValueError("Documento no encontrado")
-    client = current_app.storage.client
-    bucket_name = "grupo13"
-    response = client.get_object(bucket_name, document.source)
+    stat = object_info(document)
 
-    return response, document
+    return stat, document
 
 
 def check_order_params(page, order, order_direction, search_by, search_value):
@@ -646,16 +653,20 @@ def check_create_params(
 
 def delete_document(document_id):
     """
-    Borra el documento cuya ID es igual a document_id
+    Borra el documento cuya ID es igual a document_id. Si es un archivo, también lo
+    elimina del almacenamiento, salvo que otro documento lo comparta.
 
     Args:
         document_id (EmployeeDocument): ID del documento a borrar
     """
 
     document = get_document_by_id(document_id)
+    removable = release_files([document.source]) if document.format == "file" else []
     db.session.delete(document)
     db.session.commit()
 
+    current_app.storage.remove_in_background(removable)
+
 
 def get_employees():
     """
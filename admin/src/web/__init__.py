@@ -9,9 +9,19 @@ from src.core.bcrypt import bcrypt
 from src.web.config import config
 
 from src.core import database
+from src.core.riders import search
 from src.web import routes
 from src.web import commands
 from src.web.storage import storage
+from src.web.storage.uploads import UploadRequest
+from src.web.chart_cache import chart_cache
+from src.web.chart_renderer import chart_renderer
+from src.web.upload_processor import upload_processor
+from src.web.sql_profiler import sql_profiler
+from src.web.slow_query_log import slow_query_log
+from src.web.metrics import metrics
+from src.web.request_profiler import request_profiler
+from src.core.files.derivatives import may_have_preview
 
 
 session = Session()
@@ -38,9 +48,21 @@ def create_app(env="development", static_folder=None):
     Configuración detallada:
         - Carga la configuración específica del entorno desde el módulo `config`.
         - Inicializa la base de datos usando la función `init_app` de `database`.
+        - Registra las funciones de búsqueda de jinetes con `search.init_app`.
+        - Registra el perfilador de consultas SQL por request usando `sql_profiler`
+          (sólo actúa si `SQL_PROFILER_ENABLED` está activo).
+        - Registra el registro de consultas SQL lentas usando `slow_query_log`.
         - Configura las sesiones mediante `flask_session.Session`.
         - Inicializa el encriptador mediante la biblioteca `bcrypt`.
-        - Registra un servicio de almacenamiento de objetos (object storage) usando `storage`.
+        - Registra un servicio de almacenamiento de objetos (object storage) usando `storage`,
+          y `UploadRequest` para cargar los documentos en streaming.
+        - Registra el pool de hilos que procesa los archivos subidos usando `upload_processor`.
+        - Registra la caché de gráficos renderizados usando `chart_cache`.
+        - Registra el pool de procesos que renderiza los gráficos usando `chart_renderer`.
+        - Registra las métricas de los requests, la base de datos y el almacenamiento
+          usando `metrics`, expuestas en `/metrics`.
+        - Registra el perfilado de requests (cProfile) y de memoria (tracemalloc) usando
+          `request_profiler`, consultable en `/perfilado`.
         - Configura los manejadores de errores personalizados utilizando `routes.register_error_handlers`.
         - Registra los blueprints para definir las rutas de la aplicación con `routes.register_blueprints`.
         - Activa CORS para permitir solicitudes entre orígenes distintos.
@@ -48,6 +70,7 @@ def create_app(env="development", static_folder=None):
             - `is_sys_admin`: Verifica si un usuario tiene permisos de administrador.
             - `check_permission`: Verifica permisos específicos de un usuario.
             - `get_max_number`: Devuelve el valor máximo de un conjunto de datos.
+            - `may_have_preview`: Indica si un archivo puede tener miniatura.
         - Registra comandos personalizados para el CLI de Flask con `commands.register_special_commands`.
 
     Este diseño asegura que todos los componentes de la aplicación estén listos para su ejecución
@@ -64,13 +87,26 @@ def create_app(env="development", static_folder=None):
     app.config.from_object(config[env])
     # Inicializo la base de datos
     database.init_app(app)
+    search.init_app(app)
+    sql_profiler.init_app(app)
+    slow_query_log.init_app(app)
 
     # Inicializo la sesión y el encriptador
     session.init_app(app)
     bcrypt.init_app(app)
 
-    # Registro object storage
+    # Registro object storage y la carga de archivos en streaming
     storage.init_app(app)
+    app.request_class = UploadRequest
+    upload_processor.init_app(app)
+
+    # Registro la caché de gráficos
+    chart_cache.init_app(app)
+    chart_renderer.init_app(app)
+
+    # Registro las métricas (después de la base de datos y el almacenamiento)
+    metrics.init_app(app)
+    request_profiler.init_app(app)
 
     # Registro de manejadores de errores
     routes.register_error_handlers(app)
@@ -86,6 +122,7 @@ def create_app(env="development", static_folder=None):
     app.jinja_env.globals.update(is_admin=users.is_admin)
     app.jinja_env.globals.update(check_permission=users.check_permission)
     app.jinja_env.globals.update(get_max_number=get_max_number)
+    app.jinja_env.globals.update(may_have_preview=may_have_preview)
 
     # Registro los comandos personalizados de flask
     commands.register_special_commands(app)
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Callable, Optional, Tuple
+
+
+class ChartCache:
+    """Caché de gráficos renderizados, indexada por la huella de sus datos.
+
+    La clave de cada gráfico es un hash del tipo de gráfico, de los datos de entrada
+    y de la fecha (los gráficos muestran la fecha de generación). Mientras los datos no
+    cambien, el PNG se devuelve sin volver a ejecutar matplotlib.
+
+    Tiene un primer nivel en memoria con política LRU y, opcionalmente, un segundo
+    nivel en disco (`CHART_CACHE_DIR`) compartido entre los procesos de la aplicación.
+    De cada gráfico se guarda además el momento en que se generó, que se informa a los
+    navegadores como `Last-Modified`.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de ChartCache.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = 32
+        self._directory: Optional[str] = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura la caché con la configuración de la aplicación Flask proporcionada.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        self._max_entries = app.config.get("CHART_CACHE_SIZE", 32)
+        self._directory = app.config.get("CHART_CACHE_DIR")
+        if self._directory:
+            os.makedirs(self._directory, exist_ok=True)
+
+        app.chart_cache = self
+        return app
+
+    @staticmethod
+    def fingerprint(chart: str, data) -> str:
+        """Calcula la clave de un gráfico a partir de su tipo, sus datos y la fecha.
+
+        Args:
+            chart: Nombre del tipo de gráfico.
+            data: Datos de entrada del gráfico (serializables a JSON).
+
+        Returns:
+            La huella hexadecimal del gráfico.
+        """
+        payload = json.dumps(
+            {"chart": chart, "data": data, "date": date.today().isoformat()},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Obtiene un gráfico de la caché, primero de memoria y luego de disco.
+
+        Args:
+            key: La huella del gráfico.
+
+        Returns:
+            El contenido del gráfico o None si no está en la caché.
+        """
+        entry = self._get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def last_modified(self, key: str) -> Optional[datetime]:
+        """Obtiene el momento en que se generó un gráfico cacheado.
+
+        Args:
+            key: La huella del gráfico.
+
+        Returns:
+            La fecha y hora (UTC) de generación o None si no está en la caché.
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        return datetime.fromtimestamp(int(entry[1]), tz=timezone.utc)
+
+    def set(self, key: str, content: bytes):
+        """Guarda un gráfico en la caché.
+
+        Args:
+            key: La huella del gráfico.
+            content: El contenido del gráfico.
+        """
+        self._remember(key, content, time.time())
+        self._write_to_disk(key, content)
+
+    def get_or_render(self, chart: str, data, render: Callable[..., bytes]) -> bytes:
+        """Devuelve el gráfico cacheado o lo renderiza y lo guarda.
+
+        Args:
+            chart: Nombre del tipo de gráfico.
+            data: Datos de entrada del gráfico.
+            render: Función que recibe `data` y devuelve el gráfico renderizado.
+
+        Returns:
+            El contenido del gráfico.
+        """
+        key = self.fingerprint(chart, data)
+        content = self.get(key)
+        if content is None:
+            content = render(data)
+            self.set(key, content)
+        return content
+
+    def clear(self):
+        """Vacía el nivel en memoria de la caché."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get_entry(self, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._read_from_disk(key)
+        if entry is not None:
+            self._remember(key, *entry)
+        return entry
+
+    def _remember(self, key: str, content: bytes, stored_at: float):
+        with self._lock:
+            self._entries[key] = (content, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.chart")
+
+    def _read_from_disk(self, key: str) -> Optional[Tuple[bytes, float]]:
+        if not self._directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as file:
+                return file.read(), os.fstat(file.fileno()).st_mtime
+        except OSError:
+            return None
+
+    def _write_to_disk(self, key: str, content: bytes):
+        if not self._directory:
+            return
+        # Escritura atómica: otro proceso nunca lee un archivo a medio escribir
+        descriptor, temporary = tempfile.mkstemp(dir=self._directory)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(content)
+            os.replace(temporary, self._path(key))
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+
+chart_cache = ChartCache()
@@ -0,0 +1,172 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from src.core.reports import charts
+from src.web.handlers.exceptions import ChartRenderException
+
+
+class ChartRenderer:
+    """Servicio de renderizado de gráficos en un pool de procesos.
+
+    matplotlib es costoso en CPU y no es seguro entre hilos, por lo que los gráficos se
+    generan en un `ProcessPoolExecutor` acotado (`CHART_RENDER_WORKERS` procesos). Los
+    procesos se crean con el método "spawn" al registrar el servicio, se precalientan
+    en segundo plano (importan matplotlib y cargan las fuentes) y se reutilizan entre
+    requests. El pool pertenece al proceso que lo creó: si la aplicación se carga
+    antes de crear los workers (por ejemplo, `gunicorn --preload`), cada worker crea
+    el suyo al primer uso, salvo que se llame a `warm_up` desde el hook `post_fork`.
+    El pool se detiene al terminar el proceso.
+
+    Si un gráfico excede `CHART_RENDER_TIMEOUT`, el pool se descarta y sus procesos
+    se terminan, para que los siguientes gráficos usen procesos nuevos (los demás
+    gráficos que estuviera generando ese pool fallan con `ChartRenderException`).
+
+    Con `CHART_RENDER_WORKERS = 0` los gráficos se renderizan en el mismo proceso, lo
+    cual es útil en los tests.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de ChartRenderer.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._timeout = 10
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura el servicio con la configuración de la aplicación Flask proporcionada.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        self._workers = app.config.get("CHART_RENDER_WORKERS", 0)
+        self._timeout = app.config.get("CHART_RENDER_TIMEOUT", 10)
+
+        app.chart_renderer = self
+        # Los procesos del pool pueden volver a importar la aplicación al iniciarse
+        # (con "spawn", el módulo principal), y no deben crear su propio pool
+        if self._workers and multiprocessing.current_process().name == "MainProcess":
+            self.warm_up(wait=False)
+            atexit.register(self.shutdown)
+        return app
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Devuelve el pool de procesos, creándolo la primera vez que se usa."""
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                # Un pool heredado de otro proceso (después de un fork) no funciona
+                self._pid = os.getpid()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=charts.warm_up,
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor, terminate: bool = False):
+        """Descarta un pool roto o bloqueado para que el próximo render cree uno
+        nuevo.
+
+        Args:
+            pool: El pool que se descarta.
+            terminate: Si se terminan sus procesos; `shutdown` no detiene a un proceso
+                que está ejecutando un gráfico.
+        """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        # ProcessPoolExecutor no expone sus procesos
+        processes = list((pool._processes or {}).values()) if terminate else []
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _submit(self, function, *args):
+        """Envía una tarea al pool. Si el pool se descartó mientras tanto (en otro
+        hilo) o está roto, se reintenta una vez con uno nuevo.
+
+        Raises:
+            ChartRenderException: Si tampoco se pudo enviar al pool nuevo.
+
+        Returns:
+            El pool y el `Future` de la tarea.
+        """
+        for _ in range(2):
+            pool = self._get_pool()
+            try:
+                return pool, pool.submit(function, *args)
+            except RuntimeError:
+                # "cannot schedule new futures after shutdown", o BrokenProcessPool
+                self._discard_pool(pool)
+        raise ChartRenderException()
+
+    def render(self, chart: str, data, image_format: str = "png") -> bytes:
+        """Renderiza un gráfico.
+
+        Args:
+            chart: Nombre del gráfico (una clave de `charts.CHARTS`).
+            data: Datos de entrada del gráfico.
+            image_format: Formato de la imagen ("png" o "svg").
+
+        Raises:
+            ChartRenderException: Si el renderizado excede el tiempo límite o el
+                proceso que lo ejecutaba terminó de forma inesperada.
+
+        Returns:
+            El gráfico renderizado.
+        """
+        if not self._workers:
+            return charts.render_chart(chart, data, image_format)
+
+        pool, future = self._submit(charts.render_chart, chart, data, image_format)
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Ya se está ejecutando y ocupa un proceso del pool
+                self._discard_pool(pool, terminate=True)
+            raise ChartRenderException("El gráfico tardó demasiado en generarse")
+        except (BrokenProcessPool, CancelledError):
+            # También se cancelan los gráficos pendientes de un pool descartado
+            self._discard_pool(pool)
+            raise ChartRenderException()
+
+    def warm_up(self, wait: bool = True):
+        """Crea el pool y precalienta todos sus procesos.
+
+        Args:
+            wait: Si se espera a que terminen de iniciarse.
+        """
+        if not self._workers:
+            return
+        # Con todos los procesos ocupados, el pool los crea a todos
+        futures = [self._submit(int)[1] for _ in range(self._workers)]
+        if wait:
+            for future in futures:
+                future.result(timeout=self._timeout)
+
+    def shutdown(self):
+        """Detiene el pool de procesos, si existe."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pid == os.getpid():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+chart_renderer = ChartRenderer()
@@ -1,6 +1,13 @@
+from datetime import timedelta
+
+import click
+
 from src.core import database
+from src.core import bulk_seeds
 from src.core import seeds
 from src.core import users
+from src.core.files import backfill, orphans
+from src.core.riders import search
 
 
 def register_special_commands(app):
@@ -13,9 +20,59 @@ def register_special_commands(app):
         database.reset()
 
     @app.cli.command(name="seeds-db")
-    def seeds_db():
+    @click.option(
+        "--scale",
+        type=click.IntRange(min=0),
+        default=0,
+        help="Cantidad de jinetes a generar en volumen, con sus datos asociados.",
+    )
+    @click.option(
+        "--seed",
+        default=0,
+        show_default=True,
+        help="Semilla del generador de datos en volumen.",
+    )
+    @click.option(
+        "--chunk-size",
+        type=click.IntRange(min=1),
+        default=bulk_seeds.CHUNK_SIZE,
+        show_default=True,
+        help="Cantidad de filas por sentencia INSERT.",
+    )
+    def seeds_db(scale, seed, chunk_size):
         seeds.run()
+        if scale:
+            bulk_seeds.run(scale, seed=seed, chunk_size=chunk_size)
 
     @app.cli.command(name="create-roles")
     def create_roles():
         users.create_roles()
+
+    @app.cli.command(name="create-search-indexes")
+    def create_search_indexes():
+        search.create_search_indexes()
+
+    @app.cli.command(name="backfill-documents")
+    @click.option(
+        "--workers",
+        default=8,
+        show_default=True,
+        help="Cantidad de archivos que se leen en paralelo.",
+    )
+    def backfill_documents(workers):
+        backfill.backfill_documents(workers=workers)
+
+    @app.cli.command(name="storage-gc")
+    @click.option(
+        "--dry-run",
+        is_flag=True,
+        help="Sólo lista los objetos huérfanos, sin eliminarlos.",
+    )
+    @click.option(
+        "--min-age",
+        default=60,
+        show_default=True,
+        help="Antigüedad mínima (en minutos) de un objeto para eliminarlo.",
+    )
+    def storage_gc(dry_run, min_age):
+        orphans.collect_orphans(dry_run=dry_run, min_age=timedelta(minutes=min_age))
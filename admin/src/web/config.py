@@ -11,6 +11,100 @@ class Config(object):
     MAX_NUMBER_ON_DATABASE = 2147483647
     MAX_ELEMENTS_ON_PAGE = 9
 
+    # Modo de paginación del listado de jinetes: "offset" (por número de página)
+    # o "keyset" (por cursor, sin OFFSET). En modo keyset el conteo total es opcional.
+    RIDERS_PAGINATION_MODE = environ.get("RIDERS_PAGINATION_MODE", "offset")
+    RIDERS_KEYSET_COUNT = environ.get("RIDERS_KEYSET_COUNT", "false") == "true"
+
+    # Caché de gráficos: cantidad de gráficos en memoria y directorio opcional
+    # para compartirlos entre procesos
+    CHART_CACHE_SIZE = 32
+    CHART_CACHE_DIR = environ.get("CHART_CACHE_DIR")
+
+    # Renderizado de gráficos: cantidad de procesos del pool (0 renderiza en el
+    # mismo proceso) y tiempo límite en segundos de cada gráfico
+    CHART_RENDER_WORKERS = int(environ.get("CHART_RENDER_WORKERS", 2))
+    CHART_RENDER_TIMEOUT = 10
+
+    # Perfilado de las consultas SQL de cada request: cantidad, tiempo y posibles N+1
+    # (consultas repetidas al menos el umbral de veces), en encabezados y en el log
+    SQL_PROFILER_ENABLED = environ.get("SQL_PROFILER_ENABLED", "false") == "true"
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD = int(
+        environ.get("SQL_PROFILER_N_PLUS_ONE_THRESHOLD", 5)
+    )
+
+    # Registro de consultas SQL lentas: umbral en ms (0 lo desactiva), archivo JSONL
+    # (por defecto, instance/slow_queries.jsonl) y su tamaño máximo en bytes antes de
+    # rotarlo, ventana en segundos de los histogramas de latencia por forma de
+    # sentencia, y fracción de las consultas lentas cuyo plan se captura con EXPLAIN
+    # (ANALYZE, BUFFERS) (sólo PostgreSQL), con su tiempo límite en ms
+    SLOW_QUERY_THRESHOLD_MS = int(environ.get("SLOW_QUERY_THRESHOLD_MS", 0))
+    SLOW_QUERY_LOG_PATH = environ.get("SLOW_QUERY_LOG_PATH")
+    SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+    SLOW_QUERY_HISTOGRAM_WINDOW = 3600
+    SLOW_QUERY_MAX_FINGERPRINTS = 500
+    SLOW_QUERY_EXPLAIN_SAMPLE = float(environ.get("SLOW_QUERY_EXPLAIN_SAMPLE", 0))
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = 5000
+
+    # Métricas en formato Prometheus (/metrics, sólo administradores del sistema):
+    # directorio opcional donde cada proceso guarda sus valores para sumarlos entre
+    # todos y cada cuántos segundos se guardan
+    METRICS_ENABLED = environ.get("METRICS_ENABLED", "true") == "true"
+    METRICS_DIR = environ.get("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL = 5
+
+    # Perfilado de requests con cProfile: fracción de los requests que se perfilan
+    # (además de los pedidos con ?_profile=1 por un administrador del sistema),
+    # directorio de los perfiles (por defecto, instance/profiles) y cantidad máxima
+    # que se conserva. Cuadros de pila que registra tracemalloc por cada reserva
+    PROFILER_SAMPLE_RATE = float(environ.get("PROFILER_SAMPLE_RATE", 0))
+    PROFILER_DIR = environ.get("PROFILER_DIR")
+    PROFILER_MAX_FILES = 50
+    PROFILER_TRACEMALLOC_FRAMES = 1
+
+    # Almacenamiento de archivos: backend ("minio", "filesystem" o "memory"), bucket
+    # y directorio del backend "filesystem" (por defecto, instance/storage)
+    STORAGE_BACKEND = environ.get("STORAGE_BACKEND", "minio")
+    STORAGE_BUCKET = environ.get("STORAGE_BUCKET", "grupo13")
+    STORAGE_PATH = environ.get("STORAGE_PATH")
+
+    # Carga de documentos: tamaño máximo de un archivo y tamaño de las partes en que
+    # se envía al almacenamiento (MinIO exige al menos 5 MB por parte)
+    MAX_UPLOAD_SIZE = 15 * 1024 * 1024
+    STORAGE_PART_SIZE = 5 * 1024 * 1024
+
+    # Eliminación de archivos en un hilo de fondo (por ejemplo, al eliminar un jinete)
+    STORAGE_BACKGROUND_DELETES = True
+
+    # Descargas de documentos mediante URLs prefirmadas de MinIO: en lugar de enviar
+    # el archivo desde Flask se redirige al almacenamiento (vigencia en segundos)
+    STORAGE_PRESIGNED_DOWNLOADS = (
+        environ.get("STORAGE_PRESIGNED_DOWNLOADS", "false") == "true"
+    )
+    STORAGE_PRESIGNED_EXPIRES = int(environ.get("STORAGE_PRESIGNED_EXPIRES", 60))
+
+    # Descarga de todos los documentos en un ZIP: archivos que se leen en paralelo
+    STORAGE_ARCHIVE_WORKERS = int(environ.get("STORAGE_ARCHIVE_WORKERS", 4))
+
+    # Caché en disco de los archivos descargados de MinIO: tamaño máximo en bytes (0 la
+    # desactiva), directorio (por defecto, instance/storage-cache) y cada cuántos
+    # segundos se revalida un archivo contra el ETag del almacenamiento
+    STORAGE_CACHE_SIZE = int(environ.get("STORAGE_CACHE_SIZE", 512 * 1024 * 1024))
+    STORAGE_CACHE_PATH = environ.get("STORAGE_CACHE_PATH")
+    STORAGE_CACHE_REVALIDATE = int(environ.get("STORAGE_CACHE_REVALIDATE", 300))
+
+    # Procesamiento de los archivos subidos (miniaturas y JPEG recomprimidos):
+    # cantidad de hilos del pool (0 procesa durante la misma petición)
+    UPLOAD_PROCESSING_WORKERS = int(environ.get("UPLOAD_PROCESSING_WORKERS", 2))
+    UPLOAD_THUMBNAIL_SIZE = 320
+
+    # Versión recomprimida de los JPEG más grandes que el umbral (en bytes), reducida
+    # a una dimensión máxima en píxeles; el original se conserva
+    UPLOAD_RECOMPRESS_JPEG = environ.get("UPLOAD_RECOMPRESS_JPEG", "true") == "true"
+    UPLOAD_RECOMPRESS_THRESHOLD = 1024 * 1024
+    UPLOAD_RECOMPRESS_MAX_DIMENSION = 2560
+    UPLOAD_RECOMPRESS_QUALITY = 85
+
     ACCEPTED_EXTENSIONS = [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".jpeg", ".jpg"]
     ARGENTINIAN_PROVINCES = (
         "Buenos Aires",
@@ -111,6 +205,14 @@ class TestingConfig(Config):
     """Testing configuration."""
 
     TESTING = True
+    # Base de datos de las pruebas: por defecto, SQLite en memoria. Las pruebas
+    # eliminan y vuelven a crear todas las tablas de la base indicada
+    SQLALCHEMY_DATABASE_URI = environ.get("TEST_DATABASE_URL", "sqlite://")
+    CHART_RENDER_WORKERS = 0
+    STORAGE_BACKEND = "memory"
+    STORAGE_BACKGROUND_DELETES = False
+    UPLOAD_PROCESSING_WORKERS = 0
+    SLOW_QUERY_THRESHOLD_MS = 0
 
 
 config = {
@@ -127,7 +127,7 @@ def show_edit_disability_and_pension_data(user_id: int):
     Renderiza el template con los datos cargados (si los hay) de la instancia
     de Disability y Benefits correspondiente.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
 
     disability = rider.disability
     benefits = rider.benefits
@@ -170,7 +170,7 @@ def edit_disability_and_pension_data(user_id: int):
     """
     Edita con los datos cargados (si los hay) la instancia de Disability y Benefits correspondiente.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     disability = rider.disability
     benefits = rider.benefits
     params = request.form
@@ -1,16 +1,26 @@
-import io
 import os
 from typing import Dict, List
 
-from flask import Blueprint, Response, flash, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    abort,
+    flash,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from urllib3.exceptions import MaxRetryError
 from werkzeug.datastructures import FileStorage
 
 from src.core import ecuestre, functions, team, users
 from src.core.database import db
+from src.core.files.derivatives import derivative_of, web_version_of
 from src.core.ecuestre.horse import Horse
 from src.core.ecuestre.horse_document import HorseDocument
 from src.web.handlers.auth import login_required, permission_required
+from src.web.storage import storage
+from src.web.storage.uploads import streamed_upload
 from src.web.validators.document_horse_validators import check_upload_link
 
 
@@ -177,6 +187,7 @@ def show_upload_document(horse_id: int):
 @bp.post("/horse_files/upload_document/<int:horse_id>/upload")
 @login_required
 @permission_required("horse_update")
+@streamed_upload
 def upload_document(horse_id: int):
     """Sube un documento asociado a un caballo."""
     horse: Horse = ecuestre.find_horse_by_id(horse_id=horse_id)
@@ -306,23 +317,14 @@ def download_horse_files():
     if ecuestre.check_action_file_params(document_id, horse_id):
 
         try:
-            response, document = ecuestre.download_document(document_id)
-            archivo = io.BytesIO(response.read())
-            archivo.seek(0)
+            stat, document = ecuestre.download_document(document_id)
             extension: str = os.path.splitext(document.source)[1]  # Extrae la extensión
             if not extension.startswith("."):  # Asegurarse de que tenga un punto
                 extension = f".{extension}"
 
             filename = f"{document.title}{extension}"
 
-            return Response(
-                archivo,
-                mimetype="application/octet-stream",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}",
-                    "Content-type": "application/octet-stream",
-                },
-            )
+            return storage.send_object(stat, filename)
         except ValueError as e:
             flash(f"Error al descargar el archivo {e}", "error")
 
@@ -340,6 +342,45 @@ def download_horse_files():
         return redirect(url_for("equestrian_details.horse_files", horse_id=horse_id))
 
 
+@bp.get("<int:horse_id>/preview/<int:document_id>")
+@login_required
+@permission_required("horse_show")
+def preview_horse_file(horse_id: int, document_id: int):
+    """Envía la miniatura de un documento de un caballo, o con `?version=web` la
+    imagen para verla en el navegador (la versión recomprimida, si existe)."""
+    document = ecuestre.get_document_by_id(document_id)
+    if document is None or document.horse_id != horse_id:
+        abort(404)
+
+    if request.args.get("version") == "web":
+        object_name = web_version_of(document)
+    else:
+        object_name = derivative_of(document, "thumbnail")
+    if object_name is None:
+        abort(404)
+
+    return storage.send_image(object_name)
+
+
+@bp.get("<int:horse_id>/download_all")
+@login_required
+@permission_required("horse_show")
+def download_all_horse_files(horse_id: int):
+    """Descarga todos los documentos de un caballo en un archivo ZIP.
+
+    El ZIP se genera mientras se envía, leyendo los archivos del almacenamiento en
+    paralelo. Los enlaces se incluyen como un índice.
+    """
+    horse = ecuestre.find_horse_by_id(horse_id)
+    if not horse:
+        flash("No existe el caballo", "error")
+        return redirect(url_for("equestrian_dashboard.index"))
+
+    documents = ecuestre.get_all_documents(horse_id)
+
+    return storage.send_archive(documents, f"documentos_{horse.name}.zip")
+
+
 @bp.post("/modify_document")
 @login_required
 @permission_required("horse_update")
@@ -403,15 +444,7 @@ def delete_document():
         return redirect(
             url_for("equestrian_details.horse_files", horse_id=horse_id, page=page)
         )
-    if document.format == "file":
-        # si es un "file" lo borro de MinIO
-        try:
-            functions.delete_document(document.source)
-        except MaxRetryError:
-            flash("No se pudo hacer la conexión con la base de datos. Reintente", "error")
-            return redirect(
-                url_for("equestrian_details.horse_files", horse_id=horse_id, page=page)
-            )
+    # Si es un "file", el archivo se elimina del almacenamiento en segundo plano
     ecuestre.delete_document_by_id(document_id)
     if document.format == "file":
         flash("Documento eliminado exitosamente", "success")
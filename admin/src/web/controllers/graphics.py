@@ -1,197 +1,129 @@
-import base64
 import io
-from datetime import datetime
-from typing import Dict, List
-
-import matplotlib
-import matplotlib.pyplot as plt
-from flask import Blueprint, render_template, send_file
+from functools import partial
+from typing import Tuple
+
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    flash,
+    redirect,
+    render_template,
+    request,
+    send_file,
+    url_for,
+)
 
 from src.core.reports.graphics import (
     calculate_active_job_position_frequencies,
     calculate_diagnosis_frequencies,
     calculate_scholarship_proportion,
 )
+from src.web.chart_cache import chart_cache
+from src.web.chart_renderer import chart_renderer
 from src.web.handlers.auth import login_required, permission_required
+from src.web.handlers.exceptions import ChartRenderException
 
 
-matplotlib.use("Agg")  # Configura el backend no interactivo
-
 bp = Blueprint("graphics", __name__, url_prefix="/graficos")
 
+# Gráficos publicados: nombre en la URL -> (gráfico a renderizar, cálculo de sus datos)
+CHARTS = {
+    "discapacidades": ("disabilities", calculate_diagnosis_frequencies),
+    "becados": ("scholarships", calculate_scholarship_proportion),
+    "empleados_por_posicion_laboral": (
+        "job_positions",
+        calculate_active_job_position_frequencies,
+    ),
+}
+
+IMAGE_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
 
-def make_pie_chart_disabilities(frequencies: Dict[str, int]) -> str:
+
+@bp.errorhandler(ChartRenderException)
+def handle_chart_render_error(error: ChartRenderException):
+    """Informa que el gráfico no pudo generarse y vuelve al listado de reportes."""
+    flash(error.message, "error")
+    return redirect(url_for("reports.index"))
+
+
+def chart_fingerprint(name: str, image_format: str = "png") -> Tuple[str, str, object]:
     """
-    Genera un gráfico de pastel que muestra la distribución de discapacidades.
+    Calcula los datos de un gráfico y su huella, sin renderizarlo.
 
-    Parámetros:
-        frequencies (Dict[str, int]): Un diccionario con las frecuencias de cada discapacidad.
+    Args:
+        name (str): Nombre del gráfico en la URL (una clave de `CHARTS`).
+        image_format (str): Formato de la imagen ("png" o "svg").
 
-    Devuelve:
-        str: Una cadena base64 que representa el gráfico de pastel en formato PNG.
+    Returns:
+        Tuple: La huella del gráfico, el gráfico a renderizar y sus datos.
     """
-    timestamp = datetime.now().strftime("%d/%m/%Y")
-
-    if not frequencies:
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.text(
-            0.5, 0.5, "No hay datos disponibles", fontsize=16, ha="center", va="center"
-        )
-        ax.text(
-            0.5, 0.1, f"Generado: {timestamp}", fontsize=10, ha="center", va="center"
-        )
-        ax.axis("off")
-    else:
-        fig, ax = plt.subplots(figsize=(8, 4))
-        labels: List[str] = list(frequencies.keys())
-        sizes: List[int] = list(frequencies.values())
-        explode = [0.1 if i == max(sizes) else 0 for i in sizes]
-
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
-            autopct="%1.1f%%",
-            startangle=140,
-            textprops={"fontsize": 8},
-            explode=explode,
-            colors=plt.cm.Set2.colors,
-        )
-        ax.set_title(
-            f"Distribución de Diagnósticos (Generado: {timestamp})", fontsize=16
-        )
-
-        for text in autotexts:
-            text.set_color("white")
-            text.set_fontsize(10)
-
-        ax.legend(
-            wedges,
-            labels,
-            title="Diagnósticos",
-            loc="center left",
-            bbox_to_anchor=(1, 0, 0.5, 1),
-        )
-
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
-    graph_base64 = base64.b64encode(buf.read()).decode("utf-8")
-    buf.close()
-    plt.close(fig)
-
-    return graph_base64
-
-
-def make_scholarship_pie_chart(scholarship_counts: Dict[str, int]) -> str:
+    chart, calculate = CHARTS[name]
+    data = calculate()
+    return chart_cache.fingerprint(f"{chart}.{image_format}", data), chart, data
+
+
+def render_cached(chart: str, data, image_format: str = "png") -> bytes:
+    """Devuelve el gráfico desde la caché, o lo renderiza si sus datos cambiaron."""
+    return chart_cache.get_or_render(
+        f"{chart}.{image_format}",
+        data,
+        partial(chart_renderer.render, chart, image_format=image_format),
+    )
+
+
+def make_chart(name: str, image_format: str = "png") -> bytes:
     """
-    Genera un gráfico de pastel que muestra la proporción de becados vs. no becados.
+    Devuelve un gráfico, desde la caché si los datos no cambiaron.
 
-    Parámetros:
-        scholarship_counts (Dict[str, int]): Un diccionario con las cantidades de becados
-        y no becados.
+    Args:
+        name (str): Nombre del gráfico en la URL (una clave de `CHARTS`).
+        image_format (str): Formato de la imagen ("png" o "svg").
 
-    Devuelve:
-        str: Una cadena base64 que representa el gráfico de pastel en formato PNG.
+    Returns:
+        bytes: El contenido del gráfico.
     """
-    timestamp = datetime.now().strftime("%d/%m/%Y")
-
-    if scholarship_counts["becados"] == 0 and scholarship_counts["no becados"] == 0:
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.text(
-            0.5, 0.5, "No hay datos disponibles", fontsize=16, ha="center", va="center"
-        )
-        ax.text(
-            0.5, 0.1, f"Generado: {timestamp}", fontsize=10, ha="center", va="center"
-        )
-        ax.axis("off")
-    else:
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sizes = [scholarship_counts["becados"], scholarship_counts["no becados"]]
-        labels = ["Becados", "No Becados"]
-        explode = [0.1, 0]
-        colors = ["#6A0DAD", "#A9A9A9"]
-
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
-            autopct="%1.1f%%",
-            startangle=140,
-            explode=explode,
-            colors=colors,
-        )
-        ax.set_title(f"Proporción de Becados (Generado: {timestamp})", fontsize=16)
-
-        for text in autotexts:
-            text.set_color("white")
-            text.set_fontsize(10)
-
-        ax.legend(
-            wedges,
-            labels,
-            title="Becados",
-            loc="center left",
-            bbox_to_anchor=(1, 0, 0.5, 1),
-        )
-
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
-    graph_base64 = base64.b64encode(buf.read()).decode("utf-8")
-    buf.close()
-    plt.close(fig)
-
-    return graph_base64
-
-
-def make_bar_chart_job_positions() -> str:
+    _, chart, data = chart_fingerprint(name, image_format)
+    return render_cached(chart, data, image_format)
+
+
+@bp.get("/<name>.<image_format>")
+@login_required
+@permission_required("report_show")
+def show_chart_image(name: str, image_format: str) -> Response:
     """
-    Genera un gráfico de barras que muestra la distribución de puestos laborales con un timestamp.
+    Devuelve la imagen de un gráfico en formato PNG o SVG.
 
-    Devuelve:
-        str: Una cadena base64 que representa el gráfico de barras en formato PNG.
+    La respuesta incluye `ETag` (la huella de los datos del gráfico) y `Last-Modified`
+    (el momento en que se generó), por lo que el navegador puede revalidarla con una
+    petición condicional: si los datos no cambiaron se responde 304 sin volver a
+    enviar ni renderizar la imagen.
+
+    Args:
+        name (str): Nombre del gráfico.
+        image_format (str): Formato de la imagen ("png" o "svg").
+
+    Returns:
+        Response: La imagen del gráfico, o una respuesta 304 si no cambió.
     """
-    position_counts = calculate_active_job_position_frequencies()
-    timestamp = datetime.now().strftime("%d/%m/%Y")
-
-    labels = list(position_counts.keys())
-    counts = list(position_counts.values())
-    if all(count == 0 for count in counts):
-        fig = plt.figure(figsize=(8, 4))
-        plt.text(
-            0.5, 0.5, "No hay datos", ha="center", va="center", fontsize=16, color="red"
-        )
-        plt.text(
-            0.5, 0.1, f"Generado: {timestamp}", fontsize=10, ha="center", va="center"
-        )
-        plt.axis("off")
+    if name not in CHARTS or image_format not in IMAGE_FORMATS:
+        abort(404)
+
+    key, chart, data = chart_fingerprint(name, image_format)
+    if key in request.if_none_match:
+        response = Response(status=304)
     else:
-        fig = plt.figure(figsize=(8, 4))
-        bars = plt.bar(labels, counts, color="skyblue")
-        plt.xlabel("Puesto Laboral")
-        plt.ylabel("Cantidad de Empleados")
-        plt.title(f"Distribución de Puestos Laborales (Generado: {timestamp})")
-        plt.xticks(rotation=45, ha="right")
-
-        for bar in bars:
-            yval = bar.get_height() / 2
-            plt.text(
-                bar.get_x() + bar.get_width() / 2,
-                yval + 0.1,
-                str(int(yval)),
-                ha="center",
-                va="bottom",
-                fontsize=10,
-                fontweight="bold",
-            )
-
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
-    graph_base64 = base64.b64encode(buf.read()).decode("utf-8")
-    buf.close()
-    plt.close(fig)
-
-    return graph_base64
+        content = render_cached(chart, data, image_format)
+        response = Response(content, mimetype=IMAGE_FORMATS[image_format])
+        response.last_modified = chart_cache.last_modified(key)
+
+    response.set_etag(key)
+    # La imagen depende de los permisos del usuario: sólo el navegador la guarda,
+    # y siempre la revalida antes de usarla
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response.make_conditional(request)
 
 
 @bp.get("/discapacidades")
@@ -204,13 +136,14 @@ def show_pie_chart_disabilities() -> str:
     Si no hay datos, se muestra un mensaje indicando que no hay datos disponibles.
 
     Returns:
-        str: La plantilla renderizada con el gráfico en base64.
+        str: La plantilla renderizada con la URL de la imagen del gráfico.
     """
-    frequencies = calculate_diagnosis_frequencies()
-    graph_base64 = make_pie_chart_disabilities(frequencies=frequencies)
+    chart_url = url_for(
+        "graphics.show_chart_image", name="discapacidades", image_format="png"
+    )
 
     # Renderizar el template con el gráfico
-    return render_template("graphics/disabilities_pie_chart.html", chart=graph_base64)
+    return render_template("graphics/disabilities_pie_chart.html", chart_url=chart_url)
 
 
 @bp.get("/discapacidades/download")
@@ -224,14 +157,8 @@ def download_pie_chart_disabilities() -> send_file:
     Returns:
         send_file: El archivo de imagen PNG que contiene el gráfico.
     """
-    frequencies = calculate_diagnosis_frequencies()
-    # Usar la función make_pie_chart_disabilities para generar el gráfico en base64
-    graph_base64 = make_pie_chart_disabilities(frequencies)
-
-    # Decodificar el gráfico base64 y enviarlo como archivo PNG
-    buf = io.BytesIO()
-    buf.write(base64.b64decode(graph_base64))
-    buf.seek(0)
+    content = make_chart("discapacidades")
+    buf = io.BytesIO(content)
 
     return send_file(
         buf,
@@ -251,14 +178,12 @@ def show_pie_chart_scholarships() -> str:
     Si no hay datos, se muestra un mensaje indicando que no hay datos disponibles.
 
     Returns:
-        str: La plantilla renderizada con el gráfico en base64.
+        str: La plantilla renderizada con la URL de la imagen del gráfico.
     """
-    graph_base64 = make_scholarship_pie_chart(
-        scholarship_counts=calculate_scholarship_proportion()
-    )
+    chart_url = url_for("graphics.show_chart_image", name="becados", image_format="png")
 
     # Renderizar el template con el gráfico
-    return render_template("graphics/scholarship_pie_chart.html", chart=graph_base64)
+    return render_template("graphics/scholarship_pie_chart.html", chart_url=chart_url)
 
 
 @bp.get("/becados/download")
@@ -271,14 +196,8 @@ def download_pie_chart_scholarships() -> send_file:
     Returns:
         send_file: El archivo de imagen PNG que contiene el gráfico.
     """
-    graph_base64 = make_scholarship_pie_chart(
-        scholarship_counts=calculate_scholarship_proportion()
-    )
-
-    # Decodificar el gráfico base64 y enviarlo como archivo PNG
-    buf = io.BytesIO()
-    buf.write(base64.b64decode(graph_base64))
-    buf.seek(0)
+    content = make_chart("becados")
+    buf = io.BytesIO(content)
 
     return send_file(
         buf,
@@ -295,17 +214,21 @@ def show_bar_chart_job_position():
     """
     Muestra un gráfico de barras con la cantidad de empleados por posición laboral.
 
-    Esta función genera un gráfico de barras que muestra la distribución de los empleados
-    según su posición laboral. El gráfico es enviado a la plantilla HTML para ser visualizado.
+    La página sólo referencia la imagen del gráfico por URL; la imagen se obtiene de
+    `show_chart_image` y el navegador la cachea mientras los datos no cambien.
 
     Requiere que el usuario esté autenticado y tenga el permiso 'report_show'.
 
     Retorna:
-        render_template: La plantilla HTML con el gráfico de barras generado.
+        render_template: La plantilla HTML con el gráfico de barras.
     """
-    graph_base64 = make_bar_chart_job_positions()
+    chart_url = url_for(
+        "graphics.show_chart_image",
+        name="empleados_por_posicion_laboral",
+        image_format="png",
+    )
 
-    return render_template("graphics/job_positions_bar_chart.html", chart=graph_base64)
+    return render_template("graphics/job_positions_bar_chart.html", chart_url=chart_url)
 
 
 @bp.get("/empleados_por_posicion_laboral/download")
@@ -315,19 +238,16 @@ def download_bar_chart_job_positions():
     """
     Descarga el gráfico de barras con la cantidad de empleados por posición laboral.
 
-    Esta función genera el gráfico de barras, lo decodifica desde base64, y lo envía como un
-    archivo PNG que el usuario puede descargar.
+    Esta función obtiene el gráfico de barras (desde la caché si los datos no cambiaron)
+    y lo envía como un archivo PNG que el usuario puede descargar.
 
     Requiere que el usuario esté autenticado y tenga el permiso 'report_show'.
 
     Retorna:
         send_file: El archivo PNG del gráfico de barras para ser descargado.
     """
-    graph_base64 = make_bar_chart_job_positions()
-    # Decodificar el gráfico base64 y enviarlo como archivo PNG
-    buf = io.BytesIO()
-    buf.write(base64.b64decode(graph_base64))
-    buf.seek(0)
+    content = make_chart("empleados_por_posicion_laboral")
+    buf = io.BytesIO(content)
 
     return send_file(
         buf,
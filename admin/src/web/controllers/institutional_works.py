@@ -111,7 +111,7 @@ def new_institutional_work(user_id):
         abort(500)
 
     params = request.form
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     teachers_therapists = team.get_teachers_and_therapists()
     horse_riders = team.get_employees_by_job_position("Conductor")
     track_assistants = team.get_employees_by_job_position("Auxiliar de pista")
@@ -165,7 +165,7 @@ def show_edit_institutional_work(user_id):
         flash: Muestra un mensaje de error si faltan datos en el sistema para completar el registro.
         redirect: Redirige al perfil del jinete si hay datos faltantes.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     teachers_therapists = team.get_teachers_and_therapists()
     horse_riders = team.get_employees_by_job_position("Conductor")
     track_assistants = team.get_employees_by_job_position("Auxiliar de pista")
@@ -246,7 +246,7 @@ def edit_institutional_work(user_id):
         flash: Muestra un mensaje de éxito si los datos se han guardado correctamente.
         redirect: Redirige a la vista de detalle del jinete si la operación es exitosa.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     teachers_therapists = team.get_teachers_and_therapists()
     horse_riders = team.get_employees_by_job_position("Conductor")
     track_assistants = team.get_employees_by_job_position("Auxiliar de pista")
@@ -110,7 +110,7 @@ def show_edit_social_and_school_data(user_id: int):
         un contexto que incluye la información general del jinete, los datos de obra social
         y escolares (si están disponibles) y los parámetros necesarios para la edición.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
 
     insurance = rider.insurance
     school = rider.school
@@ -161,7 +161,7 @@ def edit_social_and_school_data(user_id: int):
         obra social y datos escolares, así como los mensajes flash de éxito o error.
     """
 
-    rider: Rider = riders.get_rider_or_abort(user_id)
+    rider: Rider = riders.get_rider_profile_or_abort(user_id)
 
     params = request.form
     # Validaciones
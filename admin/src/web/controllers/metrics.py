@@ -0,0 +1,26 @@
+from flask import Blueprint, Response, abort, current_app
+
+from src.web.handlers.auth import is_sys_admin, login_required
+
+
+bp = Blueprint("metrics", __name__, url_prefix="/metrics")
+
+
+@bp.get("")
+@login_required
+@is_sys_admin
+def index():
+    """
+    Devuelve las métricas de la aplicación en el formato de texto de Prometheus.
+
+    Returns:
+        Response: Las métricas, o un error 404 si están desactivadas.
+    """
+    if not current_app.metrics.enabled:
+        abort(404)
+
+    return Response(
+        current_app.metrics.render(),
+        mimetype="text/plain",
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,126 @@
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    jsonify,
+    redirect,
+    request,
+    send_file,
+    url_for,
+)
+
+from src.web.handlers.auth import is_sys_admin, login_required
+
+
+bp = Blueprint("profiling", __name__, url_prefix="/perfilado")
+
+
+def _text(content: str) -> Response:
+    return Response(content, mimetype="text/plain")
+
+
+@bp.get("/perfiles")
+@login_required
+@is_sys_admin
+def list_profiles():
+    """
+    Lista los perfiles de requests guardados, del más nuevo al más viejo.
+
+    Returns:
+        Response: Los nombres de los perfiles, uno por línea.
+    """
+    return _text("\n".join(current_app.request_profiler.list_profiles()) + "\n")
+
+
+@bp.get("/perfiles/<name>")
+@login_required
+@is_sys_admin
+def show_profile(name: str):
+    """
+    Descarga un perfil guardado (para abrirlo con `pstats` o `snakeviz`), o con
+    `?formato=texto` muestra un resumen de las funciones más costosas.
+
+    Args:
+        name (str): El nombre del perfil.
+
+    Returns:
+        Response: El archivo `.pstats` o su resumen, o un error 404 si no existe.
+    """
+    profiler = current_app.request_profiler
+    path = profiler.profile_path(name)
+    if path is None:
+        abort(404)
+
+    if request.args.get("formato") == "texto":
+        sort = request.args.get("orden", "cumulative")
+        if sort not in ("cumulative", "tottime", "calls", "ncalls"):
+            abort(400)
+        return _text(profiler.summarize(name, sort=sort))
+
+    return send_file(path, as_attachment=True, download_name=name)
+
+
+@bp.get("/memoria")
+@login_required
+@is_sys_admin
+def memory_diff():
+    """
+    Muestra las líneas de código cuya memoria más creció desde la instantánea base
+    de `tracemalloc` (del proceso que atiende el pedido).
+
+    Returns:
+        Response: La comparación, o un error 404 si no se tomó una instantánea base.
+    """
+    limit = request.args.get("limite", 30, type=int)
+    diff = current_app.request_profiler.memory_diff(limit=max(1, min(limit, 500)))
+    if diff is None:
+        abort(404)
+    return _text(diff)
+
+
+@bp.post("/memoria/base")
+@login_required
+@is_sys_admin
+def take_memory_baseline():
+    """
+    Inicia `tracemalloc` (si no está activo) y toma la instantánea base.
+
+    Returns:
+        Response: Redirección a la comparación con la instantánea base.
+    """
+    current_app.request_profiler.take_baseline()
+    return redirect(url_for("profiling.memory_diff"))
+
+
+@bp.post("/memoria/detener")
+@login_required
+@is_sys_admin
+def stop_memory_tracing():
+    """
+    Detiene `tracemalloc`, que agrega un costo a cada reserva de memoria.
+
+    Returns:
+        Response: Confirmación en texto.
+    """
+    current_app.request_profiler.stop_tracing()
+    return _text("tracemalloc detenido\n")
+
+
+@bp.get("/consultas_lentas")
+@login_required
+@is_sys_admin
+def slow_queries():
+    """
+    Muestra los histogramas de latencia por forma de sentencia SQL del proceso que
+    atiende el pedido, de la más lenta a la más rápida.
+
+    Returns:
+        Response: Los histogramas en JSON, o un error 404 si el registro de
+            consultas lentas está desactivado.
+    """
+    slow_query_log = current_app.slow_query_log
+    if not slow_query_log.enabled:
+        abort(404)
+    limit = request.args.get("limite", 50, type=int)
+    return jsonify(slow_query_log.snapshot()[: max(1, min(limit, 500))])
@@ -61,7 +61,8 @@ def get_incomplete_riders() -> List[Dict[str, str]]:
     """
     Obtiene una lista de jinetes que tienen información incompleta en su registro.
 
-    Esta función recupera los jinetes que no tienen información completa en sus registros,
+    Esta función recupera las filas de los jinetes que no tienen información completa
+    (ya ordenadas y con los indicadores de cada sección calculados en la base de datos),
     y organiza los datos en un formato de diccionario con campos clave como apellido, nombre,
     DNI, discapacidad, seguro, trabajo institucional y tutores. Los valores para discapacidad,
     seguro y tutores se establecen como "SI" o "NO" según la disponibilidad de los datos.
@@ -72,31 +73,18 @@ def get_incomplete_riders() -> List[Dict[str, str]]:
         List[dict]: Una lista de diccionarios, cada uno representando a un jinete, con
                     información clave sobre su registro. La lista está ordenada por apellido.
     """
-    incomplete_riders: List[Rider] = get_riders_without_full_information()
-    riders_data: List[Dict[str, str]] = []
-    for rider in incomplete_riders:
-        riders_data.append(
-            {
-                "last_name": rider.last_name,
-                "first_name": rider.name,
-                "dni": rider.dni,
-                "disability": (
-                    "NO"
-                    if rider.disability_id is None or rider.benefit_id is None
-                    else "SI"
-                ),
-                "insurance": (
-                    "NO"
-                    if rider.insurance_id is None or rider.school_id is None
-                    else "SI"
-                ),
-                "institutional_work": (
-                    "NO" if rider.institutional_work_id is None else "SI"
-                ),
-                "tutors": "NO" if rider.primary_tutor is None else "SI",
-            }
-        )
-    riders_data = sorted(riders_data, key=lambda rider: rider["last_name"])
+    riders_data: List[Dict[str, str]] = [
+        {
+            "last_name": row.last_name,
+            "first_name": row.name,
+            "dni": row.dni,
+            "disability": "SI" if row.has_disability else "NO",
+            "insurance": "SI" if row.has_insurance else "NO",
+            "institutional_work": "SI" if row.has_institutional_work else "NO",
+            "tutors": "SI" if row.has_primary_tutor else "NO",
+        }
+        for row in get_riders_without_full_information()
+    ]
 
     return riders_data
 
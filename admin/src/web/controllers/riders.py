@@ -1,4 +1,3 @@
-import io
 import os
 import secrets
 from typing import Dict, List
@@ -19,13 +18,18 @@ from flask import (
 from werkzeug.datastructures import FileStorage
 from urllib3.exceptions import MaxRetryError
 
-from src.core import riders
+from src.core import riders, users
+from src.core.riders import search
 from src.core.database import db
+from src.core.files.derivatives import derivative_of, web_version_of
 from src.core.functions import check_file_size, check_valid_format
+from src.core.pagination import InvalidCursorException
 from src.core.riders.rider import Rider
 from src.core.riders.rider_document import RiderDocument
 from src.web.handlers.auth import login_required, permission_required
 from src.web.handlers.exceptions import RiderNotFoundException
+from src.web.storage import storage
+from src.web.storage.uploads import streamed_upload
 from src.web.validators.document_rider_validations import (
     check_modify_document,
     check_upload_link,
@@ -86,18 +90,25 @@ def index(page: int = 1) -> str:
         query = riders.get_riders_ordered_by_last_name(ascendent=True)
     elif params["order"] == "apellidoZ-A":
         query = riders.get_riders_ordered_by_last_name(ascendent=False)
+    elif params["order"] == "relevancia":
+        query = search.order_by_relevance(
+            riders.get_riders(), name=params["name"], last_name=params["last_name"]
+        )
     else:
         query = riders.get_riders()
-    if params["dni"] != "":
-        query = query.filter(Rider.dni == params["dni"])
-    if params["name"] != "":
-        query = query.filter(Rider.name.ilike(f'%{params["name"]}%'))
-
-    if params["last_name"]:
-        query = query.filter(Rider.last_name.ilike(f'%{params["last_name"]}%'))
+    query = search.filter_riders(
+        query, name=params["name"], last_name=params["last_name"], dni=params["dni"]
+    )
     if params["employee"]:
         query = riders.filter_by_professionals(query, params["employee"])
 
+    # El orden por relevancia no es una clave estable, por lo que se pagina por offset
+    if (
+        current_app.config.get("RIDERS_PAGINATION_MODE") == "keyset"
+        and params["order"] != "relevancia"
+    ):
+        return index_by_keyset(query, params)
+
     riders_paginated = db.paginate(
         query,
         page=page,
@@ -134,6 +145,48 @@ def index(page: int = 1) -> str:
     )
 
 
+def index_by_keyset(query, params: Dict[str, str]) -> str:
+    """
+    Renderiza el listado de jinetes paginado por clave (keyset).
+
+    La posición se recibe en el parámetro `cursor` de la URL, y los enlaces a la
+    página siguiente y anterior se construyen con los cursores opacos devueltos
+    por la paginación. El conteo total sólo se calcula si está habilitado
+    `RIDERS_KEYSET_COUNT`.
+    """
+    try:
+        riders_paginated = riders.paginate_riders_by_keyset(
+            query,
+            order=params["order"],
+            per_page=current_app.config["MAX_ELEMENTS_ON_PAGE"],
+            cursor=request.args.get("cursor") or None,
+            with_count=current_app.config.get("RIDERS_KEYSET_COUNT", False),
+        )
+    except InvalidCursorException:
+        flash("No existe esa página, reintente", "error")
+        return redirect(url_for("riders.index", **params))
+
+    next_page = (
+        url_for("riders.index", cursor=riders_paginated.next_cursor, **params)
+        if riders_paginated.has_next
+        else None
+    )
+    prev_page = (
+        url_for("riders.index", cursor=riders_paginated.prev_cursor, **params)
+        if riders_paginated.has_prev
+        else None
+    )
+
+    return render_template(
+        "jinetes/listado.html",
+        riders_paginated=riders_paginated,
+        next_page=next_page,
+        prev_page=prev_page,
+        params=params,
+        keyset=True,
+    )
+
+
 @bp.post("/eliminar_jinete")
 @login_required
 @permission_required("rider_delete")
@@ -143,7 +196,8 @@ def delete_rider():
 
     Esta vista permite eliminar un jinete o amazona de la base de datos
     después de verificar su existencia. También elimina los documentos o enlaces
-    asociados con el jinete de los sistemas remotos.
+    asociados con el jinete; sus archivos se eliminan del almacenamiento remoto en
+    segundo plano.
 
     Si el jinete no se encuentra o los datos proporcionados no son válidos,
     se muestra un mensaje de error. Si el proceso es exitoso, se muestra un mensaje
@@ -161,7 +215,6 @@ def delete_rider():
     if rider is None:
         flash("No se encontró el jinete a eliminar, reintente", "error")
         return redirect(url_for("riders.index"))
-    # Borrar todos los documentos / enlaces del jinete
     if rider.charges:
         flash(
             """No se puede eliminar al jinete porque tiene cobros asociados. 
@@ -170,7 +223,7 @@ def delete_rider():
         )
         return redirect(url_for("riders.index"))
 
-    riders.drop_documents_from_remote(rider_id)
+    # Elimina el jinete junto con sus documentos / enlaces
     riders.delete_rider(rider_id)
 
     flash("El jinete ha sido eliminado correctamente", "info")
@@ -248,7 +301,7 @@ def show_rider(user_id):
     Returns:
         str: La plantilla que muestra los datos del jinete.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     params: dict = get_personal_data_params(rider=rider)
 
     context = {
@@ -277,7 +330,7 @@ def show_edit_personal_data(user_id):
     Returns:
         str: La plantilla que muestra el formulario de edición de datos del jinete.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     params = get_personal_data_params(rider=rider)
     context: dict = {
         "info_general": True,
@@ -305,7 +358,7 @@ def edit_personal_data(user_id):
     Returns:
         str: La plantilla actualizada con los nuevos datos del jinete.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     params = request.form
     context = {
         "info_general": True,
@@ -500,6 +553,7 @@ def show_upload_document(user_id: int):
 @bp.post("/datos_personales/<int:user_id>/subir_doc")
 @login_required
 @permission_required("rider_create")
+@streamed_upload
 def upload_document(user_id):
     """
     Permite subir un documento asociado a un jinete o amazona.
@@ -637,11 +691,11 @@ def upload_link(user_id):
 @permission_required("rider_update")
 def download_rider_file(user_id: int) -> Response:
     """
-    Ruta para descargar un documento de un jinete desde MinIO.
+    Ruta para descargar un documento de un jinete desde el almacenamiento.
 
     Esta ruta maneja la descarga de un documento específico del jinete,
     utilizando el ID del documento proporcionado. Si se encuentra el
-    documento en MinIO, se prepara para la descarga y se responde con
+    documento en el almacenamiento, se prepara para la descarga y se responde con
     el archivo solicitado.
 
     Parámetros:
@@ -657,11 +711,8 @@ def download_rider_file(user_id: int) -> Response:
     document_id = params.get("document_id")
 
     try:
-        # Descargar el archivo desde MinIO
-        response, document = riders.download_document(document_id)
-
-        archivo = io.BytesIO(response.read())
-        archivo.seek(0)
+        # Obtener los metadatos del archivo en el almacenamiento
+        stat, document = riders.download_document(document_id)
 
         extension: str = os.path.splitext(document.source)[1]  # Extrae la extensión
         if not extension.startswith("."):  # Asegurarse de que tenga un punto
@@ -669,14 +720,7 @@ def download_rider_file(user_id: int) -> Response:
 
         filename = f"{document.title}{extension}"
 
-        return Response(
-            archivo,
-            mimetype="application/octet-stream",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Type": "application/octet-stream",
-            },
-        )
+        return storage.send_object(stat, filename)
     except ValueError as e:
         # Manejo de errores
         flash(f"Error al descargar el archivo: {e}", "error")
@@ -684,6 +728,67 @@ def download_rider_file(user_id: int) -> Response:
         return redirect(url_for("riders.show_documentation", user_id=user_id))
 
 
+@bp.get("/datos_personales/<int:user_id>/vista_previa/<int:document_id>")
+@login_required
+@permission_required("rider_show")
+def preview_rider_file(user_id: int, document_id: int) -> Response:
+    """
+    Envía la miniatura de un documento de un jinete, o con `?version=web` la imagen
+    para verla en el navegador (la versión recomprimida, si existe). Como la versión
+    web puede ser el original, requiere el mismo permiso que la descarga.
+
+    Parámetros:
+        user_id (int): ID del jinete.
+        document_id (int): ID del documento.
+
+    Retorna:
+        Response: Respuesta con la imagen, o un error 404 si no existe.
+    """
+    document = riders.get_document_by_id(document_id)
+    if document is None or document.rider_id != user_id:
+        abort(404)
+
+    if request.args.get("version") == "web":
+        # Puede ser el original, por lo que requiere el permiso de descarga
+        if not users.check_permission("rider_update"):
+            abort(403)
+        object_name = web_version_of(document)
+    else:
+        object_name = derivative_of(document, "thumbnail")
+    if object_name is None:
+        abort(404)
+
+    return storage.send_image(object_name)
+
+
+@bp.get("/datos_personales/<int:user_id>/descargar_todo")
+@login_required
+@permission_required("rider_update")
+def download_all_rider_files(user_id: int) -> Response:
+    """
+    Descarga todos los documentos de un jinete en un archivo ZIP.
+
+    El ZIP se genera mientras se envía, leyendo los archivos del almacenamiento en
+    paralelo. Los enlaces se incluyen como un índice.
+
+    Parámetros:
+        user_id (int): ID del jinete.
+
+    Retorna:
+        Response: Respuesta con el ZIP, o una redirección si el jinete no existe.
+    """
+    rider = riders.get_rider_by_id(user_id)
+    if rider is None:
+        flash("No se encontró el jinete, reintente", "error")
+        return redirect(url_for("riders.index"))
+
+    documents = riders.get_documents_by_rider_id(user_id, order_by="mas_viejos")
+
+    return storage.send_archive(
+        documents, f"documentos_{rider.name}_{rider.last_name}.zip"
+    )
+
+
 @bp.post("/datos_personales/<int:user_id>/modificar_doc")
 @login_required
 @permission_required("rider_update")
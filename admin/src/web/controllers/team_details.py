@@ -1,11 +1,9 @@
-import io
 import os
 from datetime import datetime
 from typing import List
 
 from flask import (
     Blueprint,
-    Response,
     abort,
     flash,
     redirect,
@@ -18,8 +16,11 @@ from werkzeug.datastructures import FileStorage
 
 from src.core import functions, team, users
 from src.core.database import db
+from src.core.files.derivatives import derivative_of, web_version_of
 from src.web.handlers.auth import is_admin, login_required
 from src.web.handlers.exceptions import DniExistsException, EmailExistsException
+from src.web.storage import storage
+from src.web.storage.uploads import streamed_upload
 from src.web.validators.general_validations import validate_string
 
 
@@ -226,29 +227,77 @@ def download_employee_files():
         return redirect(url_for("team_dashboard.index"))
 
     try:
-        response, document = team.download_document(document_id)
-        archivo = io.BytesIO(response.read())
-        archivo.seek(0)
+        stat, document = team.download_document(document_id)
         extension: str = os.path.splitext(document.source)[1]  # Extrae la extensión
         if not extension.startswith("."):  # Asegurarse de que tenga un punto
             extension = f".{extension}"
 
         filename = f"{document.title}{extension}"
 
-        return Response(
-            archivo,
-            mimetype="application/octet-stream",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Type": "application/octet-stream",
-            },
-        )
+        return storage.send_object(stat, filename)
     except ValueError as e:
         # Manejo de errores
         flash(f"Error al descargar el archivo: {e}", "error")
         return redirect(url_for("team_dashboard.index"))
 
 
+@bp.get("/preview/<int:employee_id>/<int:document_id>")
+@login_required
+@is_admin
+def preview_employee_file(employee_id: int, document_id: int):
+    """
+    Envía la miniatura de un documento de un empleado, o con `?version=web` la
+    imagen para verla en el navegador (la versión recomprimida, si existe).
+
+    Args:
+        employee_id (int): ID del empleado.
+        document_id (int): ID del documento.
+
+    Returns:
+        Response: Respuesta con la imagen, o un error 404 si no existe.
+    """
+    document = team.get_document_by_id(document_id)
+    if document is None or document.employee_id != employee_id:
+        abort(404)
+
+    if request.args.get("version") == "web":
+        object_name = web_version_of(document)
+    else:
+        object_name = derivative_of(document, "thumbnail")
+    if object_name is None:
+        abort(404)
+
+    return storage.send_image(object_name)
+
+
+@bp.get("/download_all/<int:employee_id>")
+@login_required
+@is_admin
+def download_all_employee_files(employee_id: int):
+    """
+    Descarga todos los documentos de un empleado en un archivo ZIP.
+
+    El ZIP se genera mientras se envía, leyendo los archivos del almacenamiento en
+    paralelo. Los enlaces se incluyen como un índice.
+
+    Args:
+        employee_id (int): ID del empleado.
+
+    Returns:
+        Response: Respuesta con el ZIP, o una redirección si el empleado no existe.
+    """
+    employee = team.get_employee(employee_id=employee_id)
+    if not employee:
+        flash("Empleado no encontrado", "error")
+        return redirect(url_for("team_dashboard.index"))
+
+    documents = team.get_all_documents(employee_id)
+
+    return storage.send_archive(
+        documents, f"documentos_{employee.name}_{employee.last_name}.zip"
+    )
+
+
 @bp.post("modify_title")
 @login_required
 @is_admin
@@ -306,11 +355,7 @@ def delete_document():
         page = request.form.get("page")
         document = team.get_document_by_id(document_id)
         if document:
-            if document.format == "file":
-                try:
-                    functions.delete_document(document.source)
-                except MaxRetryError:
-                    flash("No se pudo hacer conexión con la base de datos.", "error")
+            # Si es un "file", el archivo se elimina del almacenamiento en segundo plano
             team.delete_document(document_id)
             flash("Documento eliminado exitosamente", "success")
         else:
@@ -355,6 +400,7 @@ def show_upload_document(employee_id: int):
 @bp.post("/upload_document/<int:employee_id>")
 @login_required
 @is_admin
+@streamed_upload
 def upload_document(employee_id: int):
     """Procesa la carga de un documento para un empleado.
 
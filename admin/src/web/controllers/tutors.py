@@ -287,21 +287,13 @@ def show_edit_tutors(user_id):
         Renderiza la plantilla 'jinete_show.html' con la información actual de los tutores
         y el jinete.
     """
-    rider = riders.get_rider_or_abort(user_id)
+    rider = riders.get_rider_profile_or_abort(user_id)
     tutor_primario = rider.primary_tutor
-    parentesco_primario = (
-        riders.find_connection_rider_tutor(rider.id, tutor_primario.id)
-        if tutor_primario
-        else None
-    )
+    parentesco_primario = rider.primary_tutor_link
 
     tutor_secundario = rider.secondary_tutor
 
-    parentesco_secundario = (
-        riders.find_connection_rider_tutor(rider.id, tutor_secundario.id)
-        if tutor_secundario
-        else None
-    )
+    parentesco_secundario = rider.secondary_tutor_link
     if tutor_primario:
         params = {
             "second_tutor_enabled": "yes" if tutor_secundario else "no",
@@ -392,7 +384,7 @@ def edit_tutors(user_id: int):
         hubo algún problema durante la actualización.
     """
     params = request.form
-    rider = riders.get_rider_or_abort(user_id=user_id)
+    rider = riders.get_rider_profile_or_abort(user_id=user_id)
     context = {
         "info_general": True,
         "tutores": True,
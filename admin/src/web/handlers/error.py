@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from flask import render_template
+from flask import current_app, flash, redirect, render_template, request
 
 
 @dataclass
@@ -81,3 +81,26 @@ def bad_request_error(error: Error):
     """
     error = Error(400, "Solicitud incorrecta", "Hubo un error en la carga")
     return render_template("error.html", error=error), error.code
+
+
+def request_entity_too_large(error: Error):
+    """
+    Maneja el error 413 (Archivo demasiado grande). Si el request provino de un
+    formulario, se informa el límite y se vuelve a él; si no, se muestra una página
+    de error personalizada.
+
+    Args:
+        error (Exception): Excepción que provoca el error 413.
+
+    Returns:
+        Una redirección al formulario o la página renderizada con el código HTTP 413.
+    """
+    limit_mb = current_app.config.get("MAX_UPLOAD_SIZE", 0) // (1024 * 1024)
+    if request.referrer:
+        flash(f"El archivo seleccionado excede el límite de {limit_mb} MB", "error")
+        return redirect(request.referrer)
+
+    error = Error(
+        413, "Archivo demasiado grande", f"El límite es de {limit_mb} MB por archivo"
+    )
+    return render_template("error.html", error=error), error.code
@@ -225,3 +225,19 @@ class StringNotValidException(Exception):
     def __init__(self, message="Debe ingresar una cadena de texto."):
         self.message = message
         super().__init__(self.message)
+
+
+class ChartRenderException(Exception):
+    """Excepción lanzada cuando no se pudo generar un gráfico."""
+
+    def __init__(self, message="No se pudo generar el gráfico. Intente nuevamente."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class StorageObjectNotFoundException(ValueError):
+    """Excepción lanzada cuando un archivo no existe en el almacenamiento."""
+
+    def __init__(self, message="El archivo no se encuentra en el almacenamiento."):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,442 @@
+import bisect
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from src.core.database import db
+
+# Límites superiores de los intervalos de los histogramas
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024**2, 10 * 1024**2, 100 * 1024**2)
+
+# Nombre, tipo, descripción e intervalos (sólo histogramas) de cada métrica
+METRICS = {
+    "app_http_requests_total": ("counter", "Requests atendidos.", None),
+    "app_http_request_duration_seconds": (
+        "histogram",
+        "Duración de los requests.",
+        DURATION_BUCKETS,
+    ),
+    "app_http_response_size_bytes": (
+        "histogram",
+        "Tamaño de las respuestas (sin las enviadas en streaming).",
+        SIZE_BUCKETS,
+    ),
+    "app_http_request_db_seconds": (
+        "histogram",
+        "Tiempo de cada request en consultas SQL.",
+        DURATION_BUCKETS,
+    ),
+    "app_storage_operations_total": (
+        "counter",
+        "Operaciones sobre el almacenamiento de archivos.",
+        None,
+    ),
+    "app_storage_seconds_total": (
+        "counter",
+        "Tiempo en operaciones sobre el almacenamiento de archivos.",
+        None,
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Archivo con la suma de los valores de los procesos que ya terminaron
+RETIRED_FILE = "retired.json"
+LOCK_FILE = ".lock"
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _merge(
+    snapshots: List[dict],
+) -> Tuple[Dict[Tuple[str, Labels], float], Dict[Tuple[str, Labels], List[float]]]:
+    """Suma los contadores y los histogramas de varios procesos."""
+    counters: Dict[Tuple[str, Labels], float] = {}
+    histograms: Dict[Tuple[str, Labels], List[float]] = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                total[index] += value
+    return counters, histograms
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Existe, pero es de otro usuario
+        return True
+    return True
+
+
+class InstrumentedBackend:
+    """Envoltorio de un backend de almacenamiento que mide sus operaciones.
+
+    El tiempo de las lecturas en bloques (`iter`) se mide a medida que se consumen,
+    por lo que incluye las descargas enviadas en streaming después de terminar la
+    vista. Las operaciones se atribuyen al endpoint que las inició, o a
+    "background" si se hicieron fuera de un request (por ejemplo, en un pool de
+    hilos).
+    """
+
+    def __init__(self, backend, metrics: "Metrics"):
+        self.backend = backend
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+
+        def timed(*args, **kwargs):
+            endpoint = _current_endpoint()
+            start = time.perf_counter()
+            if name == "iter":
+                return self._timed_iter(attribute(*args, **kwargs), endpoint, start)
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self._metrics.observe_storage(
+                    endpoint, name, time.perf_counter() - start
+                )
+
+        return timed
+
+    def _timed_iter(
+        self, chunks: Iterator[bytes], endpoint: str, start: float
+    ) -> Iterator[bytes]:
+        elapsed = time.perf_counter() - start
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield chunk
+        finally:
+            self._metrics.observe_storage(endpoint, "iter", elapsed)
+
+
+def _current_endpoint() -> str:
+    if has_request_context():
+        return request.endpoint or "unmatched"
+    return "background"
+
+
+class Metrics:
+    """Métricas de latencia y volumen de los requests, en formato Prometheus.
+
+    Registra, por blueprint y endpoint, la cantidad de requests (también por método y
+    código de respuesta) y los histogramas de duración, tamaño de la respuesta y
+    tiempo en la base de datos; y, por endpoint y operación, el tiempo en el
+    almacenamiento de archivos. Los valores se mantienen en memoria en cada proceso.
+
+    Con `METRICS_DIR`, cada proceso guarda además sus valores en un archivo de ese
+    directorio (cada `METRICS_FLUSH_INTERVAL` segundos, escribiéndolo completo y
+    renombrándolo), y `/metrics` suma los de todos los procesos. Los archivos de los
+    procesos que terminaron se suman en uno solo (`RETIRED_FILE`) y se eliminan, de
+    modo que los contadores no retroceden y el directorio no crece con el reciclado
+    de los workers.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de Metrics.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        self._lock = threading.Lock()
+        self._enabled = False
+        self._directory: Optional[str] = None
+        self._flush_interval = 5
+        self._flushed_at = 0.0
+        self._file_name: Optional[str] = None
+        self._pid: Optional[int] = None
+        if app is not None:
+            self.init_app(app)
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def init_app(self, app):
+        """Configura las métricas con la configuración de la aplicación Flask
+        proporcionada. Debe llamarse después de registrar la base de datos y el
+        almacenamiento.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        app.metrics = self
+        self._enabled = app.config.get("METRICS_ENABLED", False)
+        if not self._enabled:
+            return app
+
+        self._directory = app.config.get("METRICS_DIR")
+        self._flush_interval = app.config.get("METRICS_FLUSH_INTERVAL", 5)
+        if self._directory:
+            os.makedirs(self._directory, exist_ok=True)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, "before_cursor_execute", self._before_execute)
+                event.listen(engine, "after_cursor_execute", self._after_execute)
+
+        if hasattr(app, "storage"):
+            app.storage.backend = InstrumentedBackend(app.storage.backend, self)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        return app
+
+    # Registro de valores
+
+    def increment(self, name: str, labels: Labels, value: float = 1):
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float):
+        buckets = METRICS[name][2]
+        with self._lock:
+            key = (name, labels)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Un contador por intervalo (más el de +Inf), la suma y la cantidad
+                histogram = self._histograms[key] = [0] * (len(buckets) + 3)
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def observe_storage(self, endpoint: str, operation: str, seconds: float):
+        labels = _labels(endpoint=endpoint, operation=operation)
+        self.increment("app_storage_operations_total", labels)
+        self.increment("app_storage_seconds_total", labels, seconds)
+
+    # Hooks
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, many):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+        if has_request_context() and "metrics_db_time" in g:
+            g.metrics_db_time += time.perf_counter() - start
+
+    def _start(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_db_time = 0.0
+
+    def _finish(self, response):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return response
+
+        endpoint = request.endpoint or "unmatched"
+        labels = _labels(blueprint=request.blueprint or "", endpoint=endpoint)
+        self.increment(
+            "app_http_requests_total",
+            _labels(
+                blueprint=request.blueprint or "",
+                endpoint=endpoint,
+                method=request.method,
+                status=str(response.status_code),
+            ),
+        )
+        self.observe(
+            "app_http_request_duration_seconds", labels, time.perf_counter() - start
+        )
+        self.observe("app_http_request_db_seconds", labels, g.pop("metrics_db_time"))
+        if response.content_length is not None:
+            self.observe(
+                "app_http_response_size_bytes", labels, response.content_length
+            )
+
+        if self._directory and time.time() - self._flushed_at >= self._flush_interval:
+            self.flush()
+        return response
+
+    # Exportación
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), list(values)]
+                    for (name, labels), values in self._histograms.items()
+                ],
+            }
+
+    def flush(self):
+        """Guarda los valores de este proceso en el directorio compartido."""
+        if not self._directory:
+            return
+        self._flushed_at = time.time()
+        if self._pid != os.getpid():
+            # Un archivo por proceso; el momento de inicio evita reutilizar el de un
+            # proceso anterior con el mismo PID
+            self._pid = os.getpid()
+            self._file_name = f"{self._pid}-{int(self._flushed_at)}.json"
+        self._write(self._file_name, self._snapshot())
+
+    def _read(self, name: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self._directory, name)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, name: str, snapshot: dict):
+        descriptor, temporary = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(snapshot, file)
+            os.replace(temporary, os.path.join(self._directory, name))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _files(self) -> List[str]:
+        return [
+            name
+            for name in os.listdir(self._directory)
+            if not name.startswith(".") and name.endswith(".json")
+        ]
+
+    def _retire(self):
+        """Suma los archivos de los procesos terminados en `RETIRED_FILE` y los
+        elimina (con el lock exclusivo tomado)."""
+        dead = []
+        for name in self._files():
+            pid = name.split("-", 1)[0]
+            if pid.isdigit() and not _process_alive(int(pid)):
+                dead.append(name)
+        if not dead:
+            return
+
+        snapshots = [self._read(name) for name in [RETIRED_FILE, *dead]]
+        counters, histograms = _merge([s for s in snapshots if s is not None])
+        self._write(
+            RETIRED_FILE,
+            {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), values]
+                    for (name, labels), values in histograms.items()
+                ],
+            },
+        )
+        for name in dead:
+            os.remove(os.path.join(self._directory, name))
+
+    def _collect(self) -> List[dict]:
+        """Devuelve los valores de todos los procesos (o sólo de este, sin
+        directorio compartido)."""
+        if not self._directory:
+            return [self._snapshot()]
+
+        self.flush()
+        with open(os.path.join(self._directory, LOCK_FILE), "a") as lock:
+            # Un solo proceso a la vez suma los archivos de los procesos terminados;
+            # mientras tanto, nadie los lee (se contarían dos veces)
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._retire()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            snapshots = [self._read(name) for name in self._files()]
+        return [snapshot for snapshot in snapshots if snapshot is not None]
+
+    def render(self) -> str:
+        """Genera las métricas en el formato de texto de Prometheus.
+
+        Returns:
+            Las métricas, sumadas entre todos los procesos.
+        """
+        counters, histograms = _merge(self._collect())
+
+        lines = []
+        for name, (kind, description, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(
+                            f"{name}{_format_labels(labels)} {_format_number(value)}"
+                        )
+                continue
+
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                accumulated = 0
+                for bound, count in zip([*buckets, "+Inf"], values):
+                    accumulated += count
+                    le = bound if bound == "+Inf" else _format_number(bound)
+                    bucket_labels = _format_labels(labels, f'le="{le}"')
+                    lines.append(
+                        f"{name}_bucket{bucket_labels} {_format_number(accumulated)}"
+                    )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_number(values[-2])}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {_format_number(values[-1])}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
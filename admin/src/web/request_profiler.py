@@ -0,0 +1,218 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List, Optional
+
+from flask import g, request, session
+
+PROFILE_SUFFIX = ".pstats"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Toma una instantánea de la memoria, sin las reservas del propio tracemalloc."""
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+
+class RequestProfiler:
+    """Perfilado de requests con cProfile y de memoria con tracemalloc.
+
+    Un request se ejecuta con `cProfile` si lo pide un administrador del sistema
+    (agregando `?_profile=1` a la URL) o si resulta elegido al azar según
+    `PROFILER_SAMPLE_RATE` (0 no elige ninguno). El resultado se guarda como archivo
+    `.pstats` en `PROFILER_DIR` (por defecto, instance/profiles), que conserva sólo
+    los `PROFILER_MAX_FILES` más recientes, y su nombre se informa en `X-Profile` a
+    los administradores del sistema. El cuerpo de las respuestas enviadas en
+    streaming no queda incluido.
+
+    Para buscar crecimientos de memoria en procesos de larga duración, se toma una
+    instantánea de `tracemalloc` como base y luego se compara con el estado actual.
+    Las instantáneas son del proceso que atiende el pedido.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de RequestProfiler.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._directory: Optional[str] = None
+        self._sample_rate = 0.0
+        self._max_files = 50
+        self._trace_frames = 1
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura el perfilado con la configuración de la aplicación Flask
+        proporcionada.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        self._directory = app.config.get("PROFILER_DIR") or os.path.join(
+            app.instance_path, "profiles"
+        )
+        self._sample_rate = app.config.get("PROFILER_SAMPLE_RATE", 0.0)
+        self._max_files = app.config.get("PROFILER_MAX_FILES", 50)
+        self._trace_frames = app.config.get("PROFILER_TRACEMALLOC_FRAMES", 1)
+
+        app.request_profiler = self
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._stop)
+        return app
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    # cProfile
+
+    def _should_profile(self) -> bool:
+        if request.args.get("_profile") == "1" and session.get("sysAdm"):
+            return True
+        return bool(self._sample_rate) and random.random() < self._sample_rate
+
+    def _start(self):
+        if not self._should_profile():
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Ya hay otro perfilador activo en este hilo
+            return
+        g.request_profile = (profile, time.perf_counter())
+
+    def _finish(self, response):
+        started = g.pop("request_profile", None)
+        if started is None:
+            return response
+
+        profile, start = started
+        profile.disable()
+        milliseconds = (time.perf_counter() - start) * 1000
+
+        endpoint = _UNSAFE.sub("_", request.endpoint or "unmatched")
+        name = (
+            f"{datetime.now():%Y%m%d-%H%M%S-%f}-{endpoint}-{milliseconds:.0f}ms"
+            f"{PROFILE_SUFFIX}"
+        )
+        os.makedirs(self._directory, exist_ok=True)
+        profile.dump_stats(os.path.join(self._directory, name))
+        self._prune()
+
+        # El nombre del perfil sólo lo ve quien puede consultarlo
+        if session.get("sysAdm"):
+            response.headers["X-Profile"] = name
+        return response
+
+    def _stop(self, exception=None):
+        """Detiene el perfilado de un request que terminó sin pasar por
+        `after_request` (por ejemplo, por una excepción no manejada)."""
+        started = g.pop("request_profile", None)
+        if started is not None:
+            started[0].disable()
+
+    def _prune(self):
+        """Elimina los perfiles más viejos hasta respetar `PROFILER_MAX_FILES`."""
+        with self._lock:
+            for name in self.list_profiles()[self._max_files :]:
+                try:
+                    os.remove(os.path.join(self._directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self) -> List[str]:
+        """Devuelve los perfiles guardados, del más nuevo al más viejo."""
+        try:
+            names = os.listdir(self._directory)
+        except FileNotFoundError:
+            return []
+        # El nombre empieza con la fecha, por lo que el orden es cronológico
+        return sorted(
+            (name for name in names if name.endswith(PROFILE_SUFFIX)), reverse=True
+        )
+
+    def profile_path(self, name: str) -> Optional[str]:
+        """Devuelve la ruta de un perfil guardado, o None si no existe."""
+        if name not in self.list_profiles():
+            return None
+        return os.path.join(self._directory, name)
+
+    def summarize(self, name: str, sort: str = "cumulative", limit: int = 40) -> str:
+        """Resume un perfil guardado con las funciones más costosas.
+
+        Args:
+            name: El nombre del perfil.
+            sort: Criterio de orden de `pstats` ("cumulative", "tottime", etc.).
+            limit: Cantidad de funciones a mostrar.
+
+        Returns:
+            El resumen en texto.
+        """
+        output = io.StringIO()
+        stats = pstats.Stats(os.path.join(self._directory, name), stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    # tracemalloc
+
+    def take_baseline(self):
+        """Inicia `tracemalloc`, si no está activo, y toma la instantánea base."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self._trace_frames)
+            self._baseline = _snapshot()
+
+    def stop_tracing(self):
+        """Detiene `tracemalloc` y descarta la instantánea base."""
+        with self._lock:
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def memory_diff(self, limit: int = 30) -> Optional[str]:
+        """Compara el uso de memoria actual con la instantánea base.
+
+        Args:
+            limit: Cantidad de líneas de código a mostrar.
+
+        Returns:
+            Las líneas de código con mayor crecimiento de memoria, o None si no se
+            tomó una instantánea base.
+        """
+        with self._lock:
+            if self._baseline is None or not tracemalloc.is_tracing():
+                return None
+            baseline = self._baseline
+
+        differences = _snapshot().compare_to(baseline, "lineno")
+        current, peak = tracemalloc.get_traced_memory()
+
+        lines = [
+            f"Proceso {os.getpid()}: {current / 1024:.1f} KiB en uso, "
+            f"pico de {peak / 1024:.1f} KiB",
+            "",
+        ]
+        lines.extend(str(difference) for difference in differences[:limit])
+        return "\n".join(lines) + "\n"
+
+
+request_profiler = RequestProfiler()
@@ -23,6 +23,8 @@ from src.web.api.publications import bp as api_publications_bp
 from src.web.controllers.publication_details import bp as publication_details_bp
 from src.web.controllers.contacts import bp as contacts_bp
 from src.web.api.messages import bp as messages_bp
+from src.web.controllers.metrics import bp as metrics_bp
+from src.web.controllers.profiling import bp as profiling_bp
 
 from src.web.handlers import error
 from src.web.handlers.exceptions import RiderNotFoundException
@@ -36,6 +38,8 @@ def register_error_handlers(app):
 
     app.register_error_handler(403, error.forbidden_error)
 
+    app.register_error_handler(413, error.request_entity_too_large)
+
     app.register_error_handler(500, error.internal_server_error)
 
     app.register_error_handler(RiderNotFoundException, error.rider_not_found)
@@ -71,3 +75,5 @@ def register_blueprints(app):
     app.register_blueprint(publication_details_bp)
     app.register_blueprint(contacts_bp)
     app.register_blueprint(messages_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(profiling_bp)
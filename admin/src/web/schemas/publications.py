@@ -11,7 +11,7 @@ class PublicationSchema(Schema):
         author_id (str): Identificador del autor de la publicación. Campo obligatorio.
         author (str): Nombre del autor de la publicación. Campo obligatorio.
         publication_date (datetime.date): Fecha de publicación. Campo opcional.
-        creation_date (datetime.datetime): Fecha de creación de la publicación. Solo para lectura.
+        creation_date (datetime.date): Fecha de creación de la publicación. Solo para lectura.
         updated_date (datetime.datetime): Fecha de última actualización de
         la publicación. Solo para lectura.
         state (str): Estado de la publicación. Campo obligatorio.
@@ -24,7 +24,7 @@ class PublicationSchema(Schema):
     author_id = fields.Str(required=True)
     author = fields.Str(required=True)
     publication_date = fields.Date(required=False)
-    creation_date = fields.DateTime(dump_only=True)
+    creation_date = fields.Date(dump_only=True)
     updated_date = fields.DateTime(dump_only=True)
     state = fields.Str(required=True)
     summary = fields.Str(required=True)
@@ -0,0 +1,318 @@
+import bisect
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from src.core.database import db
+from src.web.sql_profiler import statement_shape
+
+# Límites superiores (en ms) de los intervalos de los histogramas de latencia
+LATENCY_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Cantidad de tramos en que se divide la ventana de los histogramas
+HISTOGRAM_SLOTS = 12
+
+# Cláusulas de bloqueo: la consulta esperaría los bloqueos de la transacción original
+_LOCKING_CLAUSE = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE
+)
+
+
+def fingerprint(shape: str) -> str:
+    """Devuelve un identificador corto y estable de la forma de una sentencia."""
+    return hashlib.sha1(shape.encode()).hexdigest()[:16]
+
+
+class LatencyHistogram:
+    """Histograma de latencias de una forma de sentencia en una ventana móvil.
+
+    La ventana se divide en `HISTOGRAM_SLOTS` tramos; al avanzar el tiempo se descartan
+    los tramos más viejos, por lo que el histograma refleja sólo el período reciente.
+    """
+
+    def __init__(self, window: float):
+        self._slot_length = window / HISTOGRAM_SLOTS
+        self._slots: deque = deque()
+
+    def record(self, milliseconds: float, now: float):
+        slot = int(now // self._slot_length)
+        if not self._slots or self._slots[-1][0] != slot:
+            self._slots.append((slot, [0] * (len(LATENCY_BUCKETS) + 1)))
+        self._slots[-1][1][bisect.bisect_left(LATENCY_BUCKETS, milliseconds)] += 1
+        while self._slots[0][0] <= slot - HISTOGRAM_SLOTS:
+            self._slots.popleft()
+
+    def counts(self) -> List[int]:
+        """Devuelve la cantidad de consultas de cada intervalo en la ventana."""
+        current = int(time.time() // self._slot_length)
+        totals = [0] * (len(LATENCY_BUCKETS) + 1)
+        for slot, counts in self._slots:
+            if slot <= current - HISTOGRAM_SLOTS:
+                continue
+            for index, count in enumerate(counts):
+                totals[index] += count
+        return totals
+
+    def summary(self) -> dict:
+        """Resume el histograma: total de consultas y percentiles aproximados (el
+        límite superior del intervalo en que caen; None si supera el último)."""
+        counts = self.counts()
+        total = sum(counts)
+
+        def percentile(fraction: float) -> Optional[int]:
+            if not total:
+                return None
+            target = fraction * total
+            accumulated = 0
+            for index, count in enumerate(counts):
+                accumulated += count
+                if accumulated >= target:
+                    if index < len(LATENCY_BUCKETS):
+                        return LATENCY_BUCKETS[index]
+                    return None
+            return None
+
+        return {
+            "count": total,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "inf"], counts)),
+        }
+
+
+class SlowQueryLog:
+    """Registro de las consultas SQL lentas.
+
+    Escucha los eventos de ejecución del motor de SQLAlchemy y mantiene, para cada
+    forma de sentencia (la sentencia sin sus valores, ver `statement_shape`), un
+    histograma de latencias de la última `SLOW_QUERY_HISTOGRAM_WINDOW` segundos.
+
+    Las consultas que superan `SLOW_QUERY_THRESHOLD_MS` se registran en un archivo
+    JSONL (`SLOW_QUERY_LOG_PATH`, por defecto instance/slow_queries.jsonl) con su
+    forma, su duración, el endpoint que la ejecutó y el resumen del histograma. Al
+    superar `SLOW_QUERY_LOG_MAX_BYTES`, el archivo se renombra con el sufijo ".1"
+    (reemplazando al anterior) y se empieza uno nuevo. Con
+    PostgreSQL, una fracción de las consultas SELECT lentas
+    (`SLOW_QUERY_EXPLAIN_SAMPLE`, a lo sumo una por forma y tramo de la ventana) se
+    vuelve a ejecutar con `EXPLAIN (ANALYZE, BUFFERS)` en un hilo de fondo, y el plan
+    se registra en el mismo archivo. La consulta se vuelve a ejecutar en una
+    transacción de sólo lectura, con `SLOW_QUERY_EXPLAIN_TIMEOUT_MS` como límite; las
+    que toman bloqueos (`FOR UPDATE`, `FOR SHARE`) no se explican, porque esperarían
+    los de la transacción original. Los parámetros de las consultas no se guardan.
+
+    Los histogramas del proceso se consultan con `snapshot` (ver
+    `/perfilado/consultas_lentas`). Con `SLOW_QUERY_THRESHOLD_MS = 0` (el valor por
+    defecto) el registro está desactivado.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de SlowQueryLog.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._threshold = 0
+        self._window = 3600.0
+        self._max_shapes = 500
+        self._explain_sample = 0.0
+        self._explain_timeout = 5000
+        self._path: Optional[str] = None
+        self._max_bytes = 10 * 1024 * 1024
+        self._histograms: "OrderedDict[str, LatencyHistogram]" = OrderedDict()
+        self._shapes: Dict[str, str] = {}
+        self._explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura el registro con la configuración de la aplicación Flask
+        proporcionada. Debe llamarse después de inicializar la base de datos.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        app.slow_query_log = self
+        self._threshold = app.config.get("SLOW_QUERY_THRESHOLD_MS", 0)
+        if not self._threshold:
+            return app
+
+        self._window = app.config.get("SLOW_QUERY_HISTOGRAM_WINDOW", 3600)
+        self._max_shapes = app.config.get("SLOW_QUERY_MAX_FINGERPRINTS", 500)
+        self._explain_sample = app.config.get("SLOW_QUERY_EXPLAIN_SAMPLE", 0.0)
+        self._explain_timeout = app.config.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 5000)
+        self._max_bytes = app.config.get("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024)
+        self._path = app.config.get("SLOW_QUERY_LOG_PATH") or os.path.join(
+            app.instance_path, "slow_queries.jsonl"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, "before_cursor_execute", self._before_execute)
+                event.listen(engine, "after_cursor_execute", self._after_execute)
+        return app
+
+    @property
+    def enabled(self) -> bool:
+        """Indica si el registro está activo."""
+        return bool(self._threshold)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, many):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None:
+            return
+        milliseconds = (time.perf_counter() - start) * 1000
+        if conn.info.get("slow_query_explain"):
+            return
+
+        shape = statement_shape(statement)
+        key = fingerprint(shape)
+        now = time.time()
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self._window)
+                self._shapes[key] = shape
+                if len(self._histograms) > self._max_shapes:
+                    # Se descarta la forma que hace más tiempo no se ejecuta
+                    evicted, _ = self._histograms.popitem(last=False)
+                    self._shapes.pop(evicted, None)
+                    self._explained.pop(evicted, None)
+            else:
+                self._histograms.move_to_end(key)
+            histogram.record(milliseconds, now)
+            if milliseconds < self._threshold:
+                return
+            summary = histogram.summary()
+            explain = not many and self._should_explain(conn, key, shape, now)
+
+        self._write(
+            {
+                "type": "slow_query",
+                "time": datetime.now(timezone.utc).isoformat(),
+                "fingerprint": key,
+                "duration_ms": round(milliseconds, 2),
+                "endpoint": request.endpoint if has_request_context() else None,
+                "statement": shape,
+                "histogram": summary,
+            }
+        )
+        if explain:
+            self._get_executor().submit(
+                self._explain, conn.engine, key, statement, parameters
+            )
+
+    def _should_explain(self, conn, key: str, shape: str, now: float) -> bool:
+        """Decide si se captura el plan de una consulta lenta (con el lock tomado)."""
+        if (
+            not self._explain_sample
+            or conn.dialect.name != "postgresql"
+            or not shape.upper().startswith("SELECT")
+            or _LOCKING_CLAUSE.search(shape)
+            or random.random() >= self._explain_sample
+        ):
+            return False
+        if now - self._explained.get(key, 0) < self._window / HISTOGRAM_SLOTS:
+            return False
+        self._explained[key] = now
+        return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="slow-query-explain"
+                )
+            return self._executor
+
+    def _explain(self, engine, key: str, statement: str, parameters):
+        """Ejecuta `EXPLAIN (ANALYZE, BUFFERS)` de una consulta y registra el plan.
+
+        La consulta se ejecuta realmente, por lo que la transacción es de sólo lectura
+        (las funciones que modifican datos fallan) y tiene un tiempo límite.
+        """
+        entry = {
+            "type": "explain",
+            "time": datetime.now(timezone.utc).isoformat(),
+            "fingerprint": key,
+        }
+        try:
+            with engine.connect() as connection:
+                connection.info["slow_query_explain"] = True
+                try:
+                    connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+                    connection.exec_driver_sql(
+                        f"SET LOCAL statement_timeout = {int(self._explain_timeout)}"
+                    )
+                    result = connection.exec_driver_sql(
+                        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement,
+                        parameters,
+                    )
+                    entry["plan"] = result.scalar()
+                finally:
+                    connection.info.pop("slow_query_explain", None)
+                    connection.rollback()
+        except Exception as e:
+            entry["error"] = str(e)
+        self._write(entry)
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            try:
+                full = os.path.getsize(self._path) + len(line) > self._max_bytes
+            except FileNotFoundError:
+                full = False
+            if full:
+                # Otro proceso puede haberlo rotado al mismo tiempo
+                try:
+                    os.replace(self._path, self._path + ".1")
+                except FileNotFoundError:
+                    pass
+            with open(self._path, "a", encoding="utf-8") as file:
+                file.write(line)
+
+    def snapshot(self) -> List[dict]:
+        """Devuelve el resumen de los histogramas de todas las formas de sentencia,
+        de la más lenta (según su p95) a la más rápida."""
+        with self._lock:
+            entries = [
+                {
+                    "fingerprint": key,
+                    "statement": self._shapes[key],
+                    **histogram.summary(),
+                }
+                for key, histogram in self._histograms.items()
+            ]
+
+        def slowness(entry):
+            if not entry["count"]:
+                return -1
+            # Sin p95, superó el último intervalo del histograma
+            return float("inf") if entry["p95_ms"] is None else entry["p95_ms"]
+
+        return sorted(entries, key=slowness, reverse=True)
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,162 @@
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import List, Tuple
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from src.core.database import db
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Normaliza una sentencia SQL para agrupar las que sólo difieren en sus valores.
+
+    Reemplaza los literales y los parámetros por `?`, colapsa las listas de
+    parámetros (`IN (?, ?, ?)` pasa a ser `IN (?)`) y los espacios. El resultado se
+    memoriza, ya que lo usan varios servicios en cada consulta.
+
+    Args:
+        statement: La sentencia SQL.
+
+    Returns:
+        La forma de la sentencia.
+    """
+    shape = _STRING.sub("?", statement)
+    shape = _PARAMETER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PARAMETER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestProfile:
+    """Consultas SQL ejecutadas durante un request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Devuelve las consultas SELECT que se repitieron al menos `threshold` veces,
+        el patrón típico de una relación perezosa recorrida en un bucle (N+1)."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold and shape.upper().startswith("SELECT")
+        ]
+
+
+class SQLProfiler:
+    """Perfilador de las consultas SQL de cada request.
+
+    Escucha los eventos de ejecución del motor de SQLAlchemy y registra, por request,
+    la cantidad de consultas, el tiempo total en la base de datos y cuántas veces se
+    ejecutó cada forma de sentencia. Las consultas SELECT que se repiten al menos
+    `SQL_PROFILER_N_PLUS_ONE_THRESHOLD` veces se informan como posibles N+1.
+
+    Los resultados se agregan a la respuesta (`X-SQL-Queries`, `X-SQL-Time`,
+    `X-SQL-N-Plus-One` y `Server-Timing`, que muestran las herramientas de desarrollo
+    del navegador) y se registran en el log. Sólo se activa con
+    `SQL_PROFILER_ENABLED`, ya que los encabezados exponen información interna.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de SQLProfiler.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._threshold = 5
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura el perfilador con la configuración de la aplicación Flask
+        proporcionada. Debe llamarse después de inicializar la base de datos.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        app.sql_profiler = self
+        if not app.config.get("SQL_PROFILER_ENABLED", False):
+            return app
+
+        self._threshold = app.config.get("SQL_PROFILER_N_PLUS_ONE_THRESHOLD", 5)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, "before_cursor_execute", self._before_execute)
+                event.listen(engine, "after_cursor_execute", self._after_execute)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        return app
+
+    # El inicio se guarda en el contexto de ejecución de la sentencia: si falla, no
+    # se emite `after_cursor_execute` y el valor se descarta con el contexto
+    def _before_execute(self, conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._sql_profiler_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, many):
+        start = getattr(context, "_sql_profiler_start", None)
+        if start is None:
+            return
+        if has_request_context() and "sql_profile" in g:
+            g.sql_profile.record(statement, time.perf_counter() - start)
+
+    def _start(self):
+        g.sql_profile = RequestProfile()
+
+    def _finish(self, response):
+        profile = g.pop("sql_profile", None)
+        if profile is None:
+            return response
+
+        milliseconds = profile.duration * 1000
+        repeated = profile.repeated(self._threshold)
+
+        response.headers["X-SQL-Queries"] = str(profile.count)
+        response.headers["X-SQL-Time"] = f"{milliseconds:.1f}"
+        response.headers["X-SQL-N-Plus-One"] = str(len(repeated))
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={milliseconds:.1f};desc="{profile.count} consultas"',
+        )
+
+        current_app.logger.info(
+            "%s %s: %d consultas SQL en %.1f ms",
+            request.method,
+            request.path,
+            profile.count,
+            milliseconds,
+        )
+        for shape, count in repeated:
+            current_app.logger.warning(
+                "Posible N+1 en %s %s: %d ejecuciones de %s",
+                request.method,
+                request.path,
+                count,
+                shape[:300],
+            )
+        return response
+
+
+sql_profiler = SQLProfiler()
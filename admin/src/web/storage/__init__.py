@@ -0,0 +1,555 @@
+import hashlib
+import os
+import threading
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import ulid
+from flask import Response, abort, redirect, request
+from minio import Minio
+from werkzeug.datastructures import FileStorage
+from werkzeug.http import dump_options_header
+from werkzeug.wsgi import wrap_file
+
+from src.web.handlers.exceptions import StorageObjectNotFoundException
+from src.web.storage.archive import zip_documents
+from src.web.storage.backends import (
+    FileSystemBackend,
+    MemoryBackend,
+    MinioBackend,
+    ObjectInfo,
+    StorageBackend,
+)
+from src.web.storage.cache import CachingBackend
+from src.web.storage.uploads import StreamingUpload
+
+# Tamaño de los bloques en que se envían los archivos descargados
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Imágenes que se muestran en el navegador (miniaturas de los documentos): tipos
+# que se envían tal cual y vigencia en la caché del navegador, en segundos
+IMAGE_TYPES = ("image/jpeg", "image/png", "image/webp")
+IMAGE_MAX_AGE = 24 * 60 * 60
+
+
+def content_disposition(download_name: str) -> str:
+    """Arma el encabezado `Content-Disposition` de una descarga.
+
+    Los nombres con caracteres no ASCII se envían además codificados según RFC 5987
+    (`filename*`), con una versión ASCII como alternativa.
+
+    Args:
+        download_name: El nombre con el que se descarga el archivo.
+
+    Returns:
+        El valor del encabezado.
+    """
+    try:
+        download_name.encode("ascii")
+        options = {"filename": download_name}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name)
+        options = {
+            "filename": simple.encode("ascii", "ignore").decode("ascii"),
+            "filename*": f"UTF-8''{quote(download_name, safe='')}",
+        }
+    return dump_options_header("attachment", options)
+
+
+class Storage:
+    """Servicio de almacenamiento de los archivos subidos a la aplicación.
+
+    Es la única puerta de acceso a los archivos: guarda, lee, elimina y envía objetos
+    de un bucket (`STORAGE_BUCKET`) sobre el backend configurado en `STORAGE_BACKEND`:
+
+    - "minio": MinIO, configurado con `MINIO_SERVER`, `MINIO_ACCESS_KEY`,
+      `MINIO_SECRET_KEY` y `MINIO_SECURE`. Los archivos descargados se guardan en una
+      caché en disco (`STORAGE_CACHE_SIZE`, ver `CachingBackend`).
+    - "filesystem": un directorio local (`STORAGE_PATH`).
+    - "memory": en memoria, para los tests.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de Storage.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._backend: Optional[StorageBackend] = None
+        self._presigned_downloads = False
+        self._presigned_expires = timedelta(seconds=60)
+        self._max_upload_size = 15 * 1024 * 1024
+        self._part_size = 5 * 1024 * 1024
+        self._background_deletes = True
+        self._archive_workers = 4
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._logger = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Crea el backend de almacenamiento según la configuración de la aplicación.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        self._backend = self.create_backend(app)
+        self._presigned_downloads = app.config.get("STORAGE_PRESIGNED_DOWNLOADS", False)
+        self._presigned_expires = timedelta(
+            seconds=app.config.get("STORAGE_PRESIGNED_EXPIRES", 60)
+        )
+        self._max_upload_size = app.config.get("MAX_UPLOAD_SIZE", self._max_upload_size)
+        self._part_size = app.config.get("STORAGE_PART_SIZE", self._part_size)
+        self._background_deletes = app.config.get("STORAGE_BACKGROUND_DELETES", True)
+        self._archive_workers = app.config.get("STORAGE_ARCHIVE_WORKERS", 4)
+        self._logger = app.logger
+
+        app.storage = self
+        return app
+
+    @staticmethod
+    def create_backend(app) -> StorageBackend:
+        """Crea el backend indicado en `STORAGE_BACKEND`.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Raises:
+            ValueError: Si el backend configurado no existe.
+
+        Returns:
+            El backend de almacenamiento.
+        """
+        kind: str = app.config.get("STORAGE_BACKEND", "minio")
+        bucket_name: str = app.config.get("STORAGE_BUCKET", "grupo13")
+
+        if kind == "minio":
+            minio_server: str = (
+                app.config.get("MINIO_SERVER")
+                .replace("https://", "")
+                .replace("http://", "")
+            )
+            access_key: str = app.config.get("MINIO_ACCESS_KEY")
+            secret_key: str = app.config.get("MINIO_SECRET_KEY")
+            secure: bool = app.config.get("MINIO_SECURE", False)
+
+            client = Minio(
+                minio_server,
+                access_key=access_key,
+                secret_key=secret_key,
+                secure=secure,
+            )
+            backend = MinioBackend(client, bucket_name)
+
+            cache_size: int = app.config.get("STORAGE_CACHE_SIZE", 0)
+            if cache_size > 0:
+                cache_path = app.config.get("STORAGE_CACHE_PATH") or os.path.join(
+                    app.instance_path, "storage-cache"
+                )
+                backend = CachingBackend(
+                    backend,
+                    os.path.join(cache_path, bucket_name),
+                    cache_size,
+                    app.config.get("STORAGE_CACHE_REVALIDATE", 300),
+                )
+            return backend
+        if kind == "filesystem":
+            path = app.config.get("STORAGE_PATH") or os.path.join(
+                app.instance_path, "storage"
+            )
+            return FileSystemBackend(path, bucket_name)
+        if kind == "memory":
+            return MemoryBackend()
+
+        raise ValueError(f"Backend de almacenamiento desconocido: {kind}")
+
+    @property
+    def backend(self) -> StorageBackend:
+        """Devuelve el backend de almacenamiento."""
+        return self._backend
+
+    @backend.setter
+    def backend(self, value: StorageBackend):
+        """Establece el backend de almacenamiento.
+
+        Args:
+            value: El backend que se va a establecer.
+        """
+        self._backend = value
+
+    @staticmethod
+    def unique_name(filename: str) -> str:
+        """Genera el nombre de objeto de un archivo subido: un ULID seguido del nombre."""
+        return f"{ulid.ulid()}-{filename}"
+
+    def open_upload(
+        self, filename: str, content_type: Optional[str] = None
+    ) -> StreamingUpload:
+        """Inicia la carga en streaming de un archivo subido.
+
+        Args:
+            filename: El nombre original del archivo.
+            content_type: El tipo MIME del archivo.
+
+        Returns:
+            El destino en el que se escribe el contenido del archivo.
+        """
+        return StreamingUpload(
+            self._backend,
+            self.unique_name(filename),
+            content_type,
+            limit=self._max_upload_size,
+            part_size=self._part_size,
+        )
+
+    @staticmethod
+    def fingerprint(file: FileStorage) -> Tuple[str, int]:
+        """Calcula el SHA-256 (en hexadecimal) y el tamaño de un archivo subido.
+
+        Si el archivo se recibió en streaming, el resumen ya se calculó durante la
+        carga; si no, se lee el archivo y se vuelve a posicionar al inicio.
+
+        Args:
+            file: El archivo recibido en el formulario.
+
+        Returns:
+            El resumen del contenido y su tamaño en bytes.
+        """
+        if isinstance(file.stream, StreamingUpload):
+            return file.stream.digest, file.stream.size
+
+        sha256 = hashlib.sha256()
+        size = 0
+        file.seek(0)
+        while chunk := file.read(64 * 1024):
+            sha256.update(chunk)
+            size += len(chunk)
+        file.seek(0)
+        return sha256.hexdigest(), size
+
+    @staticmethod
+    def discard(file: FileStorage):
+        """Descarta un archivo subido que no se va a guardar.
+
+        Si el archivo se recibió en streaming, se cancela su carga y se eliminan las
+        partes que ya se habían enviado al almacenamiento.
+
+        Args:
+            file: El archivo recibido en el formulario.
+        """
+        if isinstance(file.stream, StreamingUpload):
+            file.stream.abort()
+
+    def upload(self, file: FileStorage) -> str:
+        """Guarda un archivo subido con un nombre único.
+
+        Si el archivo se recibió en streaming (ver `streamed_upload`), su contenido ya
+        está en el almacenamiento y sólo se confirma la carga.
+
+        Args:
+            file: El archivo recibido en el formulario.
+
+        Returns:
+            El nombre del objeto guardado (un ULID seguido del nombre original).
+        """
+        if isinstance(file.stream, StreamingUpload):
+            return file.stream.complete()
+
+        file.seek(0, 2)  # Mueve el puntero al final del archivo
+        length = file.tell()  # Calcula el tamaño del archivo
+        file.seek(0)  # Regresa el puntero al inicio del archivo
+        object_name = self.unique_name(file.filename)
+        self.put(object_name, file, length, content_type=file.content_type)
+
+        return object_name
+
+    def put(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: Optional[str] = None,
+    ) -> ObjectInfo:
+        """Guarda un objeto.
+
+        Args:
+            object_name: El nombre del objeto.
+            data: El contenido a guardar.
+            length: La cantidad de bytes a leer de `data`.
+            content_type: El tipo MIME del contenido.
+
+        Returns:
+            Los metadatos del objeto guardado.
+        """
+        return self._backend.put(object_name, data, length, content_type)
+
+    def stat(self, object_name: str) -> ObjectInfo:
+        """Obtiene los metadatos de un objeto.
+
+        Args:
+            object_name: El nombre del objeto.
+
+        Raises:
+            StorageObjectNotFoundException: Si el objeto no existe.
+
+        Returns:
+            Los metadatos del objeto.
+        """
+        return self._backend.stat(object_name)
+
+    def iter_object(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Lee un objeto en bloques, sin cargarlo completo en memoria.
+
+        Args:
+            object_name: El nombre del objeto.
+            offset: Posición del primer byte a leer.
+            length: Cantidad de bytes a leer (0 lee hasta el final).
+            chunk_size: Tamaño de cada bloque.
+
+        Returns:
+            Un iterador sobre los bloques del objeto.
+        """
+        return self._backend.iter(object_name, offset, length, chunk_size)
+
+    def remove(self, object_name: str):
+        """Elimina un objeto.
+
+        Args:
+            object_name: El nombre del objeto.
+        """
+        self._backend.remove(object_name)
+
+    def list_objects(self) -> Iterator[ObjectInfo]:
+        """Recorre todos los objetos guardados, sin cargar el listado completo.
+
+        Returns:
+            Un iterador sobre los metadatos de los objetos.
+        """
+        return self._backend.list()
+
+    def remove_many(self, object_names: Iterable[str]) -> List[str]:
+        """Elimina varios objetos en lote.
+
+        Args:
+            object_names: Los nombres de los objetos.
+
+        Returns:
+            Los nombres de los objetos que no se pudieron eliminar.
+        """
+        object_names = list(object_names)
+        if not object_names:
+            return []
+
+        failed = self._backend.remove_many(object_names)
+        if failed and self._logger is not None:
+            self._logger.warning(
+                "No se pudieron eliminar %d objetos del almacenamiento: %s",
+                len(failed),
+                ", ".join(failed),
+            )
+        return failed
+
+    def remove_in_background(self, object_names: Iterable[str]) -> Optional[Future]:
+        """Elimina varios objetos en lote, sin bloquear el request.
+
+        La eliminación se ejecuta en un hilo de fondo, salvo que
+        `STORAGE_BACKGROUND_DELETES` esté desactivado (por ejemplo, en los tests). Los
+        objetos que no se puedan eliminar quedan huérfanos y se registran en el log.
+
+        Args:
+            object_names: Los nombres de los objetos.
+
+        Returns:
+            La tarea de eliminación, o None si no había objetos para eliminar.
+        """
+        object_names = list(object_names)
+        if not object_names:
+            return None
+
+        if not self._background_deletes:
+            future = Future()
+            future.set_result(self.remove_many(object_names))
+            return future
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="storage-delete"
+                )
+        return self._executor.submit(self._remove_logged, object_names)
+
+    def _remove_logged(self, object_names: List[str]) -> List[str]:
+        """Elimina varios objetos; si el almacenamiento falla, lo registra en el log."""
+        try:
+            return self.remove_many(object_names)
+        except Exception:
+            if self._logger is not None:
+                self._logger.exception(
+                    "No se pudieron eliminar %d objetos del almacenamiento",
+                    len(object_names),
+                )
+            return object_names
+
+    def send_object(self, stat: ObjectInfo, download_name: str) -> Response:
+        """Arma una respuesta que envía un objeto como archivo adjunto, en streaming.
+
+        Soporta pedidos parciales (`Range: bytes=inicio-fin`), de modo que las
+        descargas interrumpidas pueden retomarse. El tamaño se toma de `stat`, por lo
+        que el cliente recibe `Content-Length` antes del primer byte.
+
+        Si `STORAGE_PRESIGNED_DOWNLOADS` está activo y el backend lo soporta, en lugar
+        de enviar el contenido se redirige al navegador a una URL prefirmada de corta
+        duración, y el archivo se descarga directamente desde el almacenamiento. Con el
+        backend "filesystem" (o si la caché en disco ya tiene una copia) los archivos
+        completos se envían con `wsgi.file_wrapper`, que el servidor puede resolver
+        con `sendfile` sin copiar el contenido. Los
+        permisos ya fueron verificados por la vista que llama a este método.
+
+        Args:
+            stat: Los metadatos del objeto, obtenidos con `stat`.
+            download_name: El nombre con el que se descarga el archivo.
+
+        Returns:
+            La respuesta con el contenido (o la parte pedida) del objeto.
+        """
+        if self._presigned_downloads:
+            response = self.redirect_to_object(stat, download_name)
+            if response is not None:
+                return response
+
+        size = stat.size
+        start, stop, status = 0, size, 200
+
+        requested = request.range
+        if (
+            requested is not None
+            and len(requested.ranges) == 1
+            and (request.if_range.etag is None or request.if_range.etag == stat.etag)
+        ):
+            bounds = requested.range_for_length(size)
+            if bounds is None:
+                response = Response(status=416)
+                response.headers["Content-Range"] = f"bytes */{size}"
+                return response
+            start, stop = bounds
+            status = 206
+
+        # Sólo se usa una copia local que ya existe: si no la hay, el contenido se
+        # envía a medida que llega del almacenamiento (ver `CachingBackend.iter`)
+        path = self._backend.local_path(stat.name) if status == 200 else None
+        if stop <= start:
+            body = iter(())
+        elif path is not None:
+            body = wrap_file(request.environ, open(path, "rb"), DOWNLOAD_CHUNK_SIZE)
+        else:
+            # Un objeto completo se pide sin longitud, para que la caché lo guarde
+            length = stop - start if status == 206 else 0
+            body = self.iter_object(stat.name, start, length)
+        response = Response(
+            body,
+            status=status,
+            mimetype="application/octet-stream",
+            direct_passthrough=True,
+        )
+        response.headers["Content-Disposition"] = content_disposition(download_name)
+        response.headers["Accept-Ranges"] = "bytes"
+        response.content_length = stop - start
+        if status == 206:
+            response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        if stat.etag:
+            response.set_etag(stat.etag)
+        response.last_modified = stat.last_modified
+
+        return response
+
+    def send_image(self, object_name: str) -> Response:
+        """Envía una imagen para mostrarla en el navegador (por ejemplo, la miniatura
+        de un documento). Los permisos ya fueron verificados por la vista.
+
+        Args:
+            object_name: El nombre del objeto.
+
+        Returns:
+            La respuesta con la imagen, que el navegador puede guardar en su caché, o
+            un error 404 si el objeto no existe.
+        """
+        try:
+            stat = self.stat(object_name)
+        except StorageObjectNotFoundException:
+            abort(404)
+
+        mimetype = stat.content_type
+        if mimetype not in IMAGE_TYPES:
+            mimetype = "image/jpeg"
+        response = Response(
+            self.iter_object(object_name), mimetype=mimetype, direct_passthrough=True
+        )
+        response.content_length = stat.size
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.cache_control.private = True
+        response.cache_control.max_age = IMAGE_MAX_AGE
+        if stat.etag:
+            response.set_etag(stat.etag)
+        response.last_modified = stat.last_modified
+        return response.make_conditional(request)
+
+    def send_archive(self, documents: Iterable, download_name: str) -> Response:
+        """Envía un ZIP con todos los documentos indicados, generado en streaming.
+
+        Args:
+            documents: Los documentos (de jinete, empleado o caballo) a incluir.
+            download_name: El nombre con el que se descarga el ZIP.
+
+        Returns:
+            La respuesta con el ZIP. No tiene `Content-Length`: el tamaño final se
+            conoce recién al terminar de generarlo.
+        """
+        body = zip_documents(self, list(documents), workers=self._archive_workers)
+        response = Response(body, mimetype="application/zip", direct_passthrough=True)
+        response.headers["Content-Disposition"] = content_disposition(download_name)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    def redirect_to_object(
+        self, stat: ObjectInfo, download_name: str
+    ) -> Optional[Response]:
+        """Redirige a una URL prefirmada que descarga el objeto como archivo adjunto.
+
+        Args:
+            stat: Los metadatos del objeto, obtenidos con `stat`.
+            download_name: El nombre con el que se descarga el archivo.
+
+        Returns:
+            La respuesta de redirección (303, para que el navegador haga un GET), o
+            None si el backend no genera URLs prefirmadas.
+        """
+        url = self._backend.presigned_url(
+            stat.name,
+            expires=self._presigned_expires,
+            response_headers={
+                "response-content-disposition": content_disposition(download_name),
+                "response-content-type": "application/octet-stream",
+            },
+        )
+        if url is None:
+            return None
+
+        response = redirect(url, code=303)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+
+storage = Storage()
@@ -0,0 +1,176 @@
+"""
+Descarga de todos los documentos de un jinete, empleado o caballo en un archivo ZIP.
+
+El ZIP se genera a medida que se envía: `zipfile` escribe sobre un destino sin
+posicionamiento (`ZipSink`), del que se toman los bytes producidos después de cada
+bloque. Los objetos se leen del almacenamiento en paralelo, en un pool de hilos
+acotado; cada uno deja sus bloques en una cola de tamaño fijo que se vacía en el orden
+del archivo, por lo que nunca hay más de unos pocos bloques por objeto en memoria.
+
+Los documentos con formato "link" se agregan como un índice (`enlaces.csv`), y los
+archivos que no se pudieron leer se informan en `errores.txt`.
+"""
+
+import csv
+import io
+import os
+import queue
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
+
+LINKS_INDEX_NAME = "enlaces.csv"
+ERRORS_NAME = "errores.txt"
+
+# Bloques que cada lectura puede adelantar antes de que se escriban en el ZIP
+QUEUE_SIZE = 8
+
+_DONE = object()
+
+
+class ZipSink(io.RawIOBase):
+    """Destino de escritura del ZIP que acumula los bytes hasta que se envían."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        """Devuelve los bytes escritos desde la última llamada."""
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks = []
+            yield data
+
+
+def _put(chunks: queue.Queue, item, cancelled: threading.Event) -> bool:
+    """Encola un elemento esperando lugar, salvo que la descarga se cancele."""
+    while not cancelled.is_set():
+        try:
+            chunks.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_object(storage, object_name: str, chunks: queue.Queue, cancelled):
+    """Lee un objeto y deja sus bloques en la cola; termina con `_DONE` o con el
+    error que se produjo."""
+    try:
+        for chunk in storage.iter_object(object_name):
+            if not _put(chunks, chunk, cancelled):
+                return
+        item = _DONE
+    except Exception as e:
+        item = e
+    _put(chunks, item, cancelled)
+
+
+def archive_name(document, used: set) -> str:
+    """Devuelve el nombre del archivo de un documento dentro del ZIP, sin repetir."""
+    extension = os.path.splitext(document.source)[1]
+    title = document.title.replace("/", "-").replace("\\", "-").strip() or "documento"
+    name = f"{title}{extension}"
+    number = 2
+    while name.lower() in used:
+        name = f"{title} ({number}){extension}"
+        number += 1
+    used.add(name.lower())
+    return name
+
+
+def links_index(documents) -> bytes:
+    """Genera el índice CSV de los documentos con formato "link"."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["Título", "Enlace"])
+    for document in documents:
+        writer.writerow([document.title, document.source])
+    # Con BOM, para que las planillas de cálculo lo abran como UTF-8
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def zip_documents(storage, documents: Iterable, workers: int = 4) -> Iterator[bytes]:
+    """Genera, en bloques, un ZIP con los archivos de los documentos.
+
+    Args:
+        storage: El servicio de almacenamiento.
+        documents: Los documentos (de jinete, empleado o caballo) a incluir.
+        workers: Cantidad de objetos que se leen en paralelo.
+
+    Returns:
+        Un iterador sobre los bloques del ZIP.
+    """
+    used = {LINKS_INDEX_NAME, ERRORS_NAME}
+    files: List[Tuple[str, str]] = []
+    links = []
+    for document in documents:
+        if document.format == "file":
+            files.append((archive_name(document, used), document.source))
+        else:
+            links.append(document)
+
+    sink = ZipSink()
+    failed: List[str] = []
+    date_time = time.localtime()[:6]
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="zip-documents"
+    )
+    try:
+        # El pool atiende las lecturas en orden, por lo que la del próximo archivo a
+        # escribir siempre tiene un hilo asignado
+        pending = []
+        for name, object_name in files:
+            chunks = queue.Queue(maxsize=QUEUE_SIZE)
+            executor.submit(_read_object, storage, object_name, chunks, cancelled)
+            pending.append((name, chunks))
+
+        with zipfile.ZipFile(
+            sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+        ) as archive:
+            for name, chunks in pending:
+                item = chunks.get()
+                if isinstance(item, Exception):
+                    failed.append(name)
+                    continue
+
+                info = zipfile.ZipInfo(name, date_time=date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with archive.open(info, "w") as entry:
+                    while item is not _DONE:
+                        if isinstance(item, Exception):
+                            failed.append(f"{name} (incompleto)")
+                            break
+                        entry.write(item)
+                        yield from sink.drain()
+                        item = chunks.get()
+                yield from sink.drain()
+
+            if links:
+                archive.writestr(
+                    zipfile.ZipInfo(LINKS_INDEX_NAME, date_time=date_time),
+                    links_index(links),
+                )
+            if failed:
+                archive.writestr(
+                    zipfile.ZipInfo(ERRORS_NAME, date_time=date_time),
+                    "No se pudieron descargar los siguientes archivos:\n"
+                    + "\n".join(failed)
+                    + "\n",
+                )
+        yield from sink.drain()
+    finally:
+        # Si el cliente corta la descarga, se detienen las lecturas pendientes
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
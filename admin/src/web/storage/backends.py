@@ -0,0 +1,498 @@
+"""
+Backends del servicio de almacenamiento de archivos.
+
+Cada backend guarda los objetos de un único bucket y expone la misma interfaz
+(`put`, `stat`, `iter`, `remove`, `list`), de modo que el resto de la aplicación no depende
+de dónde se guardan los archivos:
+
+- `MinioBackend`: almacenamiento de objetos MinIO / S3 (producción).
+- `FileSystemBackend`: un directorio local, para instalaciones de un solo nodo. Los
+  archivos se envían con `wsgi.file_wrapper`, que el servidor puede resolver con
+  `sendfile` sin copiar el contenido.
+- `MemoryBackend`: un diccionario en memoria, para los tests.
+
+Además, todos soportan cargas por partes (`create_multipart`, `upload_part`,
+`complete_multipart`, `abort_multipart`), que permiten guardar un archivo a medida que
+se recibe, sin conocer su tamaño de antemano.
+"""
+
+import hashlib
+import io
+import mimetypes
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from minio import Minio
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+from werkzeug.security import safe_join
+
+from src.web.handlers.exceptions import StorageObjectNotFoundException
+
+
+class ObjectInfo:
+    """Metadatos de un objeto almacenado."""
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+        content_type: Optional[str] = None,
+    ):
+        self.name = name
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type or "application/octet-stream"
+
+
+def iter_file(
+    path: str, offset: int = 0, length: int = 0, chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    """Lee un archivo local en bloques. Con `length = 0` se lee hasta el final."""
+    try:
+        file = open(path, "rb")
+    except OSError:
+        raise StorageObjectNotFoundException()
+    with file:
+        file.seek(offset)
+        remaining = length or None
+        while remaining is None or remaining > 0:
+            chunk = file.read(
+                chunk_size if remaining is None else min(chunk_size, remaining)
+            )
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+class StorageBackend(ABC):
+    """Interfaz común de los backends de almacenamiento. Los métodos abstractos son
+    obligatorios; los demás tienen una implementación por defecto."""
+
+    @abstractmethod
+    def put(
+        self, name: str, data: BinaryIO, length: int, content_type: Optional[str] = None
+    ) -> ObjectInfo:
+        """Guarda un objeto leyendo `length` bytes de `data`."""
+
+    @abstractmethod
+    def stat(self, name: str) -> ObjectInfo:
+        """Obtiene los metadatos de un objeto.
+
+        Raises:
+            StorageObjectNotFoundException: Si el objeto no existe.
+        """
+
+    @abstractmethod
+    def iter(
+        self, name: str, offset: int = 0, length: int = 0, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Lee un objeto en bloques. Con `length = 0` se lee hasta el final."""
+
+    @abstractmethod
+    def remove(self, name: str):
+        """Elimina un objeto. No falla si el objeto no existe."""
+
+    @abstractmethod
+    def list(self) -> Iterator[ObjectInfo]:
+        """Recorre todos los objetos del bucket, sin cargar el listado completo."""
+
+    def remove_many(self, names: List[str]) -> List[str]:
+        """Elimina varios objetos y devuelve los nombres de los que no se pudieron
+        eliminar."""
+        failed = []
+        for name in names:
+            try:
+                self.remove(name)
+            except Exception:
+                failed.append(name)
+        return failed
+
+    @abstractmethod
+    def create_multipart(self, name: str, content_type: Optional[str] = None) -> str:
+        """Inicia una carga por partes y devuelve su identificador."""
+
+    @abstractmethod
+    def upload_part(self, name: str, upload_id: str, number: int, data: bytes) -> str:
+        """Guarda la parte `number` (desde 1) de una carga y devuelve su etag."""
+
+    @abstractmethod
+    def complete_multipart(
+        self, name: str, upload_id: str, parts: List[Tuple[int, str]]
+    ) -> ObjectInfo:
+        """Une las partes `(número, etag)` de una carga en el objeto final."""
+
+    @abstractmethod
+    def abort_multipart(self, name: str, upload_id: str):
+        """Cancela una carga por partes y descarta las partes guardadas."""
+
+    def presigned_url(
+        self, name: str, expires: timedelta, response_headers: Dict[str, str]
+    ) -> Optional[str]:
+        """Devuelve una URL de descarga directa, si el backend la soporta."""
+        return None
+
+    def local_path(self, name: str) -> Optional[str]:
+        """Devuelve la ruta del objeto en el disco local, si el backend la tiene."""
+        return None
+
+
+class _UploadAborted(Exception):
+    """La carga por partes se canceló antes de completarse."""
+
+
+class _PartStream(io.RawIOBase):
+    """Archivo de sólo lectura con las partes de una carga, a medida que llegan.
+
+    Lo lee `put_object` en otro hilo: `read` espera hasta recibir los bytes pedidos,
+    el fin de la carga (`None`) o una excepción, que se lanza para cancelarla.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # A lo sumo una parte en espera, además de la que se está enviando
+        self.parts: queue.Queue = queue.Queue(maxsize=1)
+        self._buffer = bytearray()
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            item = self.parts.get()
+            if item is None:
+                self._eof = True
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                self._buffer.extend(item)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class _MultipartUpload:
+    """Una carga por partes de MinIO, enviada por `put_object` en un hilo propio."""
+
+    def __init__(self, content_type: Optional[str]):
+        self.content_type = content_type or "application/octet-stream"
+        self.stream = _PartStream()
+        self.error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, client: Minio, bucket_name: str, name: str, part_size: int):
+        def run():
+            try:
+                # Con `length=-1`, el SDK lee partes de `part_size` bytes y, si falla
+                # la lectura o el envío, cancela la carga por partes en MinIO
+                client.put_object(
+                    bucket_name,
+                    name,
+                    self.stream,
+                    length=-1,
+                    part_size=part_size,
+                    content_type=self.content_type,
+                    # Las partes se envían de a una, como se reciben
+                    num_parallel_uploads=1,
+                )
+            except BaseException as e:
+                self.error = e
+
+        self._thread = threading.Thread(
+            target=run, name=f"minio-upload-{name}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def send(self, item):
+        """Entrega una parte (o `None`, el fin) al hilo, sin esperar si terminó."""
+        while True:
+            try:
+                self.stream.parts.put(item, timeout=1)
+                return
+            except queue.Full:
+                if not self._thread.is_alive():
+                    raise self.error or _UploadAborted()
+
+    def wait(self):
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+class MinioBackend(StorageBackend):
+    """Backend sobre un bucket de MinIO.
+
+    Las cargas por partes usan `put_object` con tamaño desconocido: un hilo por carga
+    lee las partes a medida que `upload_part` las recibe, por lo que nunca hay más
+    de dos partes en memoria.
+    """
+
+    def __init__(self, client: Minio, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+        self._uploads: Dict[str, _MultipartUpload] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name, data, length, content_type=None):
+        result = self.client.put_object(
+            self.bucket_name,
+            name,
+            data,
+            length,
+            content_type=content_type or "application/octet-stream",
+        )
+        return ObjectInfo(name, length, result.etag, None, content_type)
+
+    def stat(self, name):
+        try:
+            stat = self.client.stat_object(self.bucket_name, name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                raise StorageObjectNotFoundException()
+            raise
+        return ObjectInfo(
+            name, stat.size, stat.etag, stat.last_modified, stat.content_type
+        )
+
+    def iter(self, name, offset=0, length=0, chunk_size=64 * 1024):
+        response = self.client.get_object(
+            self.bucket_name, name, offset=offset, length=length
+        )
+        try:
+            yield from response.stream(chunk_size)
+        finally:
+            # Se libera la conexión aunque la descarga se interrumpa
+            response.close()
+            response.release_conn()
+
+    def remove(self, name):
+        self.client.remove_object(self.bucket_name, name)
+
+    def list(self):
+        # El SDK pide el listado de a páginas (de hasta 1000 objetos) a medida que se
+        # recorre
+        for item in self.client.list_objects(self.bucket_name, recursive=True):
+            yield ObjectInfo(
+                item.object_name, item.size, item.etag, item.last_modified, None
+            )
+
+    def remove_many(self, names):
+        # Una sola llamada `DeleteObjects` cada 1000 objetos; el resultado es perezoso,
+        # por lo que hay que recorrerlo para que las eliminaciones se ejecuten
+        errors = self.client.remove_objects(
+            self.bucket_name, (DeleteObject(name) for name in names)
+        )
+        return [error.name for error in errors]
+
+    def create_multipart(self, name, content_type=None):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = _MultipartUpload(content_type)
+        return upload_id
+
+    def upload_part(self, name, upload_id, number, data):
+        upload = self._uploads[upload_id]
+        if not upload.started:
+            # Todas las partes, salvo la última, tienen el tamaño de la primera
+            upload.start(self.client, self.bucket_name, name, part_size=len(data))
+        upload.send(data)
+        # MinIO asigna los etag de las partes dentro de `put_object`
+        return str(number)
+
+    def complete_multipart(self, name, upload_id, parts):
+        with self._lock:
+            upload = self._uploads.pop(upload_id)
+        upload.send(None)
+        upload.wait()
+        return self.stat(name)
+
+    def abort_multipart(self, name, upload_id):
+        with self._lock:
+            upload = self._uploads.pop(upload_id, None)
+        if upload is None or not upload.started:
+            return
+        try:
+            upload.send(_UploadAborted())
+            upload.wait()
+        except Exception:
+            pass
+
+    def presigned_url(self, name, expires, response_headers):
+        return self.client.presigned_get_object(
+            self.bucket_name, name, expires=expires, response_headers=response_headers
+        )
+
+
+class FileSystemBackend(StorageBackend):
+    """Backend sobre un directorio local (`<STORAGE_PATH>/<bucket>`)."""
+
+    def __init__(self, path: str, bucket_name: str):
+        self.root = os.path.join(path, bucket_name)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        # safe_join impide que un nombre como "../x" salga del directorio
+        path = safe_join(self.root, name)
+        if path is None:
+            raise StorageObjectNotFoundException()
+        return path
+
+    def put(self, name, data, length, content_type=None):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Escritura atómica: nunca se sirve un archivo a medio escribir
+        descriptor, temporary = tempfile.mkstemp(dir=self.root)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                shutil.copyfileobj(data, file)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return self.stat(name)
+
+    def stat(self, name):
+        try:
+            result = os.stat(self._path(name))
+        except OSError:
+            raise StorageObjectNotFoundException()
+        return ObjectInfo(
+            name,
+            result.st_size,
+            f"{result.st_mtime_ns:x}-{result.st_size:x}",
+            datetime.fromtimestamp(result.st_mtime, tz=timezone.utc),
+            mimetypes.guess_type(name)[0],
+        )
+
+    def iter(self, name, offset=0, length=0, chunk_size=64 * 1024):
+        return iter_file(self._path(name), offset, length, chunk_size)
+
+    def remove(self, name):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def list(self):
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                try:
+                    yield self.stat(name)
+                except StorageObjectNotFoundException:
+                    # Eliminado mientras se recorría el directorio
+                    continue
+
+    def local_path(self, name):
+        return self._path(name)
+
+    def create_multipart(self, name, content_type=None):
+        # La carga se escribe en un archivo temporal del mismo directorio, que se
+        # renombra al completarla
+        descriptor, temporary = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        os.close(descriptor)
+        return os.path.basename(temporary)
+
+    def upload_part(self, name, upload_id, number, data):
+        with open(os.path.join(self.root, upload_id), "ab") as file:
+            file.write(data)
+        return str(number)
+
+    def complete_multipart(self, name, upload_id, parts):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(os.path.join(self.root, upload_id), path)
+        return self.stat(name)
+
+    def abort_multipart(self, name, upload_id):
+        try:
+            os.remove(os.path.join(self.root, upload_id))
+        except FileNotFoundError:
+            pass
+
+
+class MemoryBackend(StorageBackend):
+    """Backend en memoria. Los objetos se pierden al terminar el proceso."""
+
+    def __init__(self):
+        self.objects: Dict[str, tuple] = {}
+        self.uploads: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name, data, length, content_type=None):
+        content = data.read(length) if length >= 0 else data.read()
+        info = ObjectInfo(
+            name,
+            len(content),
+            hashlib.md5(content).hexdigest(),
+            datetime.now(timezone.utc),
+            content_type,
+        )
+        with self._lock:
+            self.objects[name] = (content, info)
+        return info
+
+    def stat(self, name):
+        with self._lock:
+            if name not in self.objects:
+                raise StorageObjectNotFoundException()
+            return self.objects[name][1]
+
+    def iter(self, name, offset=0, length=0, chunk_size=64 * 1024):
+        with self._lock:
+            if name not in self.objects:
+                raise StorageObjectNotFoundException()
+            content = self.objects[name][0]
+        stop = offset + length if length else len(content)
+        for start in range(offset, stop, chunk_size):
+            yield content[start : min(start + chunk_size, stop)]
+
+    def remove(self, name):
+        with self._lock:
+            self.objects.pop(name, None)
+
+    def list(self):
+        with self._lock:
+            infos = [info for _, info in self.objects.values()]
+        yield from infos
+
+    def create_multipart(self, name, content_type=None):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = (bytearray(), content_type)
+        return upload_id
+
+    def upload_part(self, name, upload_id, number, data):
+        with self._lock:
+            self.uploads[upload_id][0].extend(data)
+        return str(number)
+
+    def complete_multipart(self, name, upload_id, parts):
+        with self._lock:
+            content, content_type = self.uploads.pop(upload_id)
+        return self.put(name, io.BytesIO(bytes(content)), len(content), content_type)
+
+    def abort_multipart(self, name, upload_id):
+        with self._lock:
+            self.uploads.pop(upload_id, None)
@@ -0,0 +1,311 @@
+"""
+Caché en disco de los objetos descargados de un backend remoto.
+
+`CachingBackend` envuelve a otro backend (en producción, `MinioBackend`) y guarda en
+un directorio local una copia de cada objeto que se descarga. Las descargas
+siguientes del mismo objeto se leen del disco (y el servidor puede enviarlas con
+`sendfile`, ver `Storage.send_object`) sin volver a pedirlo al almacenamiento.
+
+- Cada copia registra el ETag del objeto. Pasados `revalidate_after` segundos desde
+  la última comprobación, se compara con el ETag actual (una petición HEAD); si
+  cambió, la copia se descarta y se vuelve a descargar.
+- Si no hay copia, el objeto se envía a medida que llega del almacenamiento y la
+  copia se escribe al mismo tiempo, por lo que el primer byte no espera a que se
+  descargue el objeto completo. Se escribe en un archivo temporal que se renombra
+  sólo si la lectura termina, de modo que nunca se lee una copia a medio escribir.
+  Las lecturas parciales (`offset` o `length`) de un objeto sin copia no la crean.
+- El tamaño total está acotado (`max_size`): al superarlo se eliminan las copias
+  usadas hace más tiempo (LRU, según la fecha de modificación, que se actualiza en
+  cada acceso).
+- Los objetos más grandes que `max_size` no se guardan: se registra sólo su entrada
+  de metadatos (sin copia), para no volver a consultar su tamaño en cada lectura
+  hasta que toque revalidarla.
+- Los archivos temporales que deja un proceso interrumpido se eliminan al liberar
+  espacio, pasados `TEMPORARY_MAX_AGE` segundos sin modificarse.
+
+El directorio puede compartirse entre varios procesos de la aplicación.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+from src.web.handlers.exceptions import StorageObjectNotFoundException
+from src.web.storage.backends import ObjectInfo, StorageBackend, iter_file
+
+META_SUFFIX = ".json"
+TEMPORARY_PREFIX = ".tmp-"
+
+# Antigüedad (según la fecha de modificación) a partir de la cual un archivo temporal
+# se considera abandonado; mientras se escribe, su fecha se actualiza
+TEMPORARY_MAX_AGE = 5 * 60
+
+
+class CachingBackend(StorageBackend):
+    """Backend que guarda en disco una copia de los objetos que se leen."""
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        path: str,
+        max_size: int,
+        revalidate_after: int = 300,
+    ):
+        """Inicializa la caché.
+
+        Args:
+            backend: El backend cuyos objetos se guardan en la caché.
+            path: El directorio de la caché.
+            max_size: Tamaño total máximo de las copias, en bytes.
+            revalidate_after: Segundos tras los cuales se revalida una copia.
+        """
+        self.backend = backend
+        self.root = path
+        self.max_size = max_size
+        self.revalidate_after = revalidate_after
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _paths(self, name: str):
+        """Devuelve las rutas de la copia de un objeto y de sus metadatos."""
+        key = hashlib.sha256(name.encode()).hexdigest()
+        data = os.path.join(self.root, key)
+        return data, data + META_SUFFIX
+
+    def _write_atomic(self, path: str, content: bytes):
+        descriptor, temporary = tempfile.mkstemp(dir=self.root, prefix=TEMPORARY_PREFIX)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(content)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _read_meta(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, "rb") as file:
+                return json.loads(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(
+        self, path: str, name: str, etag: Optional[str], bypass: bool = False
+    ):
+        meta = {"name": name, "etag": etag, "validated_at": time.time()}
+        if bypass:
+            meta["bypass"] = True
+        self._write_atomic(path, json.dumps(meta).encode())
+
+    def discard(self, name: str):
+        """Elimina la copia de un objeto, si existe."""
+        for path in self._paths(name):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _lookup(self, name: str) -> Tuple[Optional[str], bool]:
+        """Busca la copia vigente de un objeto, sin descargarlo.
+
+        Returns:
+            La ruta de la copia (o None si no la hay) y si se puede crear una: False
+            para los objetos registrados como más grandes que `max_size`.
+
+        Raises:
+            StorageObjectNotFoundException: Si el objeto no existe.
+        """
+        data, meta_path = self._paths(name)
+        meta = self._read_meta(meta_path)
+        if meta is None:
+            return None, True
+        bypass = meta.get("bypass", False)
+        if not bypass and not os.path.exists(data):
+            return None, True
+
+        if time.time() - meta["validated_at"] >= self.revalidate_after:
+            try:
+                etag = self.backend.stat(name).etag
+            except StorageObjectNotFoundException:
+                self.discard(name)
+                raise
+            if etag != meta["etag"]:
+                return None, True
+            self._write_meta(meta_path, name, etag, bypass=bypass)
+
+        if bypass:
+            return None, False
+        if not self._touch(data):
+            return None, True
+        return data, True
+
+    def _touch(self, data: str) -> bool:
+        """Marca una copia como usada recién. Devuelve False si ya no existe."""
+        try:
+            os.utime(data)
+        except FileNotFoundError:
+            # Otro proceso la eliminó al liberar espacio
+            return False
+        return True
+
+    def _stat_for_fill(self, name: str) -> Optional[ObjectInfo]:
+        """Obtiene los metadatos de un objeto que no tiene copia. Devuelve None si no
+        entra en la caché, y lo registra para no volver a consultarlo.
+
+        Raises:
+            StorageObjectNotFoundException: Si el objeto no existe.
+        """
+        data, meta_path = self._paths(name)
+        try:
+            stat = self.backend.stat(name)
+        except StorageObjectNotFoundException:
+            self.discard(name)
+            raise
+        if stat.size <= self.max_size:
+            return stat
+
+        try:
+            os.remove(data)
+        except FileNotFoundError:
+            pass
+        self._write_meta(meta_path, name, stat.etag, bypass=True)
+        return None
+
+    def _iter_filling(
+        self, name: str, stat: ObjectInfo, chunk_size: int
+    ) -> Iterator[bytes]:
+        """Lee un objeto del backend y guarda su copia a medida que la envía.
+
+        La copia se guarda al recibir el último byte, antes de enviarlo: el servidor
+        puede cerrar el iterador sin pedir el bloque siguiente una vez enviado
+        `Content-Length`. Si la lectura se interrumpe antes, se descarta.
+        """
+        data, meta_path = self._paths(name)
+        descriptor, temporary = tempfile.mkstemp(dir=self.root, prefix=TEMPORARY_PREFIX)
+        file = os.fdopen(descriptor, "wb")
+        written = 0
+        try:
+            chunks = iter(self.backend.iter(name, chunk_size=chunk_size))
+            for chunk in chunks:
+                file.write(chunk)
+                written += len(chunk)
+                if written >= stat.size:
+                    # El último bloque (y cualquier otro, si el objeto cambió) se
+                    # envía después de guardar la copia
+                    break
+                yield chunk
+            else:
+                chunk = b""
+            file.close()
+            if written == stat.size:
+                os.replace(temporary, data)
+                self._write_meta(meta_path, name, stat.etag)
+                self._evict(keep=data)
+        finally:
+            # Incluye GeneratorExit, si el cliente cancela la descarga
+            file.close()
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        if chunk:
+            yield chunk
+        yield from chunks
+
+    def _evict(self, keep: str):
+        """Elimina las copias usadas hace más tiempo hasta respetar `max_size`, y
+        los archivos temporales abandonados."""
+        with self._lock:
+            entries = []
+            total = 0
+            abandoned_before = time.time() - TEMPORARY_MAX_AGE
+            with os.scandir(self.root) as iterator:
+                for entry in iterator:
+                    if entry.name.endswith(META_SUFFIX):
+                        continue
+                    try:
+                        result = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    if entry.name.startswith(TEMPORARY_PREFIX):
+                        if result.st_mtime < abandoned_before:
+                            try:
+                                os.remove(entry.path)
+                            except FileNotFoundError:
+                                pass
+                        continue
+                    if entry.name.startswith("."):
+                        continue
+                    entries.append((result.st_mtime, result.st_size, entry.path))
+                    total += result.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                for stale in (path, path + META_SUFFIX):
+                    try:
+                        os.remove(stale)
+                    except FileNotFoundError:
+                        pass
+                total -= size
+
+    # Lecturas: desde la caché
+
+    def local_path(self, name):
+        return self._lookup(name)[0]
+
+    def iter(self, name, offset=0, length=0, chunk_size=64 * 1024):
+        path, cacheable = self._lookup(name)
+        if path is not None:
+            return iter_file(path, offset, length, chunk_size)
+        if cacheable and offset == 0 and length == 0:
+            stat = self._stat_for_fill(name)
+            if stat is not None:
+                return self._iter_filling(name, stat, chunk_size)
+        return self.backend.iter(name, offset, length, chunk_size)
+
+    # El resto de las operaciones se delegan; las que modifican un objeto descartan
+    # su copia
+
+    def put(self, name, data, length, content_type=None):
+        info = self.backend.put(name, data, length, content_type)
+        self.discard(name)
+        return info
+
+    def stat(self, name):
+        return self.backend.stat(name)
+
+    def remove(self, name):
+        self.discard(name)
+        self.backend.remove(name)
+
+    def remove_many(self, names):
+        for name in names:
+            self.discard(name)
+        return self.backend.remove_many(names)
+
+    def list(self):
+        return self.backend.list()
+
+    def create_multipart(self, name, content_type=None):
+        return self.backend.create_multipart(name, content_type)
+
+    def upload_part(self, name, upload_id, number, data):
+        return self.backend.upload_part(name, upload_id, number, data)
+
+    def complete_multipart(self, name, upload_id, parts):
+        info = self.backend.complete_multipart(name, upload_id, parts)
+        self.discard(name)
+        return info
+
+    def abort_multipart(self, name, upload_id):
+        self.backend.abort_multipart(name, upload_id)
+
+    def presigned_url(self, name, expires, response_headers):
+        return self.backend.presigned_url(name, expires, response_headers)
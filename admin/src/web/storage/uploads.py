@@ -0,0 +1,173 @@
+"""
+Carga de archivos en streaming.
+
+Por defecto werkzeug guarda cada archivo de un formulario en memoria o en un archivo
+temporal antes de que la vista lo procese. En las vistas marcadas con
+`streamed_upload`, en cambio, el contenido del archivo se envía al almacenamiento a
+medida que se recibe, en partes de tamaño fijo (`STORAGE_PART_SIZE`): nunca hay más de
+una parte en memoria, y la carga se cancela apenas se supera `MAX_UPLOAD_SIZE`, sin
+esperar a recibir el resto del archivo.
+
+Mientras se recibe, el contenido se resume con SHA-256 (`StreamingUpload.digest`), de
+modo que es posible detectar un archivo ya guardado sin volver a leerlo.
+
+La vista decide después si conserva el archivo (`storage.upload(file)`); si no lo
+hace, la carga se descarta al cerrarse el request.
+"""
+
+import hashlib
+import io
+from typing import List, Optional, Tuple
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+
+class StreamingUpload(io.RawIOBase):
+    """Destino de escritura de un archivo que se carga por partes en el almacenamiento.
+
+    werkzeug escribe en este objeto el contenido del archivo mientras interpreta el
+    cuerpo del request. Se usa como el `stream` del `FileStorage` que recibe la vista.
+    """
+
+    def __init__(
+        self,
+        backend,
+        object_name: str,
+        content_type: Optional[str],
+        limit: int,
+        part_size: int,
+    ):
+        """Inicializa la carga.
+
+        Args:
+            backend: El backend de almacenamiento.
+            object_name: El nombre del objeto a crear.
+            content_type: El tipo MIME del archivo.
+            limit: Tamaño máximo del archivo, en bytes.
+            part_size: Tamaño de cada parte, en bytes.
+        """
+        super().__init__()
+        self.backend = backend
+        self.object_name = object_name
+        self.content_type = content_type
+        self.limit = limit
+        self.part_size = part_size
+        self.size = 0
+        self.completed = False
+        self._sha256 = hashlib.sha256()
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Tuple[int, str]] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        """Recibe un bloque del archivo y envía las partes que se completen.
+
+        Raises:
+            RequestEntityTooLarge: Si el archivo supera el tamaño máximo. La carga se
+                cancela antes de lanzar la excepción.
+        """
+        self.size += len(data)
+        if self.size > self.limit:
+            self.abort()
+            raise RequestEntityTooLarge()
+
+        self._sha256.update(data)
+        self._buffer.extend(data)
+        while len(self._buffer) >= self.part_size:
+            self._send_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    @property
+    def digest(self) -> str:
+        """Devuelve el SHA-256 (en hexadecimal) del contenido recibido hasta ahora."""
+        return self._sha256.hexdigest()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # werkzeug rebobina el archivo al terminar de escribirlo; el contenido ya está
+        # en el almacenamiento, por lo que no hay nada que mover
+        return self.size
+
+    def tell(self) -> int:
+        return self.size
+
+    def _send_part(self, data: bytes):
+        if self._upload_id is None:
+            self._upload_id = self.backend.create_multipart(
+                self.object_name, self.content_type
+            )
+        number = len(self._parts) + 1
+        etag = self.backend.upload_part(self.object_name, self._upload_id, number, data)
+        self._parts.append((number, etag))
+
+    def complete(self) -> str:
+        """Termina la carga y conserva el archivo.
+
+        Returns:
+            El nombre del objeto creado.
+        """
+        if self.completed:
+            return self.object_name
+
+        if self._upload_id is None:
+            # Archivo más chico que una parte: se guarda con una sola operación
+            self.backend.put(
+                self.object_name,
+                io.BytesIO(bytes(self._buffer)),
+                len(self._buffer),
+                self.content_type,
+            )
+        else:
+            if self._buffer:
+                self._send_part(bytes(self._buffer))
+            self.backend.complete_multipart(
+                self.object_name, self._upload_id, self._parts
+            )
+        self._buffer = bytearray()
+        self.completed = True
+        return self.object_name
+
+    def abort(self):
+        """Cancela la carga y descarta las partes enviadas."""
+        if self._upload_id is not None and not self.completed:
+            self.backend.abort_multipart(self.object_name, self._upload_id)
+        self._upload_id = None
+        self._buffer = bytearray()
+
+    def close(self):
+        """Cierra el archivo. Si la vista no lo conservó, la carga se cancela."""
+        if not self.closed and not self.completed:
+            self.abort()
+        super().close()
+
+
+def streamed_upload(view):
+    """Marca una vista para que sus archivos se carguen en streaming al almacenamiento.
+
+    Debe ubicarse debajo de los demás decoradores de la vista.
+    """
+    view.streamed_upload = True
+    return view
+
+
+class UploadRequest(Request):
+    """Request que carga en streaming los archivos de las vistas `streamed_upload`."""
+
+    def _get_file_stream(
+        self,
+        total_content_length: Optional[int],
+        content_type: Optional[str],
+        filename: Optional[str] = None,
+        content_length: Optional[int] = None,
+    ):
+        view = current_app.view_functions.get(self.endpoint)
+        if not getattr(view, "streamed_upload", False):
+            return super()._get_file_stream(
+                total_content_length, content_type, filename, content_length
+            )
+
+        return current_app.storage.open_upload(filename or "", content_type)
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class UploadProcessor:
+    """Servicio que procesa los archivos subidos en un pool de hilos.
+
+    Las tareas (generar miniaturas, recomprimir imágenes) se ejecutan después de
+    responder la carga, en un `ThreadPoolExecutor` acotado
+    (`UPLOAD_PROCESSING_WORKERS` hilos). Cada tarea corre en su propio contexto de
+    aplicación, con su propia sesión de base de datos; los errores se registran en el
+    log y no afectan a la carga.
+
+    Con `UPLOAD_PROCESSING_WORKERS = 0` las tareas se ejecutan en la misma petición,
+    lo cual es útil en los tests.
+    """
+
+    def __init__(self, app=None):
+        """Inicializa la instancia de UploadProcessor.
+
+        Args:
+            app: Instancia de la aplicación Flask (opcional).
+        """
+        self._app = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._workers = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura el servicio con la configuración de la aplicación Flask proporcionada.
+
+        Args:
+            app: La instancia de la aplicación Flask.
+
+        Returns:
+            La instancia de la aplicación Flask.
+        """
+        self._app = app
+        self._workers = app.config.get("UPLOAD_PROCESSING_WORKERS", 0)
+
+        app.upload_processor = self
+        return app
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Devuelve el pool de hilos, creándolo la primera vez que se usa."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="upload-processor"
+                )
+            return self._executor
+
+    def _run(self, task: Callable, *args):
+        """Ejecuta una tarea en un contexto de aplicación, registrando sus errores."""
+        with self._app.app_context():
+            try:
+                task(*args)
+            except Exception:
+                self._app.logger.exception(
+                    "Falló el procesamiento de un archivo subido (%s)", task.__name__
+                )
+
+    def submit(self, task: Callable, *args) -> Optional[Future]:
+        """Programa una tarea.
+
+        Args:
+            task: La función a ejecutar.
+            *args: Los argumentos de la función.
+
+        Returns:
+            La tarea programada, o None si se ejecutó en el momento.
+        """
+        if not self._workers:
+            self._run(task, *args)
+            return None
+        return self._get_executor().submit(self._run, task, *args)
+
+    def shutdown(self):
+        """Espera a que terminen las tareas pendientes y detiene el pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+upload_processor = UploadProcessor()
@@ -13,6 +13,7 @@ VALID_ORDERS = (
     "nombreZ-A",
     "apellidoA-Z",
     "apellidoZ-A",
+    "relevancia",
 )
 
 
@@ -36,6 +37,7 @@ def check_search_rider_params(params: dict) -> List[str]:
                 - "nombreZ-A": Ordenar nombres de Z a A.
                 - "apellidoA-Z": Ordenar apellidos de A a Z.
                 - "apellidoZ-A": Ordenar apellidos de Z a A.
+                - "relevancia": Ordenar por similitud con el nombre y apellido buscados.
 
     Retorna:
         List[str]: Una lista de mensajes de error. Si no se encuentran errores,
@@ -0,0 +1,238 @@
+"""
+Fixtures de los benchmarks de endpoints.
+
+La aplicación se crea con `create_app("test")` sobre `TEST_DATABASE_URL` (por
+defecto, SQLite en memoria; sus tablas se eliminan y se vuelven a crear) y se carga
+con `bulk_seeds` en la escala de `--benchmark-scale`. Cada endpoint se pide una vez
+para descartar el arranque en frío y luego `--benchmark-rounds` veces, midiendo la
+latencia de cada pedido (incluido el cuerpo de la respuesta) y la cantidad de
+consultas SQL que ejecuta.
+
+La suite se omite salvo que se ejecute `pytest --benchmark`. Los resultados se
+comparan con la línea de base (`baseline.json`) sólo si se generó con el mismo motor
+de base de datos y la misma escala: un endpoint falla si ejecuta más consultas que
+en la línea de base. Si su p95 supera el de la línea de base en más de
+`--benchmark-tolerance` sólo se advierte, porque las latencias dependen de la
+máquina; con `--benchmark-strict` también falla. Con `--benchmark-update` se
+reemplaza la línea de base con los resultados de la ejecución.
+"""
+
+import io
+import json
+import math
+import os
+import statistics
+import time
+import warnings
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from src.web import create_app
+from src.core import bulk_seeds, database, users
+from src.core.database import db
+from src.core.riders import search
+
+ADMIN_EMAIL = "benchmark@example.com"
+
+# Margen absoluto (en ms) de la comparación de latencias, para que las variaciones
+# de los endpoints más rápidos no se informen como regresiones
+LATENCY_SLACK_MS = 5
+
+# Tamaño del documento que se sube para medir su descarga
+DOCUMENT_SIZE = 1024 * 1024
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app("test")
+    with app.app_context():
+        database.reset()
+        search.create_search_indexes()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture(scope="session")
+def dataset(app, pytestconfig):
+    """Genera el conjunto de datos y un administrador del sistema."""
+    users.create_permissions()
+    users.create_roles()
+    admin = users.create_user(
+        system_admin=True,
+        email=ADMIN_EMAIL,
+        password="benchmark",
+        alias="Benchmark",
+        roles=["Administracion"],
+    )
+    bulk_seeds.run(pytestconfig.getoption("benchmark_scale"))
+    return admin
+
+
+@pytest.fixture(scope="session")
+def client(app, dataset):
+    """Cliente con la sesión iniciada por el administrador del sistema."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user"] = dataset.email
+        session["sysAdm"] = dataset.system_admin
+        session["roles"] = users.get_roles(dataset)
+        session["permissions"] = users.get_permissions(dataset)
+        session["id"] = dataset.id
+        session["alias"] = dataset.alias
+    return client
+
+
+@pytest.fixture(scope="session")
+def rider_document(client):
+    """Sube un documento al primer jinete y devuelve (ID del jinete, ID del
+    documento)."""
+    from src.core.riders.rider_document import RiderDocument
+
+    response = client.post(
+        "/jinetes_amazonas/datos_personales/1/subir_doc",
+        data={
+            "title": "Benchmark",
+            "document_type": "entrevista",
+            "document": (
+                io.BytesIO(os.urandom(DOCUMENT_SIZE)),
+                "benchmark.pdf",
+                "application/pdf",
+            ),
+        },
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 302
+    document = db.session.scalars(
+        db.select(RiderDocument).filter_by(rider_id=1, title="Benchmark")
+    ).one()
+    return 1, document.id
+
+
+@pytest.fixture(scope="session")
+def rider_dni(dataset) -> str:
+    """DNI de un jinete existente, para el filtro del listado."""
+    from src.core.riders.rider import Rider
+
+    return str(db.session.scalar(db.select(Rider.dni).order_by(Rider.id).limit(1)))
+
+
+@pytest.fixture(scope="session")
+def query_counter(app):
+    """Cuenta las consultas SQL ejecutadas por el motor de la aplicación."""
+    counter = {"queries": 0}
+
+    def count(conn, cursor, statement, parameters, context, many):
+        counter["queries"] += 1
+
+    event.listen(db.engine, "after_cursor_execute", count)
+    yield counter
+    event.remove(db.engine, "after_cursor_execute", count)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(app, pytestconfig):
+    """Resultados de la ejecución; con `--benchmark-update`, se guardan como línea
+    de base al terminar."""
+    path = pytestconfig.getoption("benchmark_baseline")
+    environment = {
+        "database": db.engine.dialect.name,
+        "scale": pytestconfig.getoption("benchmark_scale"),
+    }
+
+    baseline = {}
+    if not pytestconfig.getoption("benchmark_update") and os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            saved = json.load(file)
+        if saved.get("environment") == environment:
+            baseline = saved["results"]
+        else:
+            warnings.warn(
+                f"La línea de base es de {saved.get('environment')}, no de "
+                f"{environment}: no se compararán los resultados",
+                stacklevel=1,
+            )
+
+    results = {}
+    yield baseline, results
+
+    if pytestconfig.getoption("benchmark_update") and results:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "environment": environment,
+                    "rounds": pytestconfig.getoption("benchmark_rounds"),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "results": dict(sorted(results.items())),
+                },
+                file,
+                indent=2,
+                ensure_ascii=False,
+            )
+            file.write("\n")
+
+
+@pytest.fixture
+def benchmark(client, query_counter, benchmark_results, pytestconfig):
+    """Mide un endpoint y lo compara con la línea de base.
+
+    Se usa como `benchmark(name, method, url, **kwargs)`, donde `kwargs` se pasa al
+    cliente de pruebas; devuelve el resultado de la medición.
+    """
+    baseline, results = benchmark_results
+    rounds = pytestconfig.getoption("benchmark_rounds")
+    tolerance = pytestconfig.getoption("benchmark_tolerance")
+    strict = pytestconfig.getoption("benchmark_strict")
+
+    def measure(name, method, url, expected_status=200, **kwargs):
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        assert response.status_code == expected_status, (
+            f"{method} {url}: se esperaba {expected_status}, "
+            f"se obtuvo {response.status_code}"
+        )
+
+        durations = []
+        queries = []
+        for _ in range(rounds):
+            executed = query_counter["queries"]
+            start = time.perf_counter()
+            response = client.open(url, method=method, **kwargs)
+            response.get_data()
+            durations.append((time.perf_counter() - start) * 1000)
+            queries.append(query_counter["queries"] - executed)
+
+        result = {
+            "method": method,
+            "url": url,
+            "status": response.status_code,
+            "p50_ms": round(statistics.median(durations), 2),
+            "p95_ms": round(_percentile(durations, 0.95), 2),
+            "queries": max(queries),
+        }
+        results[name] = result
+
+        previous = baseline.get(name)
+        if previous is not None:
+            assert result["queries"] <= previous["queries"], (
+                f"{name}: {result['queries']} consultas, "
+                f"{previous['queries']} en la línea de base"
+            )
+            limit = previous["p95_ms"] * (1 + tolerance) + LATENCY_SLACK_MS
+            if result["p95_ms"] > limit:
+                message = (
+                    f"{name}: p95 de {result['p95_ms']} ms, "
+                    f"{previous['p95_ms']} ms en la línea de base"
+                )
+                if strict:
+                    pytest.fail(message)
+                warnings.warn(message, stacklevel=1)
+        return result
+
+    return measure
@@ -0,0 +1,107 @@
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+RIDER_ORDERS = ("nombreA-Z", "nombreZ-A", "apellidoA-Z", "apellidoZ-A", "relevancia")
+
+RIDER_FILTERS = {
+    "name": "?name=Maria",
+    "last_name": "?last_name=Gonzalez",
+    "relevance": "?name=Mria&last_name=Gonzales&order=relevancia",
+    "employee": "?employee=Docente",
+}
+
+CHARGE_FILTERS = {
+    "default": "",
+    "asc": "?order=asc",
+    "payment_method": "?payment_method=EFECTIVO",
+    "dates": "?start_date=2024-06-01&end_date=2024-09-30",
+    "receiver": "?receiver_name=Juan",
+}
+
+PAYMENT_FILTERS = {
+    "default": "",
+    "asc": "?order=asc",
+    "dates": "?start_date=2024-06-01&end_date=2024-09-30",
+}
+
+REPORTS = (
+    "/reportes/",
+    "/reportes/ranking_propuestas",
+    "/reportes/jinetes_dedudores",
+    "/reportes/jinetes_sin_info_completa",
+)
+
+GRAPHICS = (
+    "/graficos/discapacidades",
+    "/graficos/becados",
+    "/graficos/empleados_por_posicion_laboral",
+    "/graficos/discapacidades.png",
+    "/graficos/becados.png",
+    "/graficos/empleados_por_posicion_laboral.png",
+)
+
+
+@pytest.mark.parametrize("order", RIDER_ORDERS)
+def test_riders_index_order(benchmark, order):
+    benchmark(
+        f"riders.index[order={order}]", "GET", f"/jinetes_amazonas/?order={order}"
+    )
+
+
+@pytest.mark.parametrize("name", RIDER_FILTERS)
+def test_riders_index_filter(benchmark, name):
+    benchmark(
+        f"riders.index[{name}]", "GET", f"/jinetes_amazonas/{RIDER_FILTERS[name]}"
+    )
+
+
+def test_riders_index_dni(benchmark, rider_dni):
+    benchmark("riders.index[dni]", "GET", f"/jinetes_amazonas/?dni={rider_dni}")
+
+
+def test_riders_index_last_page(benchmark):
+    benchmark("riders.index[last_page]", "GET", "/jinetes_amazonas/index/100000")
+
+
+@pytest.mark.parametrize("name", CHARGE_FILTERS)
+def test_charges_index(benchmark, name):
+    benchmark(
+        f"charges.index_charges[{name}]", "GET", f"/cobros/index{CHARGE_FILTERS[name]}"
+    )
+
+
+@pytest.mark.parametrize("name", PAYMENT_FILTERS)
+def test_payments_index(benchmark, name):
+    benchmark(
+        f"payments.index[{name}]", "GET", f"/pagos/dashboard{PAYMENT_FILTERS[name]}"
+    )
+
+
+@pytest.mark.parametrize("url", REPORTS)
+def test_reports(benchmark, url):
+    benchmark(f"reports[{url}]", "GET", url)
+
+
+@pytest.mark.parametrize("url", GRAPHICS)
+def test_graphics(benchmark, url):
+    benchmark(f"graphics[{url}]", "GET", url)
+
+
+@pytest.mark.parametrize("query", ("per_page=10", "per_page=50&page=2"))
+def test_api_publications(benchmark, query):
+    benchmark(
+        f"publications_api.get_publications[{query}]",
+        "GET",
+        f"/api/publications/?{query}",
+    )
+
+
+def test_download_document(benchmark, rider_document):
+    rider_id, document_id = rider_document
+    benchmark(
+        "riders.download_rider_file",
+        "POST",
+        f"/jinetes_amazonas/datos_personales/{rider_id}/descargar_doc",
+        data={"document_id": document_id},
+    )
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+BENCHMARKS_DIR = os.path.join(os.path.dirname(__file__), "benchmarks")
+
+
+def pytest_addoption(parser):
+    """Opciones de la suite de benchmarks de endpoints."""
+    group = parser.getgroup("benchmarks", "Benchmarks de endpoints")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Ejecuta los benchmarks de endpoints (se omiten por defecto).",
+    )
+    group.addoption(
+        "--benchmark-scale",
+        type=int,
+        default=1000,
+        help="Cantidad de jinetes del conjunto de datos generado (por defecto, 1000).",
+    )
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=20,
+        help="Cantidad de mediciones de cada endpoint (por defecto, 20).",
+    )
+    group.addoption(
+        "--benchmark-baseline",
+        default=os.path.join(BENCHMARKS_DIR, "baseline.json"),
+        help="Archivo JSON con la línea de base de los benchmarks.",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=1.0,
+        help=(
+            "Aumento relativo del p95 respecto de la línea de base que se considera "
+            "una regresión (por defecto, 1.0: el doble)."
+        ),
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="Reemplaza la línea de base con los resultados de esta ejecución.",
+    )
+    group.addoption(
+        "--benchmark-strict",
+        action="store_true",
+        help=(
+            "Falla si el p95 de un endpoint supera la tolerancia; por defecto, sólo "
+            "se advierte, porque la línea de base depende de la máquina."
+        ),
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: benchmark de endpoints, se ejecuta con --benchmark"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Omite los benchmarks salvo que se pida `--benchmark`."""
+    if config.getoption("benchmark"):
+        return
+    skip = pytest.mark.skip(reason="se ejecuta con --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
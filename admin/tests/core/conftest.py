@@ -0,0 +1,28 @@
+"""
+Fixtures de las pruebas de los módulos de `src.core`.
+
+Cada prueba usa una aplicación nueva creada con `create_app("test")`, con la base de
+`TEST_DATABASE_URL` (por defecto, SQLite en memoria) vacía y el almacenamiento en
+memoria.
+"""
+
+import pytest
+
+from src.web import create_app
+from src.core import database
+from src.core.database import db
+
+
+@pytest.fixture
+def app():
+    app = create_app("test")
+    with app.app_context():
+        database.reset()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def objects(app):
+    """Los objetos guardados en el almacenamiento en memoria, por nombre."""
+    return app.storage.backend.objects
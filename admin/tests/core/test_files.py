@@ -0,0 +1,74 @@
+import io
+
+import sqlalchemy as sa
+from werkzeug.datastructures import FileStorage
+
+from src.core import bulk_seeds, riders
+from src.core.database import db
+from src.core.files import file_columns, release_files, store_file
+from src.core.files.stored_file import StoredFile
+
+
+def _file(content, filename="documento.pdf"):
+    return FileStorage(io.BytesIO(content), filename, content_type="application/pdf")
+
+
+def _stored(object_name):
+    return db.session.scalars(
+        sa.select(StoredFile).where(StoredFile.object_name == object_name)
+    ).one_or_none()
+
+
+def test_same_content_shares_one_object(app, objects):
+    first = store_file(_file(b"certificado", "a.pdf"))
+    second = store_file(_file(b"certificado", "b.pdf"))
+    other = store_file(_file(b"otro certificado", "c.pdf"))
+    db.session.commit()
+
+    assert second.name == first.name
+    assert other.name != first.name
+    assert set(objects) == {first.name, other.name}
+    assert _stored(first.name).ref_count == 2
+    assert file_columns(second)["checksum"] == first.etag
+
+
+def test_release_keeps_object_while_referenced(app):
+    info = store_file(_file(b"certificado"))
+    store_file(_file(b"certificado"))
+    db.session.commit()
+
+    assert release_files([info.name]) == []
+    db.session.commit()
+
+    assert _stored(info.name).ref_count == 1
+
+
+def test_last_release_removes_object_and_derivatives(app):
+    info = store_file(_file(b"certificado"))
+    store_file(_file(b"certificado"))
+    stored = _stored(info.name)
+    stored.thumbnail_name = info.name + ".thumb.jpg"
+    db.session.commit()
+
+    removable = release_files([info.name, info.name])
+    db.session.commit()
+
+    assert sorted(removable) == sorted([info.name, info.name + ".thumb.jpg"])
+    assert _stored(info.name) is None
+
+
+def test_release_of_objects_stored_before_deduplication(app):
+    assert release_files(["anterior.pdf", "anterior.pdf"]) == ["anterior.pdf"]
+
+
+def test_deleting_documents_removes_the_shared_object_last(app, objects):
+    bulk_seeds.run(2)
+    first = riders.create_document("A", "entrevista", "file", _file(b"mismo"), 1)
+    second = riders.create_document("B", "entrevista", "file", _file(b"mismo"), 2)
+    assert first.source == second.source
+
+    riders.delete_document(first)
+    assert first.source in objects
+
+    riders.delete_document(second)
+    assert first.source not in objects
@@ -0,0 +1,50 @@
+import pytest
+
+from src.core import bulk_seeds
+from src.core.pagination import (
+    InvalidCursorException,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+)
+from src.core.database import db
+from src.core.riders import RIDERS_KEYS_BY_NAME
+from src.core.riders.rider import Rider
+
+
+def test_decode_cursor_round_trip():
+    cursor = encode_cursor(["Ana", "Perez", 7], "p")
+
+    assert decode_cursor(cursor, RIDERS_KEYS_BY_NAME) == (["Ana", "Perez", 7], "p")
+
+
+@pytest.mark.parametrize(
+    "values",
+    (
+        ["Ana", "Perez", "abc"],
+        ["Ana", "Perez", 7.5],
+        ["Ana", "Perez", True],
+        ["Ana", 3, 7],
+        ["Ana", "Perez", [7]],
+        ["Ana", "Perez"],
+    ),
+)
+def test_decode_cursor_rejects_values_of_another_type(values):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(encode_cursor(values, "n"), RIDERS_KEYS_BY_NAME)
+
+
+def test_keyset_paginate_walks_every_row_once(app):
+    bulk_seeds.run(25)
+    seen = []
+    cursor = None
+    while True:
+        page = keyset_paginate(
+            db.select(Rider), RIDERS_KEYS_BY_NAME, per_page=10, cursor=cursor
+        )
+        seen.extend(rider.id for rider in page.items)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    assert sorted(seen) == list(range(1, 26))
@@ -0,0 +1,56 @@
+import io
+
+import sqlalchemy as sa
+from werkzeug.datastructures import FileStorage
+
+from src.core import bulk_seeds, riders
+from src.core.charges.charge import Charge
+from src.core.database import db
+from src.core.riders.rider import Rider
+from src.core.riders.rider_document import RiderDocument
+from src.core.riders.rider_tutor import RiderTutor
+from src.core.riders.tutor import Tutor
+
+
+def _count(model, *criteria):
+    return db.session.scalar(
+        sa.select(sa.func.count()).select_from(model).where(*criteria)
+    )
+
+
+def _upload(rider_id, content):
+    file = FileStorage(
+        io.BytesIO(content), "documento.pdf", content_type="application/pdf"
+    )
+    return riders.create_document("Documento", "entrevista", "file", file, rider_id)
+
+
+def test_delete_rider_removes_charges_documents_and_tutor_links(app, objects):
+    bulk_seeds.run(5)
+    tutor_ids = db.session.scalars(
+        sa.select(RiderTutor.tutor_id).where(RiderTutor.rider_id == 1)
+    ).all()
+    document = _upload(1, b"documento del jinete")
+    assert _count(Charge, Charge.rider_id == 1) > 0
+    assert tutor_ids
+
+    riders.delete_rider(1)
+
+    assert db.session.get(Rider, 1) is None
+    assert _count(Charge, Charge.rider_id == 1) == 0
+    assert _count(Charge) > 0
+    assert _count(RiderDocument, RiderDocument.rider_id == 1) == 0
+    assert _count(RiderTutor, RiderTutor.rider_id == 1) == 0
+    # Los tutores se conservan; sólo se eliminan los vínculos
+    assert _count(Tutor, Tutor.id.in_(tutor_ids)) == len(tutor_ids)
+    assert document.source not in objects
+
+
+def test_delete_rider_keeps_files_shared_with_other_riders(app, objects):
+    bulk_seeds.run(5)
+    _upload(1, b"certificado compartido")
+    shared = _upload(2, b"certificado compartido")
+
+    riders.delete_rider(1)
+
+    assert shared.source in objects